@@ -0,0 +1,308 @@
+"""Rate limiting and admission control for expensive routes.
+
+Simulation routes do CPU work while holding a worker, so a burst from a few
+clients could starve everyone else. :class:`AdmissionControl` guards the
+routes listed in its limits with three checks, cheapest first:
+
+1. a token bucket per session (or per client address unless the request
+   names a live session, so made-up tokens do not get fresh buckets),
+   answering ``429 Too Many Requests`` when it is empty;
+2. a token bucket per route shared by all clients, answering
+   ``503 Service Unavailable`` when it is empty;
+3. for queued routes, a bounded queue in front of a fixed number of
+   execution slots shared by all of them. A request that finds the queue
+   full, or waits longer than the queue timeout, gets a ``503``.
+
+A request takes one token from each bucket unless the app's cost function
+says otherwise (``/batch`` pays one per operation). Rejections are answered
+before the session is loaded and carry a ``Retry-After`` header.
+:func:`init_app` installs the checks on a Flask app and exports queue
+depth, requests in flight, queue waits and rejections through
+:data:`instrumentation.METRICS`.
+"""
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Per-route limits: rates in tokens per second, bursts in tokens. A request
+# costs one token, a batch one per operation.
+DEFAULT_LIMITS: Dict[str, Dict[str, Any]] = {
+    "/start_production": {
+        "session_rate": 5, "session_burst": 10, "global_rate": 200, "global_burst": 400, "queued": True,
+    },
+    "/release_project": {
+        "session_rate": 5, "session_burst": 10, "global_rate": 200, "global_burst": 400, "queued": True,
+    },
+    "/solve_cast": {
+        "session_rate": 5, "session_burst": 10, "global_rate": 100, "global_burst": 200, "queued": True,
+    },
+    "/preview_decisions": {
+        "session_rate": 1, "session_burst": 5, "global_rate": 20, "global_burst": 40, "queued": True,
+    },
+    "/production_stream": {
+        "session_rate": 5, "session_burst": 10, "global_rate": 200, "global_burst": 400, "queued": True,
+    },
+    # The session burst admits one batch of the most operations allowed (50).
+    "/batch": {
+        "session_rate": 10, "session_burst": 50, "global_rate": 500, "global_burst": 1000, "queued": True,
+    },
+}
+DEFAULT_SLOTS = 2
+DEFAULT_QUEUE_DEPTH = 32
+DEFAULT_QUEUE_TIMEOUT = 1.0
+
+# Session buckets kept; the least recently used are forgotten beyond this.
+MAX_TRACKED_SESSIONS = 100_000
+
+
+class TokenBucket:
+    """Allow ``rate`` tokens per second on average and ``burst`` at once.
+
+    A rate of 0 disables the bucket.
+    """
+
+    __slots__ = ("rate", "burst", "tokens", "updated", "_clock")
+
+    def __init__(self, rate: float, burst: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.tokens = self.burst
+        self._clock = clock
+        self.updated = clock()
+
+    def take(self, n: float = 1) -> float:
+        """Take ``n`` tokens; return 0, or the seconds until they are available.
+
+        ``n`` is capped at ``burst``, so no request is refused forever.
+        """
+        if self.rate <= 0:
+            return 0.0
+        n = min(n, self.burst)
+        now = self._clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= n:
+            self.tokens -= n
+            return 0.0
+        return (n - self.tokens) / self.rate
+
+
+class AdmissionQueue:
+    """``slots`` concurrent executions with at most ``depth`` waiting."""
+
+    def __init__(
+        self,
+        slots: int = DEFAULT_SLOTS,
+        depth: int = DEFAULT_QUEUE_DEPTH,
+        timeout: float = DEFAULT_QUEUE_TIMEOUT,
+    ) -> None:
+        self.slots = max(1, slots)
+        self.depth = depth
+        self.timeout = timeout
+        self.in_flight = 0
+        self.waiting = 0
+        # Moving average of how long a slot is held, for Retry-After.
+        self.service_time = 0.05
+        self._cond = threading.Condition()
+
+    def acquire(self) -> Optional[str]:
+        """Take a slot, waiting in the queue if needed.
+
+        Returns ``None`` once a slot is held, or the rejection reason
+        ``"queue_full"`` or ``"queue_timeout"``.
+        """
+        with self._cond:
+            if self.in_flight < self.slots and not self.waiting:
+                self.in_flight += 1
+                return None
+            if self.waiting >= self.depth:
+                return "queue_full"
+            self.waiting += 1
+            deadline = time.monotonic() + self.timeout
+            try:
+                while self.in_flight >= self.slots:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return "queue_timeout"
+                    self._cond.wait(remaining)
+                self.in_flight += 1
+                return None
+            finally:
+                self.waiting -= 1
+
+    def release(self, held: float) -> None:
+        """Free a slot that was held for ``held`` seconds."""
+        with self._cond:
+            self.in_flight -= 1
+            self.service_time += 0.1 * (held - self.service_time)
+            self._cond.notify()
+
+    def retry_after(self) -> float:
+        """Estimate the seconds until a newly queued request would run."""
+        return self.service_time * (self.waiting + 1) / self.slots
+
+
+class AdmissionControl:
+    """Per-session and per-route token buckets plus a shared slot queue.
+
+    Parameters
+    ----------
+    limits:
+        Route path -> ``session_rate``, ``session_burst``, ``global_rate``,
+        ``global_burst`` and ``queued``. Missing keys take the value of the
+        route in :data:`DEFAULT_LIMITS`, or 0 / ``False`` (no limit).
+    slots, queue_depth, queue_timeout:
+        Shape of the queue in front of queued routes.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, Dict[str, Any]]] = None,
+        slots: int = DEFAULT_SLOTS,
+        queue_depth: int = DEFAULT_QUEUE_DEPTH,
+        queue_timeout: float = DEFAULT_QUEUE_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.limits: Dict[str, Dict[str, Any]] = {}
+        for route in set(DEFAULT_LIMITS) | set(limits or {}):
+            merged = dict(DEFAULT_LIMITS.get(route, {}), **(limits or {}).get(route, {}))
+            self.limits[route] = merged
+        self.queue = AdmissionQueue(slots, queue_depth, queue_timeout)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._global = {
+            route: TokenBucket(limit.get("global_rate", 0), limit.get("global_burst", 1), clock)
+            for route, limit in self.limits.items()
+        }
+        self._sessions: "OrderedDict[Tuple[str, str], TokenBucket]" = OrderedDict()
+        self.rejections: Dict[Tuple[str, str], int] = {}
+
+    def _reject(self, route: str, reason: str, retry_after: float) -> Tuple[str, float]:
+        with self._lock:
+            key = (route, reason)
+            self.rejections[key] = self.rejections.get(key, 0) + 1
+        return reason, retry_after
+
+    def admit(self, route: str, client: str, cost: float = 1) -> Optional[Tuple[str, float]]:
+        """Check a request for ``route`` from session or address ``client``.
+
+        The request takes ``cost`` tokens from each bucket but only one
+        queue slot. Returns ``None`` if it may run (holding a queue slot
+        when the route is queued; pair with :meth:`done`) or
+        ``(reason, retry_after)``.
+        """
+        limit = self.limits.get(route)
+        if limit is None:
+            return None
+        with self._lock:
+            session_wait = 0.0
+            if limit.get("session_rate"):
+                key = (route, client)
+                bucket = self._sessions.get(key)
+                if bucket is None:
+                    bucket = self._sessions[key] = TokenBucket(
+                        limit["session_rate"], limit.get("session_burst", 1), self._clock
+                    )
+                    if len(self._sessions) > MAX_TRACKED_SESSIONS:
+                        self._sessions.popitem(last=False)
+                else:
+                    self._sessions.move_to_end(key)
+                session_wait = bucket.take(cost)
+            global_wait = 0.0 if session_wait else self._global[route].take(cost)
+        if session_wait:
+            return self._reject(route, "session_rate", session_wait)
+        if global_wait:
+            return self._reject(route, "global_rate", global_wait)
+        if limit.get("queued"):
+            reason = self.queue.acquire()
+            if reason is not None:
+                return self._reject(route, reason, self.queue.retry_after())
+        return None
+
+    def done(self, route: str, held: float) -> None:
+        """Release the slot of an admitted request to a queued ``route``."""
+        if self.limits.get(route, {}).get("queued"):
+            self.queue.release(held)
+
+
+def register_metrics(control: AdmissionControl) -> None:
+    """Declare the admission metrics of ``control`` in :data:`instrumentation.METRICS`."""
+    from instrumentation import METRICS
+
+    METRICS.counter(
+        "director_admission_rejections_total",
+        "Requests to limited routes rejected, by route and reason.",
+    )
+    METRICS.histogram("director_admission_wait_seconds", "Time queued requests waited for a slot.")
+    METRICS.gauge("director_admission_queue_depth", "Requests waiting for a slot.", lambda: control.queue.waiting)
+    METRICS.gauge("director_admission_in_flight", "Requests holding a slot.", lambda: control.queue.in_flight)
+
+
+def admit_request(
+    control: AdmissionControl, route: str, client: str, cost: float = 1
+) -> Optional[Tuple[str, float]]:
+    """:meth:`AdmissionControl.admit` plus its metrics, for any server front end."""
+    from instrumentation import METRICS
+
+    started = time.perf_counter()
+    rejected = control.admit(route, client, cost)
+    if rejected is None:
+        if control.limits.get(route, {}).get("queued"):
+            METRICS.observe("director_admission_wait_seconds", time.perf_counter() - started)
+    else:
+        METRICS.inc("director_admission_rejections_total", {"route": route, "reason": rejected[0]})
+    return rejected
+
+
+def rejection(reason: str, retry_after: float) -> Tuple[int, Dict[str, str], Dict[str, str]]:
+    """Return the status, JSON body and headers answering a rejected request."""
+    status = 429 if reason == "session_rate" else 503
+    message = "Too many requests" if status == 429 else "Server busy"
+    body = {"error": f"{message}; retry later", "reason": reason}
+    return status, body, {"Retry-After": str(max(1, math.ceil(retry_after)))}
+
+
+def init_app(
+    app,
+    control: AdmissionControl,
+    client_key: Callable[[], Optional[str]],
+    cost: Optional[Callable[[str], float]] = None,
+) -> None:
+    """Check requests to limited routes of ``app`` before anything else runs.
+
+    ``client_key`` returns the request's session token if it names a live
+    session; other requests are limited per client address. ``cost`` gives
+    the tokens a request to a route takes (1 when omitted).
+    """
+    from flask import g, jsonify, request
+
+    register_metrics(control)
+
+    @app.before_request
+    def _admit():
+        route = request.path
+        if request.method == "OPTIONS" or route not in control.limits:
+            return None
+        rejected = admit_request(
+            control, route, client_key() or request.remote_addr or "", cost(route) if cost else 1
+        )
+        if rejected is None:
+            if control.limits[route].get("queued"):
+                g.admission_route = route
+                g.admission_started = time.perf_counter()
+            return None
+        status, body, headers = rejection(*rejected)
+        response = jsonify(body)
+        response.status_code = status
+        response.headers.update(headers)
+        return response
+
+    @app.teardown_request
+    def _release_slot(exc):
+        route = g.pop("admission_route", None)
+        if route is not None:
+            control.done(route, time.perf_counter() - g.pop("admission_started"))
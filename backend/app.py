@@ -1,152 +1,1028 @@
-from dataclasses import asdict
-from flask import Flask, jsonify, request
+import json
+import os
+import threading
+from flask import Flask, g, has_request_context, jsonify, request
 from flask_cors import CORS
 
-from game_engine import Player, generate_offer_list
-from game_engine.casting import generate_talent_pool
-from game_engine.profile import add_completed_project, get_profile_summary
-from game_engine.production import simulate_production
-from game_engine.release import evaluate_release as engine_evaluate_release
+from admission import (
+    DEFAULT_QUEUE_DEPTH,
+    DEFAULT_QUEUE_TIMEOUT,
+    DEFAULT_SLOTS,
+    AdmissionControl,
+    init_app as init_admission,
+)
+from game_engine import GameRNG, Player, generate_offer_list
+from game_engine.profile import (
+    add_completed_project,
+    career_history,
+    get_profile_summary,
+    record_award_results,
+    set_career_store,
+)
+from game_engine.awards_season import (
+    DEFAULT_SEASON_RELEASES,
+    AwardsCalendar,
+    SQLiteAwardsCalendar,
+)
+from game_engine.cast_solver import OBJECTIVES, solve_cast
+from game_engine.casting import evaluate_casting_choices
+from game_engine.history import DEFAULT_POINTS as DEFAULT_HISTORY_POINTS
+from game_engine.leaderboard import METRICS as LEADERBOARD_METRICS, Leaderboards
+from game_engine.pregen import DEFAULT_POOL_SIZE, ContentCache
+from game_engine.preview import DECISIONS, DEFAULT_SAMPLES, MAX_SAMPLES, preview_decisions
+from game_engine.production import iter_production, simulate_production
+from game_engine.serialization import dumps, encode_player
+from game_engine.release import evaluate_release as engine_evaluate_release, reputation_change
+from game_engine.storage import CareerStore
+from game_engine.talent_index import SORTABLE_FIELDS, TalentIndex, search_many
+from game_engine.talent_market import DEFAULT_MARKET_SIZE, TalentMarket
+from game_engine.talent_pool import TalentPool
+from instrumentation import METRICS, init_app as init_instrumentation
+from recorder import SessionRecorder, init_app as init_recorder
+from session_backends import InProcessBackend, SQLiteBackend
+from session_codec import decode_state, encode_state
+from session_store import SessionStore
 
-# Simple in-memory session store
-SESSION = {}
+# Per-player game state, keyed by the token carried in a cookie or header.
+# "memory" keeps it in this process; "sqlite" shares it between worker
+# processes through the DIRECTOR_SESSION_DB file.
+SESSION_COOKIE = "director_session"
+SESSION_HEADER = "X-Session-Token"
+SESSION_BACKEND = os.environ.get("DIRECTOR_SESSION_BACKEND", "memory")
+SESSION_TTL = float(os.environ.get("DIRECTOR_SESSION_TTL", 3600))
+SESSION_DB = os.environ.get("DIRECTOR_SESSION_DB", "director_sessions.db")
+if SESSION_BACKEND == "sqlite":
+    SESSIONS = SQLiteBackend(SESSION_DB, ttl=SESSION_TTL)
+elif SESSION_BACKEND == "memory":
+    SESSIONS = InProcessBackend(SessionStore(
+        shards=int(os.environ.get("DIRECTOR_SESSION_SHARDS", 16)),
+        ttl=SESSION_TTL,
+        max_sessions=int(os.environ.get("DIRECTOR_MAX_SESSIONS", 10_000)),
+    ))
+else:
+    raise ValueError(f"Unknown DIRECTOR_SESSION_BACKEND {SESSION_BACKEND!r}")
+
+# Careers persist across restarts when a data directory is configured
+DATA_DIR = os.environ.get("DIRECTOR_DATA_DIR")
+CAREERS = CareerStore(DATA_DIR) if DATA_DIR else None
+
+# Operational endpoints that must not create or touch a game session
+SESSIONLESS_ENDPOINTS = {"metrics", "profiler"}
+
+# Largest talent pool a client may request for one role
+MAX_POOL_SIZE = 10_000
+
+# Server-wide player rankings, updated on every release
+LEADERBOARDS = Leaderboards()
+# Largest leaderboard page a client may request
+MAX_LEADERBOARD_PAGE = 100
+# Most points per series a career history query may return
+MAX_HISTORY_POINTS = 1_000
+
+# Yearly awards seasons in which all players' releases compete; with the
+# SQLite session backend the season is shared by all workers through its file.
+SEASON_RELEASES = int(os.environ.get("DIRECTOR_SEASON_RELEASES", DEFAULT_SEASON_RELEASES))
+AWARDS_CALENDAR = (
+    SQLiteAwardsCalendar(SESSION_DB, SEASON_RELEASES)
+    if SESSION_BACKEND == "sqlite"
+    else AwardsCalendar(SEASON_RELEASES)
+)
+
+# Persistent world of talent that unseeded games cast from (0 disables)
+MARKET_SIZE = int(os.environ.get("DIRECTOR_MARKET_SIZE", DEFAULT_MARKET_SIZE))
+MARKET = TalentMarket() if MARKET_SIZE > 0 else None
+
+# Offers and talent pools kept ready per bucket off the request path (0
+# disables). Unseeded games cast from the market when there is one, so only
+# offers are pre-generated then.
+PREGEN_SIZE = int(os.environ.get("DIRECTOR_PREGEN_SIZE", 32))
+CONTENT = (
+    ContentCache(
+        high_water=PREGEN_SIZE,
+        low_water=max(1, PREGEN_SIZE // 4),
+        talent_pools=MARKET is None,
+    )
+    if PREGEN_SIZE > 0
+    else None
+)
+
+# Rate limits and a bounded queue for simulation routes (0 disables);
+# DIRECTOR_ADMISSION_LIMITS overrides limits per route as JSON, e.g.
+# {"/start_production": {"session_rate": 2, "global_rate": 50}}
+ADMISSION = (
+    AdmissionControl(
+        json.loads(os.environ.get("DIRECTOR_ADMISSION_LIMITS", "{}")),
+        slots=int(os.environ.get("DIRECTOR_ADMISSION_SLOTS", DEFAULT_SLOTS)),
+        queue_depth=int(os.environ.get("DIRECTOR_ADMISSION_QUEUE", DEFAULT_QUEUE_DEPTH)),
+        queue_timeout=float(os.environ.get("DIRECTOR_ADMISSION_TIMEOUT", DEFAULT_QUEUE_TIMEOUT)),
+    )
+    if os.environ.get("DIRECTOR_ADMISSION", "1") != "0"
+    else None
+)
+
+# Request log for replays and capacity tests; see recorder.py
+RECORD_PATH = os.environ.get("DIRECTOR_RECORD")
+RECORDER = SessionRecorder(RECORD_PATH) if RECORD_PATH else None
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'dev-key'
-CORS(app)
+CORS(app, expose_headers=[SESSION_HEADER])
+init_instrumentation(app, SESSIONS)
+if ADMISSION is not None:
+    # Before the session hooks, so rejected requests never wait for a session lock.
+    init_admission(app, ADMISSION, lambda: live_session_token(), lambda route: admission_cost(route))
+if RECORDER is not None:
+    init_recorder(app, RECORDER, SESSION_HEADER)
+
+# Engine entry points, timed into director_engine_call_seconds
+generate_offer_list = METRICS.timed("generate_offer_list")(generate_offer_list)
+generate_talent_pool = METRICS.timed("generate_talent_pool")(TalentPool.generate)
+get_profile_summary = METRICS.timed("get_profile_summary")(get_profile_summary)
+preview_decisions = METRICS.timed("preview_decisions")(preview_decisions)
+
+if CONTENT is not None:
+    METRICS.gauge(
+        "director_content_cache_total",
+        "Pre-generated content requests served from the cache or inline.",
+        lambda: {(("result", "hit"),): CONTENT.hits, (("result", "miss"),): CONTENT.misses},
+        kind="counter",
+    )
+
+
+def session_token():
+    """Return the session token the request carries, if any."""
+    return request.headers.get(SESSION_HEADER) or request.cookies.get(SESSION_COOKIE)
+
+
+def live_session_token():
+    """Return the request's session token if it names a live session."""
+    token = session_token()
+    return token if token and token in SESSIONS else None
+
+
+def admission_cost(route: str) -> int:
+    """Rate-limit tokens a request takes: one per operation for ``/batch``."""
+    if route != "/batch":
+        return 1
+    data = request.get_json(force=True, silent=True)
+    operations = data.get("operations") if isinstance(data, dict) else None
+    return max(1, len(operations)) if isinstance(operations, list) else 1
+
+
+def after_commit(effect, *args) -> None:
+    """Run ``effect(*args)`` once the request's session changes are stored.
+
+    Changes to state shared beyond the session (leaderboards, the awards
+    season, the talent market, saved careers) go through here, so a request
+    whose session cannot be stored (409) or a batch that is rolled back
+    leaves no trace in them. Outside a request the effect runs at once.
+    """
+    effects = g.get("session_effects") if has_request_context() else None
+    if effects is None:
+        effect(*args)
+    else:
+        effects.append((effect, args))
+
+
+class CommittedCareers:
+    """Career store writes from the engine, held back by :func:`after_commit`."""
+
+    def __init__(self, store: CareerStore) -> None:
+        self.store = store
+
+    def save_player(self, player) -> None:
+        after_commit(self.store.save_player, player)
+
+    def record_project(self, player, project) -> None:
+        after_commit(self.store.record_project, player, project)
+
+    def update_project(self, player, index, project) -> None:
+        after_commit(self.store.update_project, player, index, project)
+
+
+set_career_store(CommittedCareers(CAREERS) if CAREERS is not None else None)
+
+
+_services_lock = threading.Lock()
+_services_started = False
+# Set once every saved career has been ranked; until then the leaderboards
+# hold only the careers ranked so far and the players seen since start-up.
+LEADERBOARDS_SEEDED = threading.Event()
+
+
+def seed_leaderboards() -> None:
+    """Rank every saved career, not only those resumed since start-up.
+
+    A player resumed or ranked before the seeder reaches them is skipped by
+    ``add_player``, so live releases are never counted twice.
+    """
+    try:
+        for player_id in CAREERS.player_ids():
+            player = CAREERS.load_player_by_id(player_id)
+            if player is not None:
+                LEADERBOARDS.add_player(player.player_id, player.name, player.past_projects)
+    finally:
+        LEADERBOARDS_SEEDED.set()
+
+
+def start_services() -> None:
+    """Start the background threads.
+
+    The threads fill the talent market and the content cache and rank the
+    saved careers. Called before the first request, or by the ASGI lifespan
+    startup, rather than at import: a server that imports the app and then
+    forks its workers would otherwise leave the threads behind in the
+    parent. Later calls do nothing.
+    """
+    global _services_started
+    with _services_lock:
+        if _services_started:
+            return
+        if MARKET is not None:
+            MARKET.start(MARKET_SIZE)
+        if CONTENT is not None:
+            CONTENT.start()
+        if CAREERS is not None:
+            threading.Thread(target=seed_leaderboards, name="leaderboard-seed", daemon=True).start()
+        else:
+            LEADERBOARDS_SEEDED.set()
+        _services_started = True
+
+
+@app.before_request
+def ensure_services():
+    if not _services_started:
+        start_services()
+
+
+@app.before_request
+def load_session():
+    """Attach the caller's session to ``g`` and hold its lock for the request."""
+    if request.method == "OPTIONS" or request.endpoint in SESSIONLESS_ENDPOINTS:
+        return
+    g.session = SESSIONS.acquire(session_token())
+    g.session_effects = []
+    deliver_award_results(g.session.data)
+
+
+@app.after_request
+def attach_session_token(response):
+    """Store the session's changes and hand its token back to the client.
+
+    Effects queued with :func:`after_commit` run only once the session is
+    stored; if another worker stored it first they are dropped with the
+    rest of the request's changes.
+    """
+    session = g.get("session")
+    if session is not None:
+        effects = g.pop("session_effects", [])
+        if SESSIONS.commit(session):
+            for effect, args in effects:
+                try:
+                    effect(*args)
+                except Exception:
+                    # The session is already stored; report and carry on.
+                    app.logger.exception("Effect %r of a committed request failed", effect)
+        else:
+            # Another worker saved this session first; this request's
+            # changes are dropped and the client should retry.
+            response = jsonify({"error": "Session was modified concurrently; retry"})
+            response.status_code = 409
+        response.headers[SESSION_HEADER] = session.token
+        if request.cookies.get(SESSION_COOKIE) != session.token:
+            response.set_cookie(SESSION_COOKIE, session.token, httponly=True, samesite="Lax")
+    return response
+
+
+@app.teardown_request
+def release_session(exc):
+    session = g.pop("session", None)
+    if session is not None:
+        SESSIONS.release(session)
+
+
+def current_session() -> dict:
+    """Return the mutable state dict for the current request's session."""
+    return g.session.data
+
+
+def deliver_award_results(state: dict) -> None:
+    """Write results of closed awards seasons into the session player's career.
+
+    The results leave the mailbox only once the session is stored.
+    """
+    player = state.get("player")
+    if player is not None and AWARDS_CALENDAR.has_results(player.player_id):
+        results = AWARDS_CALENDAR.results(player.player_id)
+        record_award_results(player, results)
+        after_commit(AWARDS_CALENDAR.acknowledge, player.player_id, results)
+
+
+def session_rng(state: dict) -> GameRNG:
+    """Return the session's random streams, creating them on first use."""
+    rng = state.get("rng")
+    if rng is None:
+        rng = state["rng"] = GameRNG()
+    return rng
+
+
+def uses_content_cache(state: dict) -> bool:
+    """Seeded games bypass the shared cache so their seed replays them exactly."""
+    return CONTENT is not None and not state.get("seeded")
+
+
+def uses_market(state: dict) -> bool:
+    """Unseeded games cast from the shared talent market once it is populated."""
+    return MARKET is not None and not state.get("seeded")
+
+
+def replay_seed(state: dict):
+    """Return the seed that replays this game, or ``None`` if there is none."""
+    return None if uses_content_cache(state) else session_rng(state).seed
+
+
+def new_offers(state: dict) -> list:
+    rng = session_rng(state).offers
+    if uses_content_cache(state):
+        return CONTENT.offers(rng)
+    return generate_offer_list(rng)
+
+
+def new_talent_pool(state: dict, role: str, count: int = DEFAULT_POOL_SIZE) -> TalentPool:
+    rng = session_rng(state).talent
+    if uses_market(state):
+        pool = MARKET.draw(role, count, rng, state.get("player"))
+        if pool is not None:
+            return pool
+    if uses_content_cache(state):
+        return CONTENT.talent_pool(role, count, rng)
+    return generate_talent_pool(role, count, rng=rng)
+
+
+# --- Operations ---
+#
+# Each game action is an ``op_*`` function taking the session state and its
+# parameters (query args or JSON body) and returning ``(body, status)``. The
+# routes below are thin wrappers, and ``/batch`` runs several in one request.
+# A ``bytes`` or ``str`` body is JSON that was already encoded.
+
+
+def _int_param(params, name, default):
+    """Read an integer parameter, falling back to ``default`` if invalid."""
+    try:
+        return int(params.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _bool_param(params, name):
+    """Parse an optional boolean parameter (``true``/``false``/``1``/``0``)."""
+    value = params.get(name)
+    if value is None or value == "":
+        return None
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() in ("1", "true", "yes")
+
+
+def encode_body(body) -> bytes:
+    if isinstance(body, bytes):
+        return body
+    if isinstance(body, str):
+        return body.encode()
+    return dumps(body)
+
+
+def respond(result):
+    """Turn an operation's ``(body, status)`` into a Flask response."""
+    body, status = result
+    return app.response_class(encode_body(body), status=status, mimetype="application/json")
+
 
 # --- PHASE 1: Game Start & Project Selection ---
 
-@app.route("/start_game", methods=["POST"])
-def start_game():
-    data = request.get_json(force=True)
+def op_start_game(state: dict, data):
     name = data.get("name")
     if not name:
-        return jsonify({"error": "Name is required"}), 400
+        return {"error": "Name is required"}, 400
 
     # If a player already exists in the session, return it without creating
     # a new one so repeated calls are idempotent.
-    existing = SESSION.get("player")
+    existing = state.get("player")
     if existing:
-        return jsonify(asdict(existing))
+        return encode_player(existing, seed=replay_seed(state)), 200
+
+    # An explicit seed replays a previous career exactly.
+    seed = data.get("seed")
+    if seed is not None:
+        try:
+            state["rng"] = GameRNG(int(seed))
+            state["seeded"] = True
+        except (TypeError, ValueError):
+            return {"error": "Seed must be an integer"}, 400
 
-    player = Player(name)
-    SESSION["player"] = player
+    # A saved career with this name is resumed instead of starting over.
+    player = CAREERS.load_player(name) if CAREERS is not None else None
+    if player is None:
+        player = Player(name)
+        if CAREERS is not None:
+            after_commit(CAREERS.save_player, player)
+    else:
+        after_commit(LEADERBOARDS.add_player, player.player_id, player.name, player.past_projects)
+    state["player"] = player
+    deliver_award_results(state)
 
-    return jsonify(asdict(player))
+    return encode_player(player, seed=replay_seed(state)), 200
 
 
-@app.route("/get_projects", methods=["GET"])
-def get_projects():
-    player = SESSION.get("player")
+def op_get_projects(state: dict, params):
+    player = state.get("player")
     if not player:
-        return jsonify({"error": "Game not started"}), 400
+        return {"error": "Game not started"}, 400
 
-    offers = generate_offer_list()
-    SESSION["offers"] = offers
-    return jsonify({"offers": offers})
+    offers = new_offers(state)
+    state["offers"] = offers
+    return {"offers": offers}, 200
 
 
-@app.route("/get_talent_pool", methods=["GET"])
-def get_talent_pool():
-    """Return a generated talent pool for the requested role."""
+def store_talent_pool(state: dict, role: str, pool: TalentPool) -> None:
+    """Keep a generated pool in session, indexed for searches and cast selection."""
+    state.setdefault("talent_pools", {})[role] = pool
+    state.setdefault("talent_indexes", {})[role] = TalentIndex(pool)
+
+
+def _pool_size(params) -> int:
+    return min(MAX_POOL_SIZE, max(1, _int_param(params, "count", DEFAULT_POOL_SIZE)))
 
-    role = request.args.get("role")
+
+def op_get_talent_pool(state: dict, params):
+    role = params.get("role")
     if not role:
-        return jsonify({"error": "Role is required"}), 400
+        return {"error": "Role is required"}, 400
 
-    pool = generate_talent_pool(role)
-    # Keep the actual Talent objects in session for later use
-    SESSION.setdefault("talent_pools", {})[role] = pool
-    return jsonify([t.to_dict() for t in pool])
+    pool = new_talent_pool(state, role, _pool_size(params))
+    store_talent_pool(state, role, pool)
+    return pool.to_json(), 200
 
 
-@app.route("/get_profile", methods=["GET"])
-def get_profile():
-    """Return a summary of the current player's career so far."""
-    player = SESSION.get("player")
+def op_get_talent_pools(state: dict, params):
+    """Generate a talent pool for every role of an offer in one step.
+
+    Uses the offer with ``project_id`` or, by default, the selected project.
+    """
+    project = state.get("selected_project")
+    if params.get("project_id") is not None:
+        project_id = _int_param(params, "project_id", None)
+        project = next((o for o in state.get("offers", []) if o.get("id") == project_id), None)
+    if not project:
+        return {"error": "No project selected"}, 400
+
+    count = _pool_size(params)
+    encoded = []
+    for role in project.get("roles", []):
+        pool = new_talent_pool(state, role, count)
+        store_talent_pool(state, role, pool)
+        encoded.append(f"{json.dumps(role)}:{pool.to_json()}")
+    return '{"pools":{' + ",".join(encoded) + "}}", 200
+
+
+def op_search_talent(state: dict, params):
+    indexes = state.get("talent_indexes", {})
+    role = params.get("role")
+    if role:
+        if role not in indexes:
+            return {"error": "No talent pool for role"}, 404
+        selected = [indexes[role]]
+    else:
+        selected = list(indexes.values())
+
+    ranges = {
+        field: (
+            _int_param(params, f"min_{field}", None),
+            _int_param(params, f"max_{field}", None),
+        )
+        for field in SORTABLE_FIELDS
+    }
+    page = max(1, _int_param(params, "page", 1))
+    page_size = min(100, max(1, _int_param(params, "page_size", 20)))
+    sort = params.get("sort", "skill")
+    if sort not in SORTABLE_FIELDS:
+        return {"error": f"sort must be one of {', '.join(SORTABLE_FIELDS)}"}, 400
+
+    total, results = search_many(
+        selected,
+        ranges=ranges,
+        available=_bool_param(params, "available"),
+        willing=_bool_param(params, "willing"),
+        sort=sort,
+        descending=params.get("order", "desc") != "asc",
+        offset=(page - 1) * page_size,
+        limit=page_size,
+    )
+    return {
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "results": [t.to_dict() for t in results],
+    }, 200
+
+
+def op_get_profile(state: dict, params):
+    player = state.get("player")
     if not player:
-        return jsonify({"error": "Game not started"}), 400
+        return {"error": "Game not started"}, 400
 
-    summary = get_profile_summary(player)
-    return jsonify(summary)
+    page = _int_param(params, "page", 1)
+    page_size = _int_param(params, "page_size", None)
+    return get_profile_summary(player, page=page, page_size=page_size), 200
 
 
-@app.route("/select_project", methods=["POST"])
-def select_project():
-    data = request.get_json(force=True)
-    project_id = data.get("project_id")
-    offers = SESSION.get("offers", [])
-    selected = next((o for o in offers if o.get("id") == project_id), None)
+def _leaderboard_params(params):
+    """Return ``(metric, medium, genre)`` or an error response."""
+    metric = params.get("metric", "box_office")
+    if metric not in LEADERBOARD_METRICS:
+        return None, ({"error": f"metric must be one of {', '.join(LEADERBOARD_METRICS)}"}, 400)
+    return (metric, params.get("medium") or None, params.get("genre") or None), None
+
+
+def op_get_leaderboard(state: dict, params):
+    """Players ranked by ``metric`` within an optional ``medium`` and ``genre``.
+
+    Query fields: ``limit`` (default 10) and ``offset`` page through the
+    ranking; ``percentile`` also reports the score needed to reach it.
+    ``complete`` is false while the saved careers are still being ranked.
+    """
+    board, error = _leaderboard_params(params)
+    if error:
+        return error
+    metric, medium, genre = board
+    limit = min(MAX_LEADERBOARD_PAGE, max(1, _int_param(params, "limit", 10)))
+    offset = max(0, _int_param(params, "offset", 0))
+    body = {
+        "metric": metric,
+        "medium": medium,
+        "genre": genre,
+        "total": LEADERBOARDS.total(metric, medium, genre),
+        "entries": LEADERBOARDS.top(metric, limit, offset, medium, genre),
+        "complete": LEADERBOARDS_SEEDED.is_set(),
+    }
+    if params.get("percentile") is not None:
+        try:
+            percentile = float(params["percentile"])
+        except (TypeError, ValueError):
+            return {"error": "percentile must be a number"}, 400
+        body["percentile"] = {
+            "percentile": percentile,
+            "score": LEADERBOARDS.score_at_percentile(metric, percentile, medium, genre),
+        }
+    return body, 200
+
+
+def op_get_career_history(state: dict, params):
+    """Time series of the player's career, downsampled to ``points`` per series."""
+    player = state.get("player")
+    if not player:
+        return {"error": "Game not started"}, 400
+
+    history = career_history(player)
+    names = params.get("series")
+    if isinstance(names, str):
+        names = [name for name in names.split(",") if name]
+    unknown = [name for name in names or () if name not in history.series]
+    if unknown:
+        return {"error": f"Unknown series {', '.join(unknown)}", "series": history.series}, 400
+    return history.query(
+        names or None,
+        start=_int_param(params, "start", 0),
+        stop=_int_param(params, "stop", len(history)),
+        points=min(MAX_HISTORY_POINTS, max(1, _int_param(params, "points", DEFAULT_HISTORY_POINTS))),
+    ), 200
+
+
+def op_get_awards_season(state: dict, params):
+    """Current season's nominees so far and the winners of the last season."""
+    return AWARDS_CALENDAR.standings(), 200
+
+
+def op_get_leaderboard_rank(state: dict, params):
+    """Rank and percentile of ``player_id`` (by default the current player)."""
+    board, error = _leaderboard_params(params)
+    if error:
+        return error
+    metric, medium, genre = board
+    player_id = params.get("player_id")
+    if not player_id:
+        player = state.get("player")
+        if not player:
+            return {"error": "Game not started"}, 400
+        player_id = player.player_id
+    standing = LEADERBOARDS.rank(metric, player_id, medium, genre)
+    if standing is None:
+        return {"error": "Player has no ranked releases"}, 404
+    return {"metric": metric, "medium": medium, "genre": genre, "player_id": player_id, **standing}, 200
+
+
+def op_select_project(state: dict, data):
+    offers = state.get("offers", [])
+    if data.get("offer_index") is not None:
+        # Lets a batch pick an offer it has not seen yet.
+        index = _int_param(data, "offer_index", -1)
+        selected = offers[index] if 0 <= index < len(offers) else None
+    else:
+        project_id = data.get("project_id")
+        selected = next((o for o in offers if o.get("id") == project_id), None)
     if not selected:
-        return jsonify({"error": "Invalid project id"}), 400
+        return {"error": "Invalid project id"}, 400
 
-    SESSION["selected_project"] = selected
-    return jsonify({"selected_project": selected})
+    state["selected_project"] = selected
+    return {"selected_project": selected}, 200
 
 
 # --- PHASE 2: Casting, Production, and Release ---
 
 
-def run_production(project, cast):
+@METRICS.timed("simulate_production")
+def run_production(project, cast, rng=None):
     """Wrapper around :func:`simulate_production` from ``game_engine``."""
-    return simulate_production(project, cast)
+    return simulate_production(project, cast, rng)
+
+
+@METRICS.timed("iter_production")
+def production_events(state: dict):
+    """Run the selected production and return its week-by-week events.
+
+    The final result is stored in the session exactly like
+    ``/start_production`` does. Returns ``None`` if the project or cast is
+    missing.
+    """
+    project = state.get("selected_project")
+    cast = state.get("selected_cast", [])
+    if not project or not cast:
+        return None
+    events = list(iter_production(project, cast, session_rng(state).production))
+    state["production_result"] = events[-1]["result"]
+    return events
+
 
+def sse_event(event: dict) -> str:
+    """Format one production event as a Server-Sent Events message."""
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
 
-def evaluate_release(project, quality, cast):
+
+@METRICS.timed("evaluate_release")
+def evaluate_release(project, quality, cast, rng=None):
     """Wrapper around :func:`evaluate_release` from ``game_engine``."""
-    return engine_evaluate_release(project, quality, cast)
+    return engine_evaluate_release(project, quality, cast, rng)
 
 
-@app.route("/select_cast", methods=["POST"])
-def select_cast():
-    data = request.get_json(force=True)
+def op_select_cast(state: dict, data):
     selections = data.get("selections", {})
 
-    pools = SESSION.get("talent_pools", {})
+    indexes = state.get("talent_indexes", {})
     selected: list = []
     for role, tid in selections.items():
         try:
             tid = int(tid)
         except (TypeError, ValueError):
             continue
-        pool = pools.get(role, [])
-        talent = next((t for t in pool if t.id == tid), None)
+        index = indexes.get(role)
+        talent = index.get(tid) if index else None
         if talent:
             selected.append(talent)
 
-    SESSION["selected_cast"] = selected
-    return jsonify({"selected_cast": [t.to_dict() for t in selected]})
+    state["selected_cast"] = selected
+    return {"selected_cast": [t.to_dict() for t in selected]}, 200
 
 
-@app.route("/start_production", methods=["POST"])
-def start_production():
-    project = SESSION.get("selected_project")
-    cast = SESSION.get("selected_cast", [])
+def op_solve_cast(state: dict, data):
+    """Suggest the best cast for the selected project within its budget.
+
+    Body fields: ``objective`` (``"quality"`` or ``"box_office"``),
+    ``time_budget_ms`` and ``select`` (also make the suggestion the selected
+    cast). Roles without a talent pool in the session get a freshly
+    generated one first.
+    """
+    project = state.get("selected_project")
+    if not project:
+        return {"error": "No project selected"}, 400
+    objective = data.get("objective", "quality")
+    if objective not in OBJECTIVES:
+        return {"error": f"objective must be one of {', '.join(OBJECTIVES)}"}, 400
+    try:
+        time_budget = min(5.0, max(0.001, float(data.get("time_budget_ms", 500)) / 1000))
+    except (TypeError, ValueError):
+        return {"error": "time_budget_ms must be a number"}, 400
+
+    roles = project.get("roles", [])
+    for role in roles:
+        if role not in state.get("talent_pools", {}):
+            pool = new_talent_pool(state, role)
+            store_talent_pool(state, role, pool)
+    pools = {role: state["talent_pools"][role] for role in roles}
+    solved = solve_cast(pools, project.get("budget", 0), objective, time_budget)
+
+    if solved["selections"] is None:
+        return {"error": "No cast fits the budget"}, 422
+    cast = list(solved["selections"].values())
+    if data.get("select"):
+        state["selected_cast"] = cast
+    return {
+        "selections": {role: t.id for role, t in solved["selections"].items()},
+        "cast": [t.to_dict() for t in cast],
+        "score": solved["score"],
+        "total_cost": solved["total_cost"],
+        "optimal": solved["optimal"],
+        "evaluation": evaluate_casting_choices(cast),
+    }, 200
+
+
+def op_preview_decisions(state: dict, data):
+    """Expected outcome of every production decision option for the current cast.
+
+    Body fields: ``samples`` per option (default 10k) and an optional
+    ``seed`` for the simulations.
+    """
+    project = state.get("selected_project")
+    cast = state.get("selected_cast", [])
     if not project or not cast:
-        return jsonify({"error": "Project or cast missing"}), 400
-    result = run_production(project, cast)
-    SESSION["production_result"] = result
-    return jsonify(result)
+        return {"error": "Project or cast missing"}, 400
+    samples = min(MAX_SAMPLES, max(2, _int_param(data, "samples", DEFAULT_SAMPLES)))
+    seed = data.get("seed")
+    if seed is not None:
+        try:
+            seed = int(seed)
+        except (TypeError, ValueError):
+            return {"error": "Seed must be an integer"}, 400
+    return preview_decisions(project, cast, samples, seed), 200
 
 
-@app.route("/release_project", methods=["POST"])
-def release_project():
-    project = SESSION.get("selected_project")
-    production = SESSION.get("production_result")
-    player = SESSION.get("player")
-    cast = SESSION.get("selected_cast", [])
+def op_start_production(state: dict, data):
+    """Run the production, optionally applying the player's ``decisions``."""
+    project = state.get("selected_project")
+    cast = state.get("selected_cast", [])
+    if not project or not cast:
+        return {"error": "Project or cast missing"}, 400
+    decisions = data.get("decisions")
+    if decisions is not None:
+        if not isinstance(decisions, dict) or set(decisions) - set(DECISIONS):
+            return {"error": f"decisions may only contain {', '.join(DECISIONS)}"}, 400
+        project = state["selected_project"] = {**project, "decisions": decisions}
+    result = run_production(project, cast, session_rng(state).production)
+    state["production_result"] = result
+    return result, 200
+
+
+def publish_release(player_id: str, name: str, index: int, completed: dict) -> None:
+    """Enter a stored release into the leaderboards and the awards season.
+
+    If the release closes the season, every player's results wait in the
+    awards mailbox for their next request.
+    """
+    LEADERBOARDS.record(player_id, name, completed)
+    season = AWARDS_CALENDAR.record_release(player_id, name, index, completed)
+    if season:
+        for winner, results in season.items():
+            for result in results.values():
+                LEADERBOARDS.record_awards(winner, result, result["wins"])
+
+
+def op_release_project(state: dict, data):
+    project = state.get("selected_project")
+    production = state.get("production_result")
+    player = state.get("player")
+    cast = state.get("selected_cast", [])
     if not project or not production or not player:
-        return jsonify({"error": "Production not completed"}), 400
+        return {"error": "Production not completed"}, 400
 
     quality = production.get("final_quality_score")
-    release_results = evaluate_release(project, quality, cast)
+    release_results = evaluate_release(project, quality, cast, session_rng(state).release)
     completed = dict(project)
     completed.update(release_results)
+    player.adjust_reputation(reputation_change(release_results))
     add_completed_project(player, completed)
-    SESSION.pop("talent_pools", None)
+    after_commit(
+        publish_release, player.player_id, player.name, len(player.past_projects) - 1, completed
+    )
+    if uses_market(state):
+        MARKET.record_relationships(player, cast, release_results)
+        after_commit(MARKET.record_release, cast, release_results)
+    if CAREERS is not None:
+        # The stored profile (reputation, relationships) follows every release.
+        after_commit(CAREERS.save_player, player)
+    state.pop("talent_pools", None)
+    state.pop("talent_indexes", None)
+
+    state.pop("selected_project", None)
+    state.pop("selected_cast", None)
+    state.pop("production_result", None)
+    return release_results, 200
+
+
+# Operations accepted by ``/batch``, by name
+OPERATIONS = {
+    "start_game": op_start_game,
+    "get_projects": op_get_projects,
+    "select_project": op_select_project,
+    "get_talent_pool": op_get_talent_pool,
+    "get_talent_pools": op_get_talent_pools,
+    "search_talent": op_search_talent,
+    "get_profile": op_get_profile,
+    "get_leaderboard": op_get_leaderboard,
+    "get_leaderboard_rank": op_get_leaderboard_rank,
+    "get_awards_season": op_get_awards_season,
+    "get_career_history": op_get_career_history,
+    "select_cast": op_select_cast,
+    "solve_cast": op_solve_cast,
+    "preview_decisions": op_preview_decisions,
+    "start_production": op_start_production,
+    "release_project": op_release_project,
+}
+
+# Most operations one ``/batch`` request may contain
+MAX_BATCH_OPERATIONS = 50
+
+
+# --- Routes ---
+
+@app.route("/start_game", methods=["POST"])
+def start_game():
+    return respond(op_start_game(current_session(), request.get_json(force=True)))
+
+
+@app.route("/get_projects", methods=["GET"])
+def get_projects():
+    return respond(op_get_projects(current_session(), request.args))
+
+
+@app.route("/get_talent_pool", methods=["GET"])
+def get_talent_pool():
+    """Return a generated talent pool for the requested role.
+
+    ``count`` (default 5) sets the pool size, up to ``MAX_POOL_SIZE``.
+    """
+    return respond(op_get_talent_pool(current_session(), request.args))
+
+
+@app.route("/get_talent_pools", methods=["GET"])
+def get_talent_pools():
+    """Return talent pools for every role of an offer, keyed by role.
+
+    Takes an optional ``project_id`` (default: the selected project) and
+    ``count`` per pool.
+    """
+    return respond(op_get_talent_pools(current_session(), request.args))
+
+
+@app.route("/search_talent", methods=["GET"])
+def search_talent():
+    """Search the session's talent pools.
+
+    Supports inclusive ``min_``/``max_`` bounds on ``skill``, ``star_power``
+    and ``cost``, ``available`` and ``willing`` flags, ``sort`` and
+    ``order`` (``asc``/``desc``) plus ``page``/``page_size`` paging. Limit the
+    search to one pool with ``role``.
+    """
+    return respond(op_search_talent(current_session(), request.args))
+
+
+@app.route("/get_profile", methods=["GET"])
+def get_profile():
+    """Return a summary of the current player's career so far.
+
+    All project entries are listed unless the ``page_size`` query parameter
+    asks for one ``page`` of them.
+    """
+    return respond(op_get_profile(current_session(), request.args))
+
+
+@app.route("/career_history", methods=["GET"])
+def get_career_history():
+    """Return career time series (``reputation``, ``cumulative_box_office``, ...).
+
+    ``series`` is a comma-separated list (default: all), ``start`` and
+    ``stop`` select releases by 0-based index and ``points`` (default 100,
+    up to ``MAX_HISTORY_POINTS``) caps the points returned per series.
+    """
+    return respond(op_get_career_history(current_session(), request.args))
+
+
+@app.route("/leaderboard", methods=["GET"])
+def leaderboard():
+    """Rank players by ``box_office``, ``profit``, ``critics_average`` or ``awards``."""
+    return respond(op_get_leaderboard(current_session(), request.args))
+
+
+@app.route("/leaderboard/rank", methods=["GET"])
+def leaderboard_rank():
+    return respond(op_get_leaderboard_rank(current_session(), request.args))
+
+
+@app.route("/awards_season", methods=["GET"])
+def awards_season():
+    return respond(op_get_awards_season(current_session(), request.args))
+
+
+@app.route("/select_project", methods=["POST"])
+def select_project():
+    return respond(op_select_project(current_session(), request.get_json(force=True)))
+
+
+@app.route("/select_cast", methods=["POST"])
+def select_cast():
+    return respond(op_select_cast(current_session(), request.get_json(force=True)))
+
+
+@app.route("/solve_cast", methods=["POST"])
+def solve_cast_route():
+    return respond(op_solve_cast(current_session(), request.get_json(silent=True) or {}))
+
+
+@app.route("/preview_decisions", methods=["POST"])
+def preview_decisions_route():
+    return respond(op_preview_decisions(current_session(), request.get_json(silent=True) or {}))
+
+
+@app.route("/start_production", methods=["POST"])
+def start_production():
+    return respond(op_start_production(current_session(), request.get_json(silent=True) or {}))
+
+
+@app.route("/production_stream", methods=["GET"])
+def production_stream():
+    """Stream the production timeline as Server-Sent Events.
+
+    Under WSGI the events are sent back to back; serve ``asgi:app`` to pace
+    them week by week without tying up a worker per viewer.
+    """
+    state = current_session()
+    events = production_events(state)
+    if events is None:
+        return jsonify({"error": "Project or cast missing"}), 400
+    return app.response_class(
+        (sse_event(event) for event in events),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+@app.route("/release_project", methods=["POST"])
+def release_project():
+    return respond(op_release_project(current_session(), request.get_json(silent=True) or {}))
+
+
+@app.route("/batch", methods=["POST"])
+def batch():
+    """Run several operations in order in one request.
+
+    Body: ``{"operations": [{"op": "get_projects"}, {"op": "select_project",
+    "offer_index": 0}, ...]}`` where each entry holds the operation name and
+    the parameters its own endpoint takes. The session stays locked for the
+    whole batch, so no other request interleaves with it. The batch is all or
+    nothing: execution stops at the first operation that fails, the session
+    is restored to its state before the batch and the shared updates queued
+    by earlier operations are dropped. The response lists each executed
+    operation's ``status`` and ``body``, carries the failing status and
+    reports ``completed: 0``.
+    """
+    data = request.get_json(force=True)
+    operations = data.get("operations") if isinstance(data, dict) else None
+    if not isinstance(operations, list) or not operations:
+        return jsonify({"error": "operations must be a non-empty list"}), 400
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        return jsonify({"error": f"At most {MAX_BATCH_OPERATIONS} operations per batch"}), 400
 
-    SESSION.pop("selected_project", None)
-    SESSION.pop("selected_cast", None)
-    SESSION.pop("production_result", None)
-    return jsonify(release_results)
+    state = current_session()
+    snapshot = encode_state(state)
+    queued = len(g.session_effects)
+    parts = []
+    status = 200
+    try:
+        for entry in operations:
+            name = entry.get("op") if isinstance(entry, dict) else None
+            operation = OPERATIONS.get(name)
+            if operation is None:
+                body, status = {"error": f"Unknown operation {name!r}"}, 400
+            else:
+                body, status = operation(state, entry)
+            parts.append(
+                b'{"op":%s,"status":%d,"body":%s}' % (dumps(name), status, encode_body(body))
+            )
+            if status >= 400:
+                break
+    except BaseException:
+        status = 500
+        raise
+    finally:
+        if status >= 400:
+            # Roll back: the session as it was and none of the batch's
+            # shared updates (effects queued before it, such as award
+            # acknowledgements, stay).
+            state.clear()
+            state.update(decode_state(snapshot))
+            del g.session_effects[queued:]
+    completed = len(parts) if status < 400 else 0
+    return app.response_class(
+        b'{"completed":%d,"results":[%s]}' % (completed, b",".join(parts)),
+        status=status,
+        mimetype="application/json",
+    )
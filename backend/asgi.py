@@ -0,0 +1,209 @@
+"""ASGI entry point that streams production timelines to many viewers.
+
+``GET /production_stream`` is served natively. It passes the same
+admission control as the Flask routes, then the production is simulated in
+a worker thread under the session lock and stored, and the request is
+recorded like any other. Only then are its events sent as Server-Sent
+Events, one shooting week at a time with ``asyncio.sleep`` in between, so
+the admission slot and the session lock are not held while the stream is
+paced. An open stream costs a suspended coroutine rather than a blocked
+worker thread. Every other path is handed to the Flask app through
+asgiref's ``WsgiToAsgi``.
+
+Run from ``backend/``::
+
+    uvicorn asgi:app
+
+``EventSource`` cannot set headers; it identifies the session with the
+``director_session`` cookie, which it sends to the API's origin when opened
+with ``new EventSource(url, {withCredentials: true})`` (the response then
+names the page's origin and allows credentials). ``DIRECTOR_STREAM_INTERVAL``
+sets the pause between events in seconds (default 0.5).
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from http.cookies import SimpleCookie
+from typing import List, Optional, Tuple
+
+from asgiref.wsgi import WsgiToAsgi
+
+from admission import admit_request, rejection
+from app import (
+    ADMISSION,
+    RECORDER,
+    SESSION_COOKIE,
+    SESSION_HEADER,
+    SESSIONS,
+    app as flask_app,
+    production_events,
+    sse_event,
+    start_services,
+)
+from instrumentation import METRICS
+from recorder import request_entry
+
+STREAM_PATH = "/production_stream"
+STREAM_INTERVAL = float(os.environ.get("DIRECTOR_STREAM_INTERVAL", 0.5))
+
+wsgi_app = WsgiToAsgi(flask_app)
+
+
+def _session_token(scope) -> Optional[str]:
+    headers = dict(scope["headers"])
+    token = headers.get(SESSION_HEADER.lower().encode())
+    if token:
+        return token.decode("latin-1")
+    cookie = headers.get(b"cookie")
+    if cookie:
+        morsel = SimpleCookie(cookie.decode("latin-1")).get(SESSION_COOKIE)
+        if morsel is not None:
+            return morsel.value
+    return None
+
+
+def _cors_headers(scope) -> List[Tuple[bytes, bytes]]:
+    """Let ``EventSource`` pages on another origin send the session cookie."""
+    origin = dict(scope["headers"]).get(b"origin")
+    if origin is None:
+        return [(b"access-control-allow-origin", b"*")]
+    return [
+        (b"access-control-allow-origin", origin),
+        (b"access-control-allow-credentials", b"true"),
+        (b"vary", b"Origin"),
+    ]
+
+
+def _admit(scope, token: Optional[str]) -> Optional[Tuple[str, float]]:
+    """Run the admission checks of ``/production_stream``; may wait for a slot."""
+    client = token if token and token in SESSIONS else (scope.get("client") or ("",))[0]
+    return admit_request(ADMISSION, STREAM_PATH, client or "")
+
+
+def _run_production(token: str, at: float, started: float) -> Tuple[int, Optional[list]]:
+    """Simulate the production of the session's project and store the result.
+
+    Runs in a worker thread: acquiring the session may block on its lock or
+    on the session backend. Returns the status and the events, which are
+    ``None`` when there is nothing to produce (400) or the session was
+    changed concurrently (409).
+    """
+    session = SESSIONS.acquire(token, create=False)
+    if session is None:
+        return 400, None
+    try:
+        events = production_events(session.data)
+        if events is None:
+            status = 400
+        elif not SESSIONS.commit(session):
+            status, events = 409, None
+        else:
+            status = 200
+        if RECORDER is not None:
+            RECORDER.record(request_entry(
+                at, session.token, "GET", STREAM_PATH, "", None, session.data, status, started
+            ))
+        return status, events
+    finally:
+        SESSIONS.release(session)
+
+
+async def _send_json(scope, send, status: int, body: dict, headers=()) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            *_cors_headers(scope),
+            *((name.lower().encode(), value.encode()) for name, value in headers),
+        ],
+    })
+    await send({"type": "http.response.body", "body": json.dumps(body).encode()})
+
+
+async def production_stream(scope, receive, send) -> None:
+    started = time.perf_counter()
+    at = RECORDER.elapsed() if RECORDER is not None else 0.0
+    token = _session_token(scope)
+
+    rejected = await asyncio.to_thread(_admit, scope, token) if ADMISSION is not None else None
+    if rejected is not None:
+        status, body, headers = rejection(*rejected)
+        events = None
+    else:
+        held = time.perf_counter()
+        try:
+            status, events = (
+                await asyncio.to_thread(_run_production, token, at, started) if token else (400, None)
+            )
+        finally:
+            if ADMISSION is not None:
+                # The slot covers the simulation only, not the paced stream.
+                ADMISSION.done(STREAM_PATH, time.perf_counter() - held)
+        headers = {}
+        if status == 409:
+            body = {"error": "Session was modified concurrently; retry"}
+        else:
+            body = {"error": "Project or cast missing"}
+    METRICS.inc(
+        "director_requests_total",
+        {"route": STREAM_PATH, "method": "GET", "status": str(status)},
+    )
+    METRICS.observe("director_request_seconds", time.perf_counter() - started, {"route": STREAM_PATH})
+
+    if events is None:
+        await _send_json(scope, send, status, body, headers.items())
+        return
+
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"text/event-stream"),
+            (b"cache-control", b"no-cache"),
+            (b"x-accel-buffering", b"no"),
+            *_cors_headers(scope),
+        ],
+    })
+
+    disconnected = asyncio.Event()
+
+    async def watch_disconnect():
+        while (await receive())["type"] != "http.disconnect":
+            pass
+        disconnected.set()
+
+    watcher = asyncio.ensure_future(watch_disconnect())
+    try:
+        for i, event in enumerate(events):
+            if i:
+                await asyncio.sleep(STREAM_INTERVAL)
+                if disconnected.is_set():
+                    return
+            await send({"type": "http.response.body", "body": sse_event(event).encode(), "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+    finally:
+        watcher.cancel()
+
+
+async def _lifespan(receive, send) -> None:
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            start_services()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send) -> None:
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+    elif scope["type"] == "http" and scope["path"] == STREAM_PATH and scope["method"] == "GET":
+        await production_stream(scope, receive, send)
+    else:
+        await wsgi_app(scope, receive, send)
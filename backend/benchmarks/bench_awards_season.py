@@ -0,0 +1,85 @@
+"""Time an awards season with many releases.
+
+Enters ``--releases`` synthetic releases into an
+:class:`~game_engine.awards_season.AwardsSeason`, optionally looking at the
+standings every ``--every`` releases (incremental scoring), then resolves
+it. The nominees are checked against a full sort of every release's
+category scores.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_awards_season --releases 100000 --every 1000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+
+import numpy as np
+
+from game_engine.awards_season import CATEGORIES, AwardsSeason
+from game_engine.constants import GENRES
+
+
+def _release(rng: random.Random, i: int) -> dict:
+    medium = rng.choice(list(GENRES))
+    critics = rng.randint(20, 100)
+    project = {
+        "id": i,
+        "title": f"Project {i}",
+        "medium": medium,
+        "genre": rng.choice(GENRES[medium]),
+        "budget": rng.randint(1_000_000, 5_000_000),
+        "risk_factor": rng.randint(1, 10),
+        "player_written": rng.random() < 0.2,
+        "critics_score": critics,
+        "fan_score": max(0, min(100, critics + rng.randint(-15, 15))),
+    }
+    if medium == "tv":
+        project["viewership"] = rng.randint(50_000, 500_000)
+    else:
+        project["box_office"] = rng.randint(1_000_000, 20_000_000)
+    return project
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--releases", type=int, default=100_000)
+    parser.add_argument("--every", type=int, default=0, help="check standings every N releases")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    projects = [_release(rng, i) for i in range(args.releases)]
+
+    season = AwardsSeason(seed=args.seed)
+    started = time.perf_counter()
+    for i, project in enumerate(projects):
+        season.add(f"id{i % 5000}", f"player{i % 5000}", i // 5000, project)
+        if args.every and (i + 1) % args.every == 0:
+            season.standings()
+    added = time.perf_counter()
+    results = season.resolve()
+    resolved = time.perf_counter()
+
+    print(f"{'releases':<18}{args.releases:>10}")
+    print(f"{'add + standings' if args.every else 'add':<18}{added - started:10.3f} s")
+    print(f"{'resolve':<18}{resolved - added:10.3f} s")
+    print(f"{'total':<18}{resolved - started:10.3f} s")
+    print(f"{'players awarded':<18}{len(results):>10}")
+
+    scores = np.frombuffer(season.scores, dtype=np.float64).reshape(-1, len(CATEGORIES))
+    standings = season.standings()
+    for i, category in enumerate(CATEGORIES):
+        expected = np.sort(scores[:, i][np.isfinite(scores[:, i])])[::-1][:season.nominees]
+        got = [entry["score"] for entry in standings[category]]
+        if not np.allclose(np.round(expected, 2), got):
+            print(f"FAILED: {category} nominees differ from a full sort")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
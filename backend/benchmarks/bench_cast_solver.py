@@ -0,0 +1,70 @@
+"""Benchmark the budgeted cast solver across pool sizes.
+
+For every pool size the solver picks one talent for each of four roles
+under a budget tight enough to rule out the unconstrained best cast. Small
+pools are cross-checked against exhaustive search.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_cast_solver --sizes 5 50 500 5000 10000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+
+from game_engine.cast_solver import brute_force_cast, solve_cast
+from game_engine.talent_pool import TalentPool
+
+ROLES = ("lead actor", "supporting actor", "editor", "composer")
+
+# Largest pool size whose full cartesian product is checked exhaustively.
+BRUTE_FORCE_LIMIT = 12
+
+
+def _pools(size: int, seed: int):
+    rng = random.Random(seed)
+    return {role: TalentPool.generate(role, size, rng) for role in ROLES}
+
+
+def _tight_budget(pools) -> int:
+    # Median cost per role: the best cast typically costs far more.
+    return sum(int(statistics.median(t.cost for t in pool)) for pool in pools.values())
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 50, 500, 5000, 10000])
+    parser.add_argument("--trials", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=11)
+    parser.add_argument("--time-budget", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    failures = 0
+    print(f"{'size':>6} {'objective':>10} {'median ms':>10} {'max ms':>8} {'nodes':>8} optimal")
+    for size in args.sizes:
+        for objective in ("quality", "box_office"):
+            times, nodes, optimal = [], [], True
+            for trial in range(args.trials):
+                pools = _pools(size, args.seed + trial)
+                budget = _tight_budget(pools)
+                solved = solve_cast(pools, budget, objective, args.time_budget)
+                times.append(solved["elapsed"] * 1000)
+                nodes.append(solved["nodes"])
+                optimal = optimal and solved["optimal"]
+                if size <= BRUTE_FORCE_LIMIT:
+                    expected = brute_force_cast(pools, budget, objective)
+                    if abs(expected[0] - solved["score"]) > 1e-6:
+                        print(f"  mismatch: solver {solved['score']} vs brute force {expected[0]}")
+                        failures += 1
+            print(
+                f"{size:>6} {objective:>10} {statistics.median(times):>10.2f} "
+                f"{max(times):>8.2f} {max(nodes):>8} {optimal}"
+            )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""Show that career history queries do not slow down as careers grow.
+
+Builds a :class:`~game_engine.history.CareerHistory` for careers of several
+lengths, timing the appends, then times full-career and random-range
+queries of ``--points`` points per series. One query per career is checked
+against a direct computation over the raw values.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_history --lengths 1000 100000 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+
+from benchmarks.suite import percentiles
+from game_engine.history import CareerHistory
+
+QUERY_SERIES = ["reputation", "critics_score", "cumulative_box_office"]
+
+
+def _records(length: int, seed: int):
+    rng = random.Random(seed)
+    reputation = 10
+    for _ in range(length):
+        reputation = max(0, min(100, reputation + rng.randint(-2, 2)))
+        yield {
+            "critics_score": rng.randint(0, 100),
+            "fan_score": rng.randint(0, 100),
+            "box_office": rng.randint(0, 20_000_000),
+            "profit": rng.randint(-1_000_000, 5_000_000),
+            "player_reputation": reputation,
+        }
+
+
+def _check(history: CareerHistory, records: list, start: int, stop: int, points: int) -> bool:
+    result = history.query(["critics_score"], start, stop, points)
+    column = result["series"]["critics_score"]
+    bounds = result["index"] + [stop]
+    for i, low in enumerate(result["index"]):
+        values = [r["critics_score"] for r in records[low:bounds[i + 1]]]
+        if (column["min"][i], column["max"][i], column["last"][i]) != (min(values), max(values), values[-1]):
+            return False
+        if abs(column["mean"][i] - sum(values) / len(values)) > 1e-9:
+            return False
+    return True
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lengths", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--points", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args(argv)
+
+    print(f"{'projects':>10} {'append us':>10} {'full p50 us':>12} {'range p50 us':>13} {'range p99 us':>13}")
+    for length in args.lengths:
+        records = list(_records(length, args.seed))
+        history = CareerHistory()
+        started = time.perf_counter()
+        for record in records:
+            history.append(record)
+        append_us = (time.perf_counter() - started) / length * 1e6
+
+        rng = random.Random(args.seed)
+        full, ranged = [], []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            history.query(QUERY_SERIES, points=args.points)
+            full.append(time.perf_counter() - started)
+            start = rng.randrange(length)
+            stop = rng.randrange(start, length) + 1
+            started = time.perf_counter()
+            history.query(QUERY_SERIES, start, stop, args.points)
+            ranged.append(time.perf_counter() - started)
+        start = rng.randrange(length)
+        if not _check(history, records, start, length, args.points):
+            print(f"FAILED: downsampled query differs from the raw values ({length} projects)")
+            return 1
+        full_stats, range_stats = percentiles(full), percentiles(ranged)
+        print(
+            f"{length:>10} {append_us:>10.2f} {full_stats['p50_us']:>12.1f}"
+            f" {range_stats['p50_us']:>13.1f} {range_stats['p99_us']:>13.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
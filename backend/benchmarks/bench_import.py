@@ -0,0 +1,91 @@
+"""Check cold-start import time against a budget.
+
+Each target module is imported in a fresh interpreter with ``-X importtime``
+and its cumulative import time is taken from the best of several runs. The
+slowest modules it pulled in are listed, and the run fails when a target
+exceeds its budget or loads a module it must not load at import time (NumPy
+is only needed once a batch or preview call is made).
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_import
+    python -m benchmarks.bench_import --scale 2   # slower machine
+
+Exits with status 1 if any budget is exceeded.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Target module -> (budget in ms, modules it must not import)
+BUDGETS: Dict[str, Tuple[float, Tuple[str, ...]]] = {
+    "game_engine": (10.0, ("numpy", "typing")),
+    "game_engine.simulation": (100.0, ("numpy", "concurrent.futures")),
+    "app": (400.0, ("numpy", "asgiref")),
+}
+
+
+def import_profile(module: str) -> Tuple[float, List[Tuple[float, str]], List[str]]:
+    """Import ``module`` in a fresh interpreter.
+
+    Returns its cumulative import time in ms, the ``(ms, name)`` of each
+    module it imported directly, and the names of all loaded modules.
+    """
+    env = dict(os.environ, DIRECTOR_PREGEN_SIZE="0", PYTHONDONTWRITEBYTECODE="1")
+    code = f"import sys, {module}; print('\\n'.join(sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, env=env, check=True, cwd=BACKEND,
+    )
+    total = 0.0
+    children: List[Tuple[float, str]] = []
+    pending: List[Tuple[float, str]] = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, raw_name = line[len("import time:"):].split("|")
+        name = raw_name.strip()
+        depth = (len(raw_name) - len(raw_name.lstrip()) - 1) // 2
+        ms = int(cumulative) / 1000
+        if depth == 1:
+            pending.append((ms, name))
+        elif depth == 0:
+            if name == module:
+                total, children = ms, pending
+            pending = []
+    return total, sorted(children, reverse=True), result.stdout.split()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every budget")
+    parser.add_argument("--top", type=int, default=5, help="slowest imports to list")
+    parser.add_argument("modules", nargs="*", default=list(BUDGETS))
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module in args.modules:
+        budget, forbidden = BUDGETS.get(module, (float("inf"), ()))
+        budget *= args.scale
+        runs = [import_profile(module) for _ in range(args.repeat)]
+        best, children, loaded = min(runs, key=lambda run: run[0])
+        leaked = sorted(name for name in forbidden if name in loaded)
+        ok = best <= budget and not leaked
+        failed |= not ok
+        print(f"{module:<24} {best:8.1f} ms  budget {budget:6.0f} ms  {'ok' if ok else 'OVER BUDGET'}")
+        if leaked:
+            print(f"  imported at start-up: {', '.join(leaked)}")
+        for ms, name in children[:args.top]:
+            print(f"  {ms:8.1f} ms  {name}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""Measure the per-offer cost of offer generation.
+
+Compares the original offer generator, which rebuilt its medium list, role
+list and tagline for every offer, with the table-driven
+:func:`~game_engine.offers.generate_offer` and the bulk
+:func:`~game_engine.offers.generate_offers`. Also checks that seeded offer
+lists are unchanged by the tables.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_offers --offers 100000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from typing import List
+
+from game_engine.constants import GENRES, ROLES
+from game_engine.offers import generate_offer, generate_offer_list, generate_offers
+
+
+def legacy_offer(offer_id, rng):
+    """The offer generator before the precomputed tables, for comparison."""
+    medium = rng.choice(list(GENRES.keys()))
+    genre = rng.choice(GENRES[medium])
+    roles = ["lead actor", "supporting actor"]
+    others = [r for r in ROLES if r != "director" and r not in roles]
+    rng.shuffle(others)
+    roles.extend(others[:2])
+    offer = {
+        "id": offer_id,
+        "title": f"Project {offer_id}",
+        "budget": rng.randint(1_000_000, 5_000_000),
+        "genre": genre,
+        "medium": medium,
+        "roles": roles,
+        "tagline": f"A {genre} {medium} experience",
+        "risk": rng.randint(1, 10),
+    }
+    offer["risk_factor"] = offer["risk"]
+    return offer
+
+
+def check_seeded_offers(seeds=range(200), offers: int = 3) -> List[int]:
+    """Return the seeds whose offers differ from :func:`legacy_offer`.
+
+    Checks :func:`generate_offer_list` and a run of ``offers``
+    :func:`generate_offer` calls on one stream.
+    """
+    failed = []
+    for seed in seeds:
+        rng = random.Random(seed)
+        legacy = [legacy_offer(i, rng) for i in range(1, offers + 1)]
+        rng = random.Random(seed)
+        if (
+            generate_offer_list(random.Random(seed)) != legacy[:3]
+            or [generate_offer(i, rng) for i in range(1, offers + 1)] != legacy
+        ):
+            failed.append(seed)
+    return failed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--offers", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    failed = check_seeded_offers()
+    if failed:
+        print(f"FAILED: seeded offers differ from the original generator (seed {failed[0]})")
+        return 1
+
+    n = args.offers
+    rng = random.Random(args.seed)
+    cases = {
+        "original": lambda: [legacy_offer(i, rng) for i in range(n)],
+        "generate_offer": lambda: [generate_offer(i, rng) for i in range(n)],
+        "generate_offers": lambda: generate_offers(n, rng),
+    }
+    # Interleave the cases so a noisy machine affects them alike.
+    best = dict.fromkeys(cases, float("inf"))
+    for _ in range(args.repeat):
+        for name, build in cases.items():
+            started = time.perf_counter()
+            build()
+            best[name] = min(best[name], time.perf_counter() - started)
+    print(f"{'offers':<18}{n:>10}")
+    for name, seconds in best.items():
+        us = seconds / n * 1e6
+        print(f"{name:<18}{us:10.2f} us/offer  {best['original'] / seconds:5.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
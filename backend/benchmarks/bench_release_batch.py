@@ -0,0 +1,169 @@
+"""Compare the batch release engine against the scalar path.
+
+Checks that :func:`game_engine.batch.evaluate_release_batch` reproduces the
+distributions of :func:`game_engine.release.evaluate_release` (two-sample
+Kolmogorov-Smirnov on the continuous outputs, z-tests on award rates) and
+reports the per-release speed-up.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_release_batch --samples 20000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from game_engine.batch import AWARD_COLUMNS, evaluate_release_batch, unpack_awards
+from game_engine.release import evaluate_release
+
+# 0.1% significance; several statistics are checked so keep false alarms rare.
+KS_COEFFICIENT = 1.95
+Z_CRITICAL = 3.29
+
+
+def _inputs(n: int, seed: int):
+    gen = np.random.default_rng(seed)
+    return {
+        "quality": gen.integers(40, 110, size=n),
+        "stars": gen.integers(0, 101, size=n).astype(float),
+        "budget": gen.integers(1_000_000, 5_000_001, size=n),
+        "medium": gen.choice(["film", "tv", "commercial"], size=n),
+        "risk": gen.integers(1, 11, size=n),
+    }
+
+
+def _scalar(inputs, seed: int):
+    random.seed(seed)
+    n = len(inputs["quality"])
+    rows = {"critics_score": [], "fan_score": [], "gross": [], "profit": []}
+    awards = np.zeros((n, len(AWARD_COLUMNS)), dtype=bool)
+    noms = np.zeros_like(awards)
+    for i in range(n):
+        project = {
+            "medium": str(inputs["medium"][i]),
+            "budget": int(inputs["budget"][i]),
+            "risk_factor": int(inputs["risk"][i]),
+        }
+        cast = [SimpleNamespace(star_power=float(inputs["stars"][i]))]
+        result = evaluate_release(project, int(inputs["quality"][i]), cast)
+        rows["critics_score"].append(result["critics_score"])
+        rows["fan_score"].append(result["fan_score"])
+        rows["gross"].append(result.get("box_office", result.get("viewership")))
+        rows["profit"].append(result["profit"])
+        for name in result["awards"]:
+            awards[i, AWARD_COLUMNS.index(name)] = True
+        for name in result["award_nominations"]:
+            noms[i, AWARD_COLUMNS.index(name)] = True
+    out = {k: np.asarray(v) for k, v in rows.items()}
+    out["awards"] = awards
+    out["award_nominations"] = noms
+    return out
+
+
+def _batch(inputs, seed: int):
+    result = evaluate_release_batch(
+        inputs["quality"],
+        inputs["stars"],
+        inputs["budget"],
+        inputs["medium"],
+        risk_factors=inputs["risk"],
+        rng=seed,
+    )
+    result["gross"] = result["box_office"] + result["viewership"]
+    result["awards"] = unpack_awards(result["awards"])
+    result["award_nominations"] = unpack_awards(result["award_nominations"])
+    return result
+
+
+def _ks_statistic(a: np.ndarray, b: np.ndarray) -> float:
+    a = np.sort(a)
+    b = np.sort(b)
+    grid = np.concatenate([a, b])
+    cdf_a = np.searchsorted(a, grid, side="right") / a.size
+    cdf_b = np.searchsorted(b, grid, side="right") / b.size
+    return float(np.max(np.abs(cdf_a - cdf_b)))
+
+
+def check_distributions(samples: int, seed: int) -> list:
+    """Return a list of failed checks (empty when the paths agree)."""
+    inputs = _inputs(samples, seed)
+    scalar = _scalar(inputs, seed + 1)
+    batch = _batch(inputs, seed + 2)
+    failures = []
+    critical = KS_COEFFICIENT * np.sqrt(2 / samples)
+    for key in ("critics_score", "fan_score", "gross", "profit"):
+        stat = _ks_statistic(scalar[key], batch[key])
+        status = "ok" if stat <= critical else "FAIL"
+        print(f"  KS {key:<16} D={stat:.4f} (critical {critical:.4f}) {status}")
+        if stat > critical:
+            failures.append(key)
+    for matrix in ("awards", "award_nominations"):
+        for col, name in enumerate(AWARD_COLUMNS):
+            p1 = scalar[matrix][:, col].mean()
+            p2 = batch[matrix][:, col].mean()
+            pooled = (p1 + p2) / 2
+            se = np.sqrt(max(pooled * (1 - pooled), 1e-12) * 2 / samples)
+            z = abs(p1 - p2) / se
+            if z > Z_CRITICAL:
+                print(f"  rate {matrix}[{name}] {p1:.4f} vs {p2:.4f} z={z:.2f} FAIL")
+                failures.append(f"{matrix}:{name}")
+    return failures
+
+
+def time_paths(samples: int, seed: int) -> float:
+    inputs = _inputs(samples, seed)
+    scalar_n = min(samples, 20_000)
+    scalar_inputs = {k: v[:scalar_n] for k, v in inputs.items()}
+    start = time.perf_counter()
+    _scalar(scalar_inputs, seed)
+    scalar_per = (time.perf_counter() - start) / scalar_n
+
+    timings = []
+    for _ in range(3):
+        start = time.perf_counter()
+        evaluate_release_batch(
+            inputs["quality"],
+            inputs["stars"],
+            inputs["budget"],
+            inputs["medium"],
+            risk_factors=inputs["risk"],
+            rng=seed,
+        )
+        timings.append(time.perf_counter() - start)
+    batch_per = min(timings) / samples
+
+    speedup = scalar_per / batch_per
+    print(f"  scalar: {scalar_per * 1e6:8.3f} us/release")
+    print(f"  batch:  {batch_per * 1e6:8.3f} us/release")
+    print(f"  speed-up: {speedup:.0f}x")
+    return speedup
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=20_000)
+    parser.add_argument("--timing-samples", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--min-speedup", type=float, default=100.0)
+    args = parser.parse_args(argv)
+
+    print("Distribution check")
+    failures = check_distributions(args.samples, args.seed)
+    print("Timing")
+    speedup = time_paths(args.timing_samples, args.seed)
+    if speedup < args.min_speedup:
+        failures.append(f"speed-up {speedup:.0f}x below {args.min_speedup:.0f}x")
+    if failures:
+        print("FAILED:", ", ".join(failures))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
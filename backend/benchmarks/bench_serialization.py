@@ -0,0 +1,64 @@
+"""Measure payload encoding latency as a career grows.
+
+For each career length, times ``/start_game`` (which returns the whole
+player) and ``/get_profile`` through the Flask test client, next to the
+previous ``jsonify(asdict(player))`` encoding of the same player.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_serialization
+    python -m benchmarks.bench_serialization --stdlib   # without orjson
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import asdict
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lengths", type=int, nargs="+", default=[10, 100, 1_000, 10_000])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--stdlib", action="store_true", help="pretend orjson is not installed")
+    args = parser.parse_args(argv)
+
+    if args.stdlib:
+        sys.modules["orjson"] = None  # makes ``import orjson`` raise ImportError
+
+    from app import SESSION_HEADER, SESSIONS, app
+    from benchmarks.suite import _career, measure
+    from game_engine.serialization import BACKEND, SERVER_ONLY_FIELDS, encode_player
+
+    print(f"JSON backend: {BACKEND}")
+    print(f"{'projects':>8} {'asdict+jsonify':>15} {'encode_player':>14} "
+          f"{'/start_game':>12} {'/get_profile':>13}  (p50 us)")
+    for length in args.lengths:
+        player = _career(length, 1)
+        client = app.test_client()
+        response = client.post("/start_game", json={"name": "Bench"})
+        session = SESSIONS.acquire(response.headers[SESSION_HEADER])
+        session.data["player"] = player
+        SESSIONS.commit(session)
+        SESSIONS.release(session)
+
+        with app.app_context():
+            legacy = measure(lambda: app.json.response({**asdict(player), "seed": None}), args.repeat)
+        encode = measure(lambda: encode_player(player, seed=None), args.repeat)
+        start_game = measure(lambda: client.post("/start_game", json={"name": "Bench"}), args.repeat)
+        profile = measure(lambda: client.get("/get_profile"), args.repeat)
+
+        # The payload is asdict(player) without the server-only fields.
+        expected = {k: v for k, v in asdict(player).items() if k not in SERVER_ONLY_FIELDS}
+        body = client.post("/start_game", json={"name": "Bench"}).get_json()
+        if body != json.loads(json.dumps({**expected, "seed": None})):
+            print("FAILED: /start_game payload differs from the public player fields")
+            return 1
+        print(f"{length:>8} {legacy['p50_us']:>15.1f} {encode['p50_us']:>14.1f} "
+              f"{start_game['p50_us']:>12.1f} {profile['p50_us']:>13.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+"""Measure how the career simulator scales with worker processes.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_simulation --players 400 --projects 20
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+from game_engine.simulation import simulate_careers
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, default=400)
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--policy", default="greedy")
+    parser.add_argument("--seed", type=int, default=3)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    counts = sorted({1, *[w for w in (2, 4, 8, 16, 32) if w <= args.max_workers], args.max_workers})
+    baseline = None
+    reference = None
+    print(f"{'workers':>7} {'seconds':>8} {'speed-up':>8} {'efficiency':>10}")
+    for workers in counts:
+        result = simulate_careers(args.players, args.projects, args.policy, args.seed, workers)
+        elapsed = result["stats"]["elapsed"]
+        if baseline is None:
+            baseline = elapsed
+            reference = result["columns"]
+        elif result["columns"] != reference:
+            print(f"FAILED: {workers} workers produced different results")
+            return 1
+        speedup = baseline / elapsed
+        print(f"{workers:>7} {elapsed:>8.2f} {speedup:>8.2f} {speedup / workers:>10.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""Measure memory and serialization cost of talent storage.
+
+Compares a list of :class:`game_engine.casting.Talent` dataclasses with the
+columnar :class:`game_engine.talent_pool.TalentPool` for the same talents.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_talent_pool --talents 200000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from game_engine.casting import generate_talent_pool
+from game_engine.constants import ROLES
+from game_engine.talent_pool import TalentPool
+
+
+def _measure(build):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    obj = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(s.size_diff for s in after.compare_to(before, "filename"))
+    return obj, allocated
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--talents", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    per_role = max(1, args.talents // len(ROLES))
+
+    def build_objects():
+        rng = random.Random(args.seed)
+        talents = []
+        for role in ROLES:
+            talents.extend(generate_talent_pool(role, per_role, rng))
+        return talents
+
+    def build_pool():
+        rng = random.Random(args.seed)
+        pool = TalentPool()
+        for role in ROLES:
+            TalentPool.generate(role, per_role, rng, pool=pool)
+        return pool
+
+    talents, object_bytes = _measure(build_objects)
+    pool, pool_bytes = _measure(build_pool)
+    count = len(talents)
+
+    start = time.perf_counter()
+    expected = json.dumps([t.to_dict() for t in talents])
+    dict_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    encoded = pool.to_json()
+    column_seconds = time.perf_counter() - start
+    if json.loads(encoded) != json.loads(expected):
+        print("FAILED: columnar JSON differs from Talent.to_dict output")
+        return 1
+
+    report = pool.memory_usage()
+    print(f"talents:                 {count}")
+    print(f"dataclass list:          {object_bytes / count:8.1f} bytes/talent (tracemalloc)")
+    print(f"TalentPool:              {pool_bytes / count:8.1f} bytes/talent (tracemalloc)")
+    print(f"TalentPool buffers:      {report['bytes_per_talent']:8.1f} bytes/talent (memory_usage)")
+    print(f"to_dict + json.dumps:    {dict_seconds / count * 1e6:8.3f} us/talent")
+    print(f"TalentPool.to_json:      {column_seconds / count * 1e6:8.3f} us/talent")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,279 @@
+"""Replay recorded game sessions against the app and report its capacity.
+
+Reads request logs written with ``DIRECTOR_RECORD`` (see :mod:`recorder`),
+merges them and sends every recorded session back, either to the Flask app
+in this process or over HTTP to a running server. Each session's requests
+are sent in order by one of ``--concurrency`` workers, with the session's
+own token. ``--speed`` compresses the recorded timeline (2 = twice as
+fast, 0 = as fast as possible). The report lists throughput, status codes
+and latency percentiles per route.
+
+With ``--deterministic`` every replayed game starts from its recorded seed,
+and responses of sessions that were seeded when recorded are checked
+against the recorded digests; the run fails if any differ. Responses that
+depend on other players (leaderboards, awards seasons) or on the shared
+content cache and talent market can only match when the same sessions are
+replayed alone and in the recorded order.
+
+Run from ``backend/``::
+
+    DIRECTOR_RECORD=play-{pid}.log.gz gunicorn -w 4 app:app   # record
+    python -m benchmarks.replay play-*.log.gz --concurrency 8 --speed 4
+    python -m benchmarks.replay play-*.log.gz --url http://127.0.0.1:8000 --speed 0
+"""
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from benchmarks.suite import percentiles
+from recorder import digest, read_log
+
+# Header carrying the session token, as in ``app.SESSION_HEADER``.
+SESSION_HEADER = "X-Session-Token"
+
+Response = Tuple[int, bytes, Optional[str]]
+
+
+def load_sessions(paths: List[str], limit: int = 0) -> List[List[Dict[str, Any]]]:
+    """Return the recorded sessions, each a list of requests in arrival order.
+
+    Every request gains ``offset``, its arrival time in seconds after the
+    first recorded request. Sessions are ordered by their first request;
+    ``limit`` keeps only the first sessions.
+    """
+    entries = sorted((entry for path in paths for entry in read_log(path)), key=lambda e: e["at"])
+    if not entries:
+        return []
+    origin = entries[0]["at"]
+    sessions: Dict[str, List[Dict[str, Any]]] = {}
+    for entry in entries:
+        entry["offset"] = entry["at"] - origin
+        if entry["session"] in sessions or not limit or len(sessions) < limit:
+            sessions.setdefault(entry["session"], []).append(entry)
+    return list(sessions.values())
+
+
+class InProcessClient:
+    """Send requests to the Flask app through one test client per thread."""
+
+    def __init__(self) -> None:
+        # Replayed traffic must not be recorded again.
+        os.environ.pop("DIRECTOR_RECORD", None)
+        from app import app
+
+        self._app = app
+        self._local = threading.local()
+
+    def send(self, method: str, path: str, query: str, body: Any, token: Optional[str]) -> Response:
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self._app.test_client(use_cookies=False)
+        response = client.open(
+            path,
+            method=method,
+            query_string=query,
+            json=body,
+            headers={SESSION_HEADER: token} if token else {},
+        )
+        return response.status_code, response.get_data(), response.headers.get(SESSION_HEADER)
+
+
+class HttpClient:
+    """Send requests over one keep-alive HTTP connection per thread."""
+
+    def __init__(self, url: str) -> None:
+        parts = urlsplit(url)
+        self._host = parts.hostname or "127.0.0.1"
+        self._port = parts.port or 80
+        self._prefix = parts.path.rstrip("/")
+        self._local = threading.local()
+
+    def send(self, method: str, path: str, query: str, body: Any, token: Optional[str]) -> Response:
+        headers = {}
+        if token:
+            headers[SESSION_HEADER] = token
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+        target = self._prefix + path + ("?" + query if query else "")
+        for attempt in range(2):
+            connection = getattr(self._local, "connection", None)
+            if connection is None:
+                connection = self._local.connection = http.client.HTTPConnection(self._host, self._port)
+            try:
+                connection.request(method, target, body=payload, headers=headers)
+                response = connection.getresponse()
+                return response.status, response.read(), response.getheader(SESSION_HEADER)
+            except (http.client.HTTPException, OSError):
+                # The server closed the idle connection; reconnect once.
+                connection.close()
+                self._local.connection = None
+                if attempt:
+                    raise
+        raise AssertionError("unreachable")
+
+
+class Replay:
+    """Replay sessions with a pool of worker threads and collect results."""
+
+    def __init__(self, client, concurrency: int, speed: float, deterministic: bool) -> None:
+        self.client = client
+        self.concurrency = max(1, concurrency)
+        self.speed = speed
+        self.deterministic = deterministic
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Counter = Counter()
+        self.errors = 0
+        self.matched = 0
+        self.mismatched: Counter = Counter()
+        self.lateness: List[float] = []
+        self._lock = threading.Lock()
+
+    def _request_body(self, entry: Dict[str, Any]) -> Any:
+        body = entry.get("body")
+        rng = entry.get("rng")
+        if (
+            self.deterministic
+            and entry["path"] == "/start_game"
+            and rng is not None
+            and isinstance(body, dict)
+            and "seed" not in body
+        ):
+            body = dict(body, seed=rng["seed"])
+        return body
+
+    def _replay_session(self, session: List[Dict[str, Any]], started: float) -> None:
+        token = None
+        for entry in session:
+            if self.speed > 0:
+                delay = started + entry["offset"] / self.speed - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                lateness = -delay if delay < 0 else 0.0
+            else:
+                lateness = 0.0
+            route = f"{entry['method']} {entry['path']}"
+            begin = time.perf_counter()
+            try:
+                status, data, new_token = self.client.send(
+                    entry["method"], entry["path"], entry.get("query", ""), self._request_body(entry), token
+                )
+            except (http.client.HTTPException, OSError):
+                with self._lock:
+                    self.errors += 1
+                    self.statuses["error"] += 1
+                continue
+            elapsed = time.perf_counter() - begin
+            token = new_token or token
+            rng = entry.get("rng")
+            check = self.deterministic and rng is not None and rng["seeded"] and "digest" in entry
+            with self._lock:
+                self.latencies[route].append(elapsed)
+                self.statuses[status] += 1
+                self.lateness.append(lateness)
+                if check:
+                    if digest(data) == entry["digest"]:
+                        self.matched += 1
+                    else:
+                        self.mismatched[route] += 1
+
+    def run(self, sessions: List[List[Dict[str, Any]]]) -> float:
+        """Replay ``sessions``; return the wall time in seconds."""
+        pending: "queue.Queue[Optional[List[Dict[str, Any]]]]" = queue.Queue()
+        for session in sessions:
+            pending.put(session)
+        started = time.perf_counter()
+
+        def work() -> None:
+            while True:
+                try:
+                    session = pending.get_nowait()
+                except queue.Empty:
+                    return
+                self._replay_session(session, started)
+
+        workers = [threading.Thread(target=work, daemon=True) for _ in range(self.concurrency)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        return time.perf_counter() - started
+
+    def report(self, wall: float) -> Dict[str, Any]:
+        requests = sum(self.statuses.values())
+        everything = [value for values in self.latencies.values() for value in values]
+        result: Dict[str, Any] = {
+            "requests": requests,
+            "wall_s": wall,
+            "throughput_rps": requests / wall if wall else 0.0,
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items(), key=str)},
+            "errors": self.errors,
+            "behind_schedule_s": max(self.lateness, default=0.0),
+            "routes": {route: percentiles(values) for route, values in sorted(self.latencies.items())},
+        }
+        if everything:
+            result["overall"] = percentiles(everything)
+        if self.deterministic:
+            result["matched"] = self.matched
+            result["mismatched"] = dict(self.mismatched)
+        return result
+
+
+def _print_report(sessions: int, result: Dict[str, Any]) -> None:
+    print(f"{'sessions':<28}{sessions:>10}")
+    print(f"{'requests':<28}{result['requests']:>10}")
+    print(f"{'wall time':<28}{result['wall_s']:10.2f} s")
+    print(f"{'throughput':<28}{result['throughput_rps']:10.1f} req/s")
+    print(f"{'max behind schedule':<28}{result['behind_schedule_s']:10.2f} s")
+    print(f"{'statuses':<28}{', '.join(f'{k}: {v}' for k, v in result['statuses'].items())}")
+    rows = dict(result["routes"])
+    if "overall" in result:
+        rows["all requests"] = result["overall"]
+    print(f"\n{'route':<28}{'n':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for route, stats in rows.items():
+        print(
+            f"{route:<28}{stats['n']:>8}{stats['p50_us'] / 1000:10.2f}"
+            f"{stats['p95_us'] / 1000:10.2f}{stats['p99_us'] / 1000:10.2f}"
+        )
+    if "matched" in result:
+        mismatched = sum(result["mismatched"].values())
+        print(f"\nseeded responses matching the recording: {result['matched']}/{result['matched'] + mismatched}")
+        for route, count in result["mismatched"].items():
+            print(f"  differ: {route} x{count}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("logs", nargs="+", help="gzip request logs written with DIRECTOR_RECORD")
+    parser.add_argument("--url", help="server to replay against; default: the app in this process")
+    parser.add_argument("--concurrency", type=int, default=4, help="sessions replayed at once")
+    parser.add_argument("--speed", type=float, default=1.0, help="speed-up factor; 0 = no pacing")
+    parser.add_argument("--sessions", type=int, default=0, help="replay only the first N sessions")
+    parser.add_argument("--deterministic", action="store_true", help="replay from recorded seeds and verify")
+    parser.add_argument("--output", help="write the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    sessions = load_sessions(args.logs, args.sessions)
+    client = HttpClient(args.url) if args.url else InProcessClient()
+    replay = Replay(client, args.concurrency, args.speed, args.deterministic)
+    result = replay.report(replay.run(sessions))
+    _print_report(len(sessions), result)
+    if args.output:
+        with open(args.output, "w") as out:
+            json.dump(dict(result, sessions=len(sessions)), out, indent=2)
+    return 1 if result["errors"] or result.get("mismatched") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,320 @@
+"""Benchmark suite for the game engine hot paths and Flask endpoints.
+
+Every case runs with pinned seeds and reports latency percentiles per call.
+Results are written as JSON; ``--baseline`` compares them against an
+earlier run and exits non-zero when any case's median slowed down by more
+than ``--threshold``.
+
+Run from ``backend/``::
+
+    python -m benchmarks.suite --output bench.json
+    python -m benchmarks.suite --baseline bench.json --threshold 0.25
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+from game_engine import GameRNG, Player, generate_offer_list, generate_offers
+from game_engine.cast_solver import solve_cast
+from game_engine.casting import generate_talent_pool
+from game_engine.production import simulate_production
+from game_engine.profile import add_completed_project, get_profile_summary
+from game_engine.release import evaluate_release
+from game_engine.talent_index import TalentIndex
+from game_engine.talent_pool import TalentPool
+
+SEED = 20240601
+
+# Parameter grids; ``--quick`` uses the first entries only.
+POOL_SIZES = (5, 1_000, 10_000)
+CAREER_LENGTHS = (10, 1_000, 10_000)
+BATCH_SIZES = (1_000, 100_000)
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """Summarise per-call ``samples`` (seconds) in microseconds."""
+    ordered = sorted(samples)
+    n = len(ordered)
+
+    def pick(q: float) -> float:
+        return ordered[min(n - 1, int(q * n))] * 1e6
+
+    return {
+        "n": n,
+        "mean_us": statistics.fmean(ordered) * 1e6,
+        "p50_us": pick(0.50),
+        "p95_us": pick(0.95),
+        "p99_us": pick(0.99),
+    }
+
+
+def measure(fn: Callable[[], Any], repeat: int, warmup: int = 3) -> Dict[str, float]:
+    """Call ``fn`` ``repeat`` times and return latency percentiles."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    clock = time.perf_counter
+    for _ in range(repeat):
+        start = clock()
+        fn()
+        samples.append(clock() - start)
+    return percentiles(samples)
+
+
+def _career(length: int, seed: int) -> Player:
+    rng = random.Random(seed)
+    player = Player("Benchmark")
+    for i in range(length):
+        medium = rng.choice(("film", "tv"))
+        record = {
+            "id": i,
+            "title": f"Project {i}",
+            "medium": medium,
+            "genre": "drama",
+            "critics_score": rng.randint(0, 100),
+            "fan_score": rng.randint(0, 100),
+            "awards": ["Best Picture"] if rng.random() < 0.1 else [],
+            "profit": rng.randint(-1_000_000, 5_000_000),
+        }
+        record["box_office" if medium == "film" else "viewership"] = rng.randint(0, 20_000_000)
+        add_completed_project(player, record)
+    return player
+
+
+def engine_cases(quick: bool, repeat: int) -> Dict[str, Dict[str, Any]]:
+    results: Dict[str, Dict[str, Any]] = {}
+    pool_sizes = POOL_SIZES[:1] if quick else POOL_SIZES
+    careers = CAREER_LENGTHS[:2] if quick else CAREER_LENGTHS
+    batches = BATCH_SIZES[:1] if quick else BATCH_SIZES
+
+    def record(name: str, params: Dict[str, Any], stats: Dict[str, float]) -> None:
+        results[name] = {"group": "engine", "params": params, **stats}
+
+    rng = GameRNG(SEED)
+    record("generate_offer_list", {}, measure(lambda: generate_offer_list(rng.offers), repeat))
+    record(
+        "generate_offers[1000]",
+        {"offers": 1000},
+        measure(lambda: generate_offers(1000, rng.offers), max(5, repeat // 10)),
+    )
+
+    for size in pool_sizes:
+        reps = max(5, repeat // max(1, size // 50))
+        record(
+            f"generate_talent_pool[{size}]",
+            {"pool_size": size},
+            measure(lambda: generate_talent_pool("lead actor", size, rng.talent), reps),
+        )
+        record(
+            f"TalentPool.generate[{size}]",
+            {"pool_size": size},
+            measure(lambda: TalentPool.generate("lead actor", size, rng.talent), reps),
+        )
+        pool = TalentPool.generate("lead actor", size, rng.talent)
+        record(
+            f"TalentPool.to_json[{size}]",
+            {"pool_size": size},
+            measure(pool.to_json, reps),
+        )
+        index = TalentIndex(pool)
+        record(
+            f"TalentIndex.search[{size}]",
+            {"pool_size": size},
+            measure(
+                lambda: index.search({"skill": (70, None), "cost": (None, 20_000)}, True, True),
+                repeat,
+            ),
+        )
+        pools = {
+            role: TalentPool.generate(role, size, rng.talent)
+            for role in ("lead actor", "supporting actor", "editor", "composer")
+        }
+        budget = sum(sorted(t.cost for t in p)[len(p) // 2] for p in pools.values())
+        record(
+            f"solve_cast[{size}]",
+            {"pool_size": size},
+            measure(lambda: solve_cast(pools, budget, "box_office"), max(5, reps // 4)),
+        )
+
+    project = {"medium": "film", "budget": 2_000_000, "risk_factor": 5}
+    cast = [SimpleNamespace(skill=60, star_power=60)] * 4
+    record(
+        "simulate_production",
+        {},
+        measure(lambda: simulate_production(project, cast, rng.production), repeat),
+    )
+    record(
+        "evaluate_release",
+        {},
+        measure(lambda: evaluate_release(project, 80, cast, rng.release), repeat),
+    )
+
+    try:
+        from game_engine.batch import evaluate_release_batch
+    except ImportError:  # pragma: no cover - numpy missing
+        evaluate_release_batch = None
+    if evaluate_release_batch is not None:
+        for size in batches:
+            args = ([80] * size, [60.0] * size, [2_000_000] * size, ["film"] * size)
+            stats = measure(lambda: evaluate_release_batch(*args, rng=SEED), max(3, repeat // 50))
+            record(f"evaluate_release_batch[{size}]", {"batch_size": size}, stats)
+
+    for length in careers:
+        player = _career(length, SEED)
+        record(
+            f"get_profile_summary[{length}]",
+            {"career_length": length},
+            measure(lambda: get_profile_summary(player, page_size=20), repeat),
+        )
+        extra = {"id": -1, "critics_score": 50, "fan_score": 50, "box_office": 1}
+        record(
+            f"add_completed_project[{length}]",
+            {"career_length": length},
+            measure(lambda: add_completed_project(player, extra), repeat),
+        )
+    return results
+
+
+def endpoint_cases(quick: bool, repeat: int) -> Dict[str, Dict[str, Any]]:
+    """Time every route through the Flask test client.
+
+    ``repeat // 10`` fresh games of three projects each are played; each
+    request's latency is recorded under its route. ``/get_profile`` is additionally timed against
+    careers of several lengths.
+    """
+    # Rate limits would reject the back-to-back requests timed here, and a
+    # talent market filling in the background would compete with them.
+    os.environ.setdefault("DIRECTOR_ADMISSION", "0")
+    os.environ.setdefault("DIRECTOR_MARKET_SIZE", "0")
+    from app import SESSION_HEADER, SESSIONS, app
+
+    samples: Dict[str, List[float]] = {}
+    clock = time.perf_counter
+
+    def timed(client, method: str, path: str, label: Optional[str] = None, **kwargs):
+        start = clock()
+        response = getattr(client, method)(path, **kwargs)
+        samples.setdefault(label or path.split("?")[0], []).append(clock() - start)
+        if response.status_code >= 400:
+            raise RuntimeError(f"{method.upper()} {path} -> {response.status_code}")
+        return response
+
+    loops = max(5, repeat // 10)
+    for loop in range(loops):
+        client = app.test_client()
+        timed(client, "post", "/start_game", json={"name": "Bench", "seed": SEED + loop})
+        for _ in range(3):
+            offers = timed(client, "get", "/get_projects").get_json()["offers"]
+            offer = offers[0]
+            timed(client, "post", "/select_project", json={"project_id": offer["id"]})
+            for role in offer["roles"]:
+                timed(client, "get", f"/get_talent_pool?role={role}")
+            timed(client, "get", "/search_talent?min_skill=30&available=true")
+            solved = timed(client, "post", "/solve_cast", json={"objective": "quality"}).get_json()
+            timed(client, "post", "/select_cast", json={"selections": solved["selections"]})
+            timed(client, "post", "/start_production")
+            timed(client, "post", "/release_project")
+            timed(client, "get", "/get_profile")
+        # The same project flow as a single round trip.
+        timed(client, "post", "/batch", json={"operations": [
+            {"op": "get_projects"},
+            {"op": "select_project", "offer_index": 0},
+            {"op": "get_talent_pools"},
+            {"op": "solve_cast", "select": True},
+            {"op": "start_production"},
+            {"op": "release_project"},
+        ]})
+
+    careers = CAREER_LENGTHS[:2] if quick else CAREER_LENGTHS
+    for length in careers:
+        client = app.test_client()
+        response = client.post("/start_game", json={"name": "Bench"})
+        session = SESSIONS.acquire(response.headers[SESSION_HEADER])
+        session.data["player"] = _career(length, SEED)
+        SESSIONS.commit(session)
+        SESSIONS.release(session)
+        for _ in range(repeat):
+            timed(client, "get", "/get_profile", label=f"/get_profile[{length}]")
+
+    return {
+        f"endpoint {route}": {"group": "endpoint", "params": {}, **percentiles(values)}
+        for route, values in samples.items()
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Return descriptions of cases whose median regressed beyond ``threshold``."""
+    regressions = []
+    base_results = baseline.get("results", {})
+    print(f"\n{'case':<40} {'base p50':>10} {'now p50':>10} {'change':>8}")
+    for name, now in current["results"].items():
+        base = base_results.get(name)
+        if not base:
+            continue
+        change = now["p50_us"] / base["p50_us"] - 1 if base["p50_us"] else 0.0
+        flag = "  REGRESSION" if change > threshold else ""
+        print(f"{name:<40} {base['p50_us']:>10.1f} {now['p50_us']:>10.1f} {change:>+8.0%}{flag}")
+        if flag:
+            regressions.append(f"{name} ({change:+.0%})")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", help="write results JSON to this path")
+    parser.add_argument("--baseline", help="compare against this results JSON")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed relative p50 slowdown before flagging")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--quick", action="store_true", help="smallest sizes only")
+    parser.add_argument("--only", choices=("engine", "endpoint"), help="run one group")
+    args = parser.parse_args(argv)
+
+    random.seed(SEED)
+    results: Dict[str, Dict[str, Any]] = {}
+    if args.only != "endpoint":
+        results.update(engine_cases(args.quick, args.repeat))
+    if args.only != "engine":
+        results.update(endpoint_cases(args.quick, args.repeat))
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "seed": SEED,
+            "repeat": args.repeat,
+            "quick": args.quick,
+        },
+        "results": results,
+    }
+
+    print(f"{'case':<40} {'p50 us':>10} {'p95 us':>10} {'p99 us':>10}")
+    for name, stats in results.items():
+        print(f"{name:<40} {stats['p50_us']:>10.1f} {stats['p95_us']:>10.1f} {stats['p99_us']:>10.1f}")
+
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(report, fh, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print("\nRegressions:", ", ".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,32 @@
-from .player import Player
-from .offers import generate_offer_list
-__all__ = ["Player", "generate_offer_list"]
+"""Simulation engine for the director game.
+
+Submodules are imported on first use: ``import game_engine`` loads nothing
+else (not even :mod:`typing`), and the names below resolve to their
+submodule when first accessed.
+"""
+from __future__ import annotations
+
+import importlib
+
+# Public name -> submodule defining it
+_EXPORTS = {
+    "Player": "player",
+    "generate_offer_list": "offers",
+    "generate_offers": "offers",
+    "GameRNG": "rng",
+}
+
+__all__ = ["Player", "generate_offer_list", "generate_offers", "GameRNG"]
+
+
+def __getattr__(name: str):
+    submodule = _EXPORTS.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{submodule}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,522 @@
+"""Yearly awards seasons in which releases compete for each award.
+
+:func:`release.evaluate_awards` judges a project against fixed thresholds
+on its own. An :class:`AwardsSeason` instead gathers every release of a
+simulated year from all players and ranks them against each other in every
+category of :data:`constants.AWARDS`: the best :data:`NOMINEES` releases of a
+category are nominated and the top one wins.
+
+Releases are added one at a time in O(1). Scoring is vectorised: releases
+added since the last look are scored together with NumPy, each category's
+best of the batch is found with ``argpartition`` and merged into a bounded
+min-heap holding that category's current nominees. Standings are therefore
+available at any point in the season, and resolving it costs only the
+releases not scored yet. NumPy is imported on first scoring.
+
+:class:`AwardsCalendar` runs consecutive seasons and keeps each player's
+results until they are written back to ``past_projects`` with
+:func:`profile.record_award_results`. :class:`SQLiteAwardsCalendar` offers
+the same interface with its state in a SQLite database, so that worker
+processes sharing the database enter their releases into one season.
+"""
+from __future__ import annotations
+
+import heapq
+import json
+import random
+import sqlite3
+import threading
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+from .constants import AWARDS
+
+CATEGORIES = tuple(AWARDS)
+NOMINEES = 5
+DEFAULT_SEASON_RELEASES = 100
+
+# Categories closed to some media; the others are open to every release.
+ELIGIBLE_MEDIA = {
+    "Best Picture": ("film", "tv"),
+    "Best Director": ("film", "tv"),
+    "Best Screenplay": ("film", "tv"),
+    "Best Actor": ("film", "tv"),
+    "Best Actress": ("film", "tv"),
+}
+VISUAL_EFFECTS_GENRES = frozenset({"action", "science fiction", "fantasy"})
+
+# Standard deviation of the jury's per-category whim.
+JURY_NOISE = 4.0
+
+_MEDIA = ("film", "tv", "commercial")
+_MEDIUM_CODES = {medium: code for code, medium in enumerate(_MEDIA)}
+
+
+def category_scores(columns: Dict[str, Any], noise: Any) -> Any:
+    """Score releases in every category.
+
+    ``columns`` maps feature names to equal-length NumPy arrays and
+    ``noise`` is an ``(n, len(CATEGORIES))`` array added to the scores.
+    Returns an ``(n, len(CATEGORIES))`` float array in which ineligible
+    releases score ``-inf``.
+    """
+    import numpy as np
+
+    critics = columns["critics"]
+    fans = columns["fans"]
+    roi = np.maximum(columns["revenue"], 0.0) / np.maximum(columns["budget"], 1.0)
+    base = {
+        "Best Picture": 0.7 * critics + 0.3 * fans,
+        "Best Director": 0.8 * critics + 2.0 * columns["risk"],
+        "Best Screenplay": 0.8 * critics + 12.0 * columns["written"],
+        "Best Actor": 0.5 * critics + 0.5 * fans,
+        "Best Actress": 0.5 * critics + 0.5 * fans,
+        "Audience Choice": 0.8 * fans + 10.0 * np.log1p(roi),
+        "Best Visual Effects": (
+            0.4 * critics + 20.0 * columns["effects"] + columns["budget"] / 250_000
+        ),
+    }
+    scores = np.empty((critics.shape[0], len(CATEGORIES)))
+    medium = columns["medium"]
+    for i, category in enumerate(CATEGORIES):
+        score = base.get(category, 0.6 * critics + 0.4 * fans) + noise[:, i]
+        media = ELIGIBLE_MEDIA.get(category)
+        if media is not None:
+            eligible = np.isin(medium, [_MEDIUM_CODES[m] for m in media])
+            score = np.where(eligible, score, -np.inf)
+        scores[:, i] = score
+    return scores
+
+
+class AwardsSeason:
+    """One year of releases competing for :data:`CATEGORIES`.
+
+    Parameters
+    ----------
+    year:
+        Season number reported with the results.
+    nominees:
+        Releases nominated per category.
+    seed:
+        Seed of the jury noise; random when omitted.
+    """
+
+    def __init__(self, year: int = 1, nominees: int = NOMINEES, seed: Optional[int] = None) -> None:
+        self.year = year
+        self.nominees = nominees
+        self._seed = seed
+        self._gen = None
+        # Per release: (player id, player name, project index, project id,
+        # title, medium, genre)
+        self.entries: List[Tuple[str, str, int, Any, Any, Any, Any]] = []
+        self._critics = array("f")
+        self._fans = array("f")
+        self._revenue = array("d")
+        self._budget = array("d")
+        self._risk = array("f")
+        self._written = array("b")
+        self._effects = array("b")
+        self._medium = array("b")
+        # Category scores of every release scored so far, row-major.
+        self.scores = array("d")
+        # Per category: min-heap of (score, -entry) for the current nominees.
+        self._heaps: List[List[Tuple[float, int]]] = [[] for _ in CATEGORIES]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, player_id: str, name: str, index: int, project: Dict[str, Any]) -> None:
+        """Enter the released ``project``, ``past_projects[index]`` of the player."""
+        medium = project.get("medium")
+        genre = project.get("genre")
+        self.entries.append(
+            (player_id, name, index, project.get("id"), project.get("title"), medium, genre)
+        )
+        self._critics.append(project.get("critics_score", 0) or 0)
+        self._fans.append(project.get("fan_score", 0) or 0)
+        self._revenue.append(project.get("box_office", project.get("viewership", 0)) or 0)
+        self._budget.append(project.get("budget", 0) or 0)
+        self._risk.append(project.get("risk_factor", 0) or 0)
+        self._written.append(1 if project.get("player_written") else 0)
+        self._effects.append(1 if genre in VISUAL_EFFECTS_GENRES else 0)
+        self._medium.append(_MEDIUM_CODES.get(medium, _MEDIUM_CODES["commercial"]))
+
+    def _score_pending(self) -> None:
+        """Score releases added since the last call and update the nominees."""
+        start = len(self.scores) // len(CATEGORIES)
+        end = len(self.entries)
+        if start == end:
+            return
+        import numpy as np
+
+        if self._gen is None:
+            self._gen = np.random.default_rng(self._seed)
+
+        def column(values: array, dtype: Any = np.float64) -> np.ndarray:
+            return np.frombuffer(values, dtype=values.typecode)[start:end].astype(dtype)
+
+        columns = {
+            "critics": column(self._critics),
+            "fans": column(self._fans),
+            "revenue": column(self._revenue),
+            "budget": column(self._budget),
+            "risk": column(self._risk),
+            "written": column(self._written),
+            "effects": column(self._effects),
+            "medium": column(self._medium, np.int8),
+        }
+        noise = self._gen.normal(0.0, JURY_NOISE, size=(end - start, len(CATEGORIES)))
+        scores = category_scores(columns, noise)
+        self.scores.frombytes(scores.tobytes())
+
+        for i, heap in enumerate(self._heaps):
+            column_scores = scores[:, i]
+            candidates = np.flatnonzero(np.isfinite(column_scores))
+            if candidates.shape[0] > self.nominees:
+                best = np.argpartition(-column_scores[candidates], self.nominees - 1)
+                candidates = candidates[best[:self.nominees]]
+            for row in candidates.tolist():
+                item = (float(column_scores[row]), -(start + row))
+                if len(heap) < self.nominees:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+
+    def standings(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Return each category's current nominees, best first."""
+        self._score_pending()
+        standings = {}
+        for category, heap in zip(CATEGORIES, self._heaps):
+            ranked = sorted(heap, reverse=True)
+            standings[category] = [
+                {
+                    "player_id": self.entries[-entry][0],
+                    "name": self.entries[-entry][1],
+                    "title": self.entries[-entry][4],
+                    "score": round(score, 2),
+                }
+                for score, entry in ranked
+            ]
+        return standings
+
+    def resolve(self) -> Dict[str, Dict[int, Dict[str, Any]]]:
+        """Close the season and return results per player id and project index.
+
+        Each result holds ``year``, the categories the release was
+        ``nominated`` in and those it ``won``, plus the release's ``id``,
+        ``title``, ``medium`` and ``genre`` so callers can check that the
+        record still matches.
+        """
+        self._score_pending()
+        results: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        for category, heap in zip(CATEGORIES, self._heaps):
+            winner = max(heap) if heap else None
+            for item in heap:
+                player_id, _, index, project_id, title, medium, genre = self.entries[-item[1]]
+                result = results.setdefault(player_id, {}).get(index)
+                if result is None:
+                    result = results[player_id][index] = {
+                        "year": self.year,
+                        "id": project_id,
+                        "title": title,
+                        "medium": medium,
+                        "genre": genre,
+                        "nominations": [],
+                        "wins": [],
+                    }
+                result["nominations"].append(category)
+                if item == winner:
+                    result["wins"].append(category)
+        return results
+
+
+class AwardsCalendar:
+    """Consecutive awards seasons of ``releases_per_season`` releases each.
+
+    Results wait in a mailbox per player id. The request that holds that
+    player's session reads them with :meth:`results` and removes them with
+    :meth:`acknowledge` once its session is stored, so no other session's
+    state is touched when a season closes and a request whose session could
+    not be stored loses nothing.
+    """
+
+    def __init__(
+        self,
+        releases_per_season: int = DEFAULT_SEASON_RELEASES,
+        nominees: int = NOMINEES,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.releases_per_season = max(1, releases_per_season)
+        self.nominees = nominees
+        self._seed = seed
+        self.lock = threading.Lock()
+        self.season = AwardsSeason(1, nominees, self._season_seed(1))
+        # Winners of every closed season: {"year", "winners": {category: entry}}
+        self.history: List[Dict[str, Any]] = []
+        self._undelivered: Dict[str, Dict[int, Dict[str, Any]]] = {}
+
+    def _season_seed(self, year: int) -> Optional[int]:
+        return None if self._seed is None else self._seed * 1_000_003 + year
+
+    def record_release(
+        self, player_id: str, name: str, index: int, project: Dict[str, Any]
+    ) -> Optional[Dict[str, Dict[int, Dict[str, Any]]]]:
+        """Enter a release; return the season's results if this closed it."""
+        with self.lock:
+            self.season.add(player_id, name, index, project)
+            if len(self.season) < self.releases_per_season:
+                return None
+            return self._close()
+
+    def close_season(self) -> Dict[str, Dict[int, Dict[str, Any]]]:
+        """Resolve the current season now, however many releases it has."""
+        with self.lock:
+            return self._close()
+
+    def _close(self) -> Dict[str, Dict[int, Dict[str, Any]]]:
+        season = self.season
+        results = season.resolve()
+        winners = {}
+        for category, entries in season.standings().items():
+            if entries:
+                winners[category] = entries[0]
+        self.history.append({"year": season.year, "releases": len(season), "winners": winners})
+        for player_id, by_index in results.items():
+            self._undelivered.setdefault(player_id, {}).update(by_index)
+        year = season.year + 1
+        self.season = AwardsSeason(year, self.nominees, self._season_seed(year))
+        return results
+
+    def results(self, player_id: str) -> Dict[int, Dict[str, Any]]:
+        """Return the undelivered results of the player.
+
+        They stay in the mailbox until :meth:`acknowledge` confirms that the
+        player's session stored them.
+        """
+        with self.lock:
+            return dict(self._undelivered.get(player_id, {}))
+
+    def acknowledge(self, player_id: str, results: Dict[int, Dict[str, Any]]) -> None:
+        """Remove ``results`` (from :meth:`results`) from the player's mailbox."""
+        with self.lock:
+            mailbox = self._undelivered.get(player_id)
+            if mailbox is None:
+                return
+            for index in results:
+                mailbox.pop(index, None)
+            if not mailbox:
+                del self._undelivered[player_id]
+
+    def has_results(self, player_id: str) -> bool:
+        return player_id in self._undelivered
+
+    def standings(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "year": self.season.year,
+                "releases": len(self.season),
+                "releases_per_season": self.releases_per_season,
+                "standings": self.season.standings(),
+                "last_season": self.history[-1] if self.history else None,
+            }
+
+
+class SQLiteAwardsCalendar:
+    """:class:`AwardsCalendar` shared between worker processes through SQLite.
+
+    The current season's entries, the mailbox of undelivered results, the
+    winners of past seasons and the current year are stored in ``path``.
+    The worker whose release completes a season resolves it in the same
+    ``BEGIN IMMEDIATE`` transaction as the insert, so each season is closed
+    exactly once whichever worker handles its last release. Each worker
+    keeps its own copy of the current season for :meth:`standings` and
+    only adds and scores the entries stored since it last looked. Unseeded calendars store
+    a random seed with the year, so every worker draws the same jury noise.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        releases_per_season: int = DEFAULT_SEASON_RELEASES,
+        nominees: int = NOMINEES,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.path = path
+        self.releases_per_season = max(1, releases_per_season)
+        self.nominees = nominees
+        self._local = threading.local()
+        # Current season as of entry ``_cached_seq``, for ``standings``
+        self._cache_lock = threading.Lock()
+        self._cached: Optional[AwardsSeason] = None
+        self._cached_seq = 0
+        conn = self._connection()
+        conn.executescript(
+            "CREATE TABLE IF NOT EXISTS awards_entries ("
+            " year INTEGER NOT NULL,"
+            " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " player_id TEXT NOT NULL,"
+            " name TEXT NOT NULL,"
+            " idx INTEGER NOT NULL,"
+            " project TEXT NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS awards_entries_year ON awards_entries (year);"
+            "CREATE TABLE IF NOT EXISTS awards_mailbox ("
+            " player_id TEXT NOT NULL,"
+            " idx INTEGER NOT NULL,"
+            " result TEXT NOT NULL,"
+            " PRIMARY KEY (player_id, idx));"
+            "CREATE TABLE IF NOT EXISTS awards_history ("
+            " year INTEGER PRIMARY KEY,"
+            " record TEXT NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS awards_meta ("
+            " key TEXT PRIMARY KEY,"
+            " value INTEGER NOT NULL);"
+        )
+        conn.execute("INSERT OR IGNORE INTO awards_meta (key, value) VALUES ('year', 1)")
+        conn.execute(
+            "INSERT OR IGNORE INTO awards_meta (key, value) VALUES ('seed', ?)",
+            (random.getrandbits(48) if seed is None else seed,),
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _meta(self, conn: sqlite3.Connection, key: str) -> int:
+        return conn.execute("SELECT value FROM awards_meta WHERE key = ?", (key,)).fetchone()[0]
+
+    def _new_season(self, conn: sqlite3.Connection, year: int) -> AwardsSeason:
+        return AwardsSeason(year, self.nominees, self._meta(conn, "seed") * 1_000_003 + year)
+
+    def _season(self, conn: sqlite3.Connection, year: int) -> AwardsSeason:
+        season = self._new_season(conn, year)
+        self._catch_up(conn, season, 0)
+        return season
+
+    @staticmethod
+    def _catch_up(conn: sqlite3.Connection, season: AwardsSeason, after: int) -> int:
+        """Add the season's entries stored after ``seq`` ``after``; return the last seq.
+
+        Writers insert under ``BEGIN IMMEDIATE``, so entries become visible
+        in ``seq`` order and none is skipped.
+        """
+        rows = conn.execute(
+            "SELECT seq, player_id, name, idx, project FROM awards_entries"
+            " WHERE year = ? AND seq > ? ORDER BY seq",
+            (season.year, after),
+        )
+        for after, player_id, name, index, project in rows:
+            season.add(player_id, name, index, json.loads(project))
+        return after
+
+    @property
+    def season(self) -> AwardsSeason:
+        """The current season, rebuilt from its stored entries."""
+        conn = self._connection()
+        return self._season(conn, self._meta(conn, "year"))
+
+    def record_release(
+        self, player_id: str, name: str, index: int, project: Dict[str, Any]
+    ) -> Optional[Dict[str, Dict[int, Dict[str, Any]]]]:
+        """Enter a release; return the season's results if this closed it."""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            year = self._meta(conn, "year")
+            conn.execute(
+                "INSERT INTO awards_entries (year, player_id, name, idx, project)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (year, player_id, name, index, json.dumps(project, default=str)),
+            )
+            releases = conn.execute(
+                "SELECT COUNT(*) FROM awards_entries WHERE year = ?", (year,)
+            ).fetchone()[0]
+            results = self._close(conn, year) if releases >= self.releases_per_season else None
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return results
+
+    def close_season(self) -> Dict[str, Dict[int, Dict[str, Any]]]:
+        """Resolve the current season now, however many releases it has."""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            results = self._close(conn, self._meta(conn, "year"))
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        return results
+
+    def _close(self, conn: sqlite3.Connection, year: int) -> Dict[str, Dict[int, Dict[str, Any]]]:
+        season = self._season(conn, year)
+        results = season.resolve()
+        winners = {}
+        for category, entries in season.standings().items():
+            if entries:
+                winners[category] = entries[0]
+        record = {"year": year, "releases": len(season), "winners": winners}
+        conn.execute(
+            "INSERT INTO awards_history (year, record) VALUES (?, ?)", (year, json.dumps(record))
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO awards_mailbox (player_id, idx, result) VALUES (?, ?, ?)",
+            [
+                (player_id, index, json.dumps(result))
+                for player_id, by_index in results.items()
+                for index, result in by_index.items()
+            ],
+        )
+        conn.execute("DELETE FROM awards_entries WHERE year = ?", (year,))
+        conn.execute("UPDATE awards_meta SET value = ? WHERE key = 'year'", (year + 1,))
+        return results
+
+    def results(self, player_id: str) -> Dict[int, Dict[str, Any]]:
+        """Return the undelivered results of the player (see :meth:`AwardsCalendar.results`)."""
+        rows = self._connection().execute(
+            "SELECT idx, result FROM awards_mailbox WHERE player_id = ?", (player_id,)
+        )
+        return {index: json.loads(result) for index, result in rows}
+
+    def acknowledge(self, player_id: str, results: Dict[int, Dict[str, Any]]) -> None:
+        """Remove ``results`` (from :meth:`results`) from the player's mailbox."""
+        self._connection().executemany(
+            "DELETE FROM awards_mailbox WHERE player_id = ? AND idx = ?",
+            [(player_id, index) for index in results],
+        )
+
+    def has_results(self, player_id: str) -> bool:
+        return self._connection().execute(
+            "SELECT 1 FROM awards_mailbox WHERE player_id = ? LIMIT 1", (player_id,)
+        ).fetchone() is not None
+
+    def standings(self) -> Dict[str, Any]:
+        conn = self._connection()
+        with self._cache_lock:
+            # One read transaction, so a season closed meanwhile is seen whole.
+            conn.execute("BEGIN")
+            try:
+                year = self._meta(conn, "year")
+                season = self._cached
+                if season is None or season.year != year:
+                    season = self._cached = self._new_season(conn, year)
+                    self._cached_seq = 0
+                self._cached_seq = self._catch_up(conn, season, self._cached_seq)
+                last = conn.execute(
+                    "SELECT record FROM awards_history ORDER BY year DESC LIMIT 1"
+                ).fetchone()
+            finally:
+                conn.execute("COMMIT")
+            return {
+                "year": season.year,
+                "releases": len(season),
+                "releases_per_season": self.releases_per_season,
+                "standings": season.standings(),
+                "last_season": json.loads(last[0]) if last else None,
+            }
@@ -0,0 +1,266 @@
+"""Vectorised counterparts of the per-project engine functions.
+
+The scalar functions in :mod:`release` draw one random number at a time,
+which is fine for a single player but far too slow for balancing runs or
+"expected outcome" previews that need millions of samples. The helpers here
+reproduce the same distributions with NumPy, evaluating a whole batch of
+releases in one pass.
+
+Awards and nominations are returned as ``uint8`` bit masks: bit ``i`` is set
+when the release won (or was nominated for) ``AWARD_COLUMNS[i]``, which
+follows the order of :data:`constants.AWARDS`. :func:`unpack_awards` expands a
+mask array into a boolean matrix.
+"""
+from __future__ import annotations
+
+from itertools import combinations
+from typing import Any, Dict, Optional, Sequence, Union
+
+import numpy as np
+
+from .constants import AWARDS
+
+AWARD_COLUMNS = tuple(AWARDS)
+_AWARD_INDEX = {name: i for i, name in enumerate(AWARD_COLUMNS)}
+
+SeedLike = Union[None, int, np.random.Generator]
+
+# Rows evaluated per inner pass; small enough for the temporaries to stay in
+# the CPU cache.
+CHUNK_SIZE = 65_536
+
+
+def _build_award_tables():
+    """Precompute award masks and nomination subsets per award pattern.
+
+    Bit 0 of a pattern is Best Picture, bit 1 Best Screenplay, bit 2 Best
+    Director and bit 3 the paired acting awards. For each pattern and each
+    nomination count ``k`` in 1..3 the table lists every ``k``-subset (or the
+    whole pool, if smaller) of the awards that pattern did not win.
+    """
+    groups = (
+        ("Best Picture",),
+        ("Best Screenplay",),
+        ("Best Director",),
+        ("Best Actor", "Best Actress"),
+    )
+    width = len(AWARD_COLUMNS)
+    patterns = 1 << len(groups)
+    awards = np.zeros(patterns, dtype=np.uint8)
+    max_subsets = len(list(combinations(range(width), 3)))
+    subsets = np.zeros((patterns, 3, max_subsets), dtype=np.uint8)
+    counts = np.zeros((patterns, 3), dtype=np.intp)
+    for pattern in range(patterns):
+        won = set()
+        for bit, names in enumerate(groups):
+            if pattern >> bit & 1:
+                won.update(_AWARD_INDEX[name] for name in names)
+        awards[pattern] = sum(1 << i for i in won)
+        pool = [i for i in range(width) if i not in won]
+        for k in range(3):
+            chosen = list(combinations(pool, min(len(pool), k + 1)))
+            counts[pattern, k] = len(chosen)
+            for row, subset in enumerate(chosen):
+                subsets[pattern, k, row] = sum(1 << i for i in subset)
+    return awards, subsets, counts
+
+
+_PATTERN_AWARDS, _SUBSETS, _SUBSET_COUNTS = _build_award_tables()
+
+
+def _generator(seed: SeedLike) -> np.random.Generator:
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed)
+
+
+def _column(values: Any, n: int, default: Any, dtype: Any) -> np.ndarray:
+    """Broadcast an optional per-release input to a length ``n`` array."""
+    if values is None:
+        return np.full(n, default, dtype=dtype)
+    return np.broadcast_to(np.asarray(values, dtype=dtype), (n,))
+
+
+def evaluate_release_batch(
+    quality_scores: Sequence[float],
+    star_power: Sequence[float],
+    budgets: Sequence[float],
+    mediums: Sequence[str],
+    *,
+    episodes: Optional[Sequence[int]] = None,
+    risk_factors: Optional[Sequence[int]] = None,
+    player_written: Optional[Sequence[bool]] = None,
+    rng: SeedLike = None,
+) -> Dict[str, np.ndarray]:
+    """Evaluate many releases at once.
+
+    Parameters
+    ----------
+    quality_scores:
+        Final quality score of each production.
+    star_power:
+        Average cast star power of each release. Use ``50`` for releases
+        without a cast, matching :func:`release.evaluate_release`.
+    budgets:
+        Project budgets used for the profit calculation.
+    mediums:
+        Project medium per release; ``"tv"`` releases report viewership
+        instead of box office.
+    episodes, risk_factors, player_written:
+        Optional per-release project attributes. Defaults mirror the
+        ``project.get`` fallbacks of the scalar path.
+    rng:
+        Seed or ``numpy.random.Generator`` used for every draw.
+
+    Returns
+    -------
+    dict
+        Arrays keyed ``critics_score``, ``fan_score``, ``box_office``,
+        ``viewership``, ``is_tv``, ``profit``, ``awards`` and
+        ``award_nominations``. ``box_office`` is zero for TV releases and
+        ``viewership`` is zero for everything else. The award arrays are
+        bit masks over :data:`AWARD_COLUMNS`.
+    """
+
+    gen = _generator(rng)
+    quality = np.asarray(quality_scores, dtype=np.int32)
+    n = quality.shape[0]
+    columns = (
+        quality,
+        _column(star_power, n, 50.0, np.float64),
+        _column(budgets, n, 0, np.int64),
+        np.asarray(mediums) == "tv",
+        _column(episodes, n, 1, np.int64),
+        _column(risk_factors, n, 0, np.int64),
+        _column(player_written, n, False, bool),
+    )
+
+    out = {
+        "critics_score": np.empty(n, dtype=np.int32),
+        "fan_score": np.empty(n, dtype=np.int32),
+        "box_office": np.empty(n, dtype=np.int64),
+        "viewership": np.empty(n, dtype=np.int64),
+        "is_tv": columns[3],
+        "profit": np.empty(n, dtype=np.int64),
+        "awards": np.empty(n, dtype=np.uint8),
+        "award_nominations": np.empty(n, dtype=np.uint8),
+    }
+    # Work through cache-sized chunks; the temporaries of one chunk stay hot
+    # instead of streaming several full-length arrays through memory.
+    for lo in range(0, n, CHUNK_SIZE):
+        hi = min(n, lo + CHUNK_SIZE)
+        views = {key: values[lo:hi] for key, values in out.items()}
+        _evaluate_chunk(gen, views, *(col[lo:hi] for col in columns))
+    return out
+
+
+def _evaluate_chunk(gen, out, quality, stars, budget, is_tv, episodes, risk, written):
+    """Evaluate one chunk, writing results into the ``out`` array views."""
+    n = quality.shape[0]
+
+    # One draw covers both independent swings: critics' -5..5 and fans'
+    # -15..15 are the two digits of a mixed-radix number below 11 * 31.
+    swings = gen.integers(0, 11 * 31, size=n, dtype=np.int32)
+    fan_swing, critics_swing = np.divmod(swings, 11)
+    critics = out["critics_score"]
+    np.add(quality, critics_swing, out=critics)
+    critics -= 5
+    np.clip(critics, 0, 100, out=critics)
+    fans = out["fan_score"]
+    np.add(critics, fan_swing, out=fans)
+    fans -= 15
+    np.clip(fans, 0, 100, out=fans)
+
+    # performance_factor = (fan / 100) * (star_power / 50), scaled by a
+    # uniform 0.8-1.2 swing and the medium's baseline audience.
+    gross = gen.uniform(0.8, 1.2, size=n)
+    gross *= fans
+    gross *= stars
+    gross *= np.where(is_tv, episodes * (100_000 / 5000), 10_000_000 / 5000)
+    # ``int()`` truncates toward zero; every gross value is non-negative.
+    gross = gross.astype(np.int64)
+
+    # Every release wins one of sixteen award patterns, coded by the four
+    # independent conditions of ``release.evaluate_awards``.
+    acclaimed = critics >= 85
+    acting = (fans > 80) & (gen.random(n) < 0.3)
+    pattern = acclaimed.view(np.uint8) | (
+        ((acclaimed & written).view(np.uint8) << 1)
+        | ((acclaimed & (risk > 7)).view(np.uint8) << 2)
+        | (acting.view(np.uint8) << 3)
+    )
+
+    # Nominations: a uniformly random subset of the awards not already won,
+    # of size min(pool, randint(1, 3)), looked up from the flattened table of
+    # candidate subsets for the release's award pattern. The integer part of
+    # a uniform draw on [0, 3) picks the count; its fractional part is an
+    # independent uniform picking the subset.
+    choice = gen.random(n)
+    choice *= 3
+    wanted = choice.astype(np.intp)
+    choice -= wanted
+    row = pattern * 3 + wanted
+    choice *= _SUBSET_COUNTS.ravel()[row]
+    row *= _SUBSETS.shape[2]
+    row += choice.astype(np.intp)
+    np.take(_SUBSETS.ravel(), row, out=out["award_nominations"])
+    out["award_nominations"] *= critics > 75
+
+    np.take(_PATTERN_AWARDS, pattern, out=out["awards"])
+    np.subtract(gross, budget, out=out["profit"])
+    np.multiply(gross, ~is_tv, out=out["box_office"])
+    np.multiply(gross, is_tv, out=out["viewership"])
+
+
+def unpack_awards(masks: np.ndarray) -> np.ndarray:
+    """Expand award bit masks into a boolean ``(n, len(AWARD_COLUMNS))`` matrix."""
+    masks = np.asarray(masks, dtype=np.uint8)
+    bits = np.unpackbits(masks[:, None], axis=1, bitorder="little")
+    return bits[:, : len(AWARD_COLUMNS)].astype(bool)
+
+
+def award_names(mask: int) -> list:
+    """Return the award names encoded in a single bit mask."""
+    return [name for i, name in enumerate(AWARD_COLUMNS) if int(mask) >> i & 1]
+
+
+def simulate_production_batch(
+    n: int,
+    base_quality: int = 50,
+    cast_skill: int = 0,
+    decisions: Optional[Dict[str, Any]] = None,
+    rng: SeedLike = None,
+) -> Dict[str, np.ndarray]:
+    """Simulate ``n`` productions of one project with one cast.
+
+    Mirrors :func:`production.simulate_production`: one to three issues,
+    each costing 5-15 quality and 0-2 weeks, delays capped at 0-5 weeks, the
+    cast's summed skill added and the player ``decisions`` applied. Decisions
+    do not change the draws, so runs with the same ``rng`` seed give common
+    random numbers across decision options.
+
+    Returns
+    -------
+    dict
+        ``final_quality_score`` (``int32``) and ``delays`` (``int8``) arrays.
+    """
+    from .production import apply_player_decisions
+
+    gen = _generator(rng)
+    issues = gen.integers(1, 4, size=n, dtype=np.int8)
+    # Each issue slot's cost and delay are the two digits of one draw below
+    # 11 * 3; slots beyond the release's issue count are masked out.
+    hits = gen.integers(0, 11 * 3, size=(n, 3), dtype=np.int16)
+    delay, loss = np.divmod(hits, 11)
+    loss += 5
+    active = np.arange(3, dtype=np.int8) < issues[:, None]
+    loss *= active
+    delay *= active
+
+    modifiers = apply_player_decisions(decisions)
+    quality = np.full(n, base_quality + cast_skill + modifiers["quality"], dtype=np.int32)
+    quality -= loss.sum(axis=1, dtype=np.int32)
+    delays = np.clip(delay.sum(axis=1, dtype=np.int8), 0, 5)
+    delays += modifiers["delay"]
+    np.clip(delays, 0, 5, out=delays)
+    return {"final_quality_score": quality, "delays": delays}
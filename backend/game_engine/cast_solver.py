@@ -0,0 +1,288 @@
+"""Choose the best affordable cast for an offer.
+
+The score of a cast mirrors :func:`~game_engine.casting.evaluate_casting_choices`:
+the average skill (``"quality"``) or star power (``"box_office"``) of the
+cast minus its team synergy penalty. Both terms are sums over the chosen
+talents, so each candidate has a fixed value ``metric / roles - penalty``
+and the problem is a multiple-choice knapsack: pick exactly one talent per
+role, keep the total cost within the budget and maximise the summed value.
+
+:func:`solve_cast` runs a depth-first branch-and-bound over the roles.
+Dominated candidates (another talent in the role is at least as good and no
+more expensive) are dropped up front, and each branch is bounded by the LP
+relaxation of the remaining roles, computed from the upper convex hull of
+every role's cost/value frontier. The search honours a time budget and
+reports whether it proved optimality before running out.
+"""
+from __future__ import annotations
+
+import time
+from bisect import bisect_right
+from itertools import product
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .casting import evaluate_casting_choices
+from .talent_pool import TalentPool
+
+OBJECTIVES = ("quality", "box_office")
+_METRIC = {"quality": "skill", "box_office": "star_power"}
+
+# Tolerance for floating point comparisons of cast scores.
+_EPS = 1e-9
+
+
+def synergy_penalty(talent: Any) -> float:
+    """Return one talent's contribution to the team synergy penalty."""
+    penalty = 0.0
+    if not talent.availability:
+        penalty += 5.0
+    if not talent.wants_to_work_with_player:
+        penalty += 5.0
+    if talent.working_relationship < 0:
+        penalty += abs(talent.working_relationship) * 10
+    return penalty
+
+
+def _candidates(pool: Sequence[Any], metric: str, roles: int) -> List[Tuple[int, float, int]]:
+    """Return ``(cost, value, position)`` for every talent in ``pool``.
+
+    Columnar pools are read straight from their arrays instead of through
+    one view object per talent.
+    """
+    if isinstance(pool, TalentPool):
+        metric_column = pool.skill if metric == "skill" else pool.star_power
+        return [
+            (
+                cost,
+                score / roles
+                - (0.0 if available else 5.0)
+                - (0.0 if willing else 5.0)
+                - (-relationship * 10 if relationship < 0 else 0.0),
+                i,
+            )
+            for i, (cost, score, available, willing, relationship) in enumerate(
+                zip(
+                    pool.cost,
+                    metric_column,
+                    pool.availability,
+                    pool.willingness,
+                    pool.working_relationship,
+                )
+            )
+        ]
+    return [
+        (t.cost, getattr(t, metric) / roles - synergy_penalty(t), i)
+        for i, t in enumerate(pool)
+    ]
+
+
+def _frontier(items: List[Tuple[int, float, int]]) -> List[Tuple[int, float, int]]:
+    """Return the non-dominated ``(cost, value, position)`` items, cheapest first."""
+    items.sort(key=lambda item: (item[0], -item[1]))
+    frontier: List[Tuple[int, float, int]] = []
+    for item in items:
+        if not frontier or item[1] > frontier[-1][1] + _EPS:
+            frontier.append(item)
+    return frontier
+
+
+def _hull_segments(frontier: List[Tuple[int, float, int]]) -> List[Tuple[float, int, float]]:
+    """Return ``(slope, d_cost, d_value)`` steps along the upper convex hull."""
+    hull: List[Tuple[int, float]] = []
+    for cost, value, _ in frontier:
+        while len(hull) >= 2:
+            (c1, v1), (c2, v2) = hull[-2], hull[-1]
+            # Drop the middle point when it lies on or below the chord.
+            if (v2 - v1) * (cost - c1) <= (value - v1) * (c2 - c1):
+                hull.pop()
+            else:
+                break
+        hull.append((cost, value))
+    return [
+        ((v2 - v1) / (c2 - c1), c2 - c1, v2 - v1)
+        for (c1, v1), (c2, v2) in zip(hull, hull[1:])
+    ]
+
+
+class _SuffixBound:
+    """LP-relaxation upper bound for the roles ``k..`` given a budget."""
+
+    def __init__(self, frontiers: Sequence[List[Tuple[int, float, int]]], start: int) -> None:
+        rest = frontiers[start:]
+        self.base_cost = sum(f[0][0] for f in rest)
+        self.base_value = sum(f[0][1] for f in rest)
+        self.max_value = sum(f[-1][1] for f in rest)
+        segments = sorted(
+            (seg for f in rest for seg in _hull_segments(f)), key=lambda s: -s[0]
+        )
+        self.slopes = [s[0] for s in segments]
+        self.cum_cost: List[int] = []
+        self.cum_value: List[float] = []
+        total_cost, total_value = 0, 0.0
+        for _, d_cost, d_value in segments:
+            total_cost += d_cost
+            total_value += d_value
+            self.cum_cost.append(total_cost)
+            self.cum_value.append(total_value)
+
+    def __call__(self, budget: float) -> float:
+        spare = budget - self.base_cost
+        if spare < 0:
+            return float("-inf")
+        j = bisect_right(self.cum_cost, spare)
+        value = self.base_value
+        if j:
+            value += self.cum_value[j - 1]
+            spare -= self.cum_cost[j - 1]
+        if j < len(self.slopes):
+            value += spare * self.slopes[j]
+        return value
+
+
+def solve_cast(
+    pools: Mapping[str, Sequence[Any]],
+    budget: float,
+    objective: str = "quality",
+    time_budget: float = 1.0,
+) -> Dict[str, Any]:
+    """Return the highest scoring cast with one talent per role within ``budget``.
+
+    Parameters
+    ----------
+    pools:
+        Candidate talents keyed by role, e.g. the talent pools generated for
+        each entry of an offer's ``roles``.
+    budget:
+        Maximum combined ``cost`` of the cast.
+    objective:
+        ``"quality"`` to maximise expected quality or ``"box_office"`` to
+        maximise the box office boost, each minus the synergy penalty.
+    time_budget:
+        Seconds the search may run. When exceeded the best cast found so
+        far is returned with ``optimal`` set to ``False``.
+
+    Returns
+    -------
+    dict
+        ``selections`` (role to talent, or ``None`` if no cast fits the
+        budget), ``score``, ``total_cost``, ``optimal`` and search statistics
+        ``nodes`` and ``elapsed``.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"objective must be one of {OBJECTIVES}")
+    started = time.perf_counter()
+    deadline = started + time_budget
+    metric = _METRIC[objective]
+    roles = list(pools)
+
+    def result(selections, score, cost, optimal, nodes):
+        return {
+            "selections": selections,
+            "score": score,
+            "total_cost": cost,
+            "optimal": optimal,
+            "nodes": nodes,
+            "elapsed": time.perf_counter() - started,
+        }
+
+    if not roles or any(len(pools[r]) == 0 for r in roles):
+        return result(None, None, None, True, 0)
+
+    frontiers = [_frontier(_candidates(pools[role], metric, len(roles))) for role in roles]
+    # Short frontiers first: early levels branch least, deeper levels are
+    # pruned hardest by the bound.
+    order = sorted(range(len(roles)), key=lambda i: len(frontiers[i]))
+    frontiers = [frontiers[i] for i in order]
+    roles = [roles[i] for i in order]
+    depth = len(roles)
+    bounds = [_SuffixBound(frontiers, k) for k in range(depth + 1)]
+
+    if bounds[0].base_cost > budget:
+        return result(None, None, None, True, 0)
+
+    def pack(choice: List[Tuple[int, float, int]]):
+        selections = {role: pools[role][item[2]] for role, item in zip(roles, choice)}
+        return selections, sum(item[1] for item in choice), sum(item[0] for item in choice)
+
+    # Unconstrained optimum already affordable: nothing to search.
+    best_choice = [f[-1] for f in frontiers]
+    if sum(item[0] for item in best_choice) <= budget:
+        return result(*pack(best_choice), True, 0)
+
+    # Greedy incumbent: start from the cheapest cast and take the upgrade
+    # with the best value per extra dollar while the budget allows.
+    level = [0] * depth
+    spent = bounds[0].base_cost
+    while True:
+        best_step = None
+        for k, f in enumerate(frontiers):
+            for j in range(level[k] + 1, len(f)):
+                extra = f[j][0] - f[level[k]][0]
+                if spent + extra > budget:
+                    break
+                gain = (f[j][1] - f[level[k]][1]) / max(extra, 1)
+                if best_step is None or gain > best_step[0]:
+                    best_step = (gain, k, j, extra)
+        if best_step is None:
+            break
+        _, k, j, extra = best_step
+        level[k] = j
+        spent += extra
+    best_choice = [f[level[k]] for k, f in enumerate(frontiers)]
+    best_score = sum(item[1] for item in best_choice)
+
+    nodes = 0
+    timed_out = False
+    chosen: List[Tuple[int, float, int]] = []
+
+    def search(k: int, remaining: float, score: float) -> None:
+        nonlocal best_choice, best_score, nodes, timed_out
+        if k == depth:
+            if score > best_score + _EPS:
+                best_score = score
+                best_choice = list(chosen)
+            return
+        rest = bounds[k + 1]
+        # Most valuable candidates first; they are also the most expensive.
+        for item in reversed(frontiers[k]):
+            nodes += 1
+            if nodes & 1023 == 0 and time.perf_counter() > deadline:
+                timed_out = True
+            if timed_out:
+                return
+            cost, value, _ = item
+            if score + value + rest.max_value <= best_score + _EPS:
+                # Remaining candidates are worth even less.
+                return
+            left = remaining - cost
+            if left < rest.base_cost:
+                continue
+            if score + value + rest(left) <= best_score + _EPS:
+                continue
+            chosen.append(item)
+            search(k + 1, left, score + value)
+            chosen.pop()
+
+    search(0, budget, 0.0)
+    return result(*pack(best_choice), not timed_out, nodes)
+
+
+def brute_force_cast(
+    pools: Mapping[str, Sequence[Any]], budget: float, objective: str = "quality"
+) -> Optional[Tuple[float, Dict[str, Any]]]:
+    """Exhaustively score every cast; only practical for tiny pools.
+
+    Uses :func:`evaluate_casting_choices` directly and serves as the
+    reference :func:`solve_cast` is checked against.
+    """
+    roles = list(pools)
+    key = "expected_quality" if objective == "quality" else "box_office_boost"
+    best = None
+    for combo in product(*(pools[r] for r in roles)):
+        if sum(t.cost for t in combo) > budget:
+            continue
+        scores = evaluate_casting_choices(list(combo))
+        score = scores[key] - scores["team_synergy_penalty"]
+        if best is None or score > best[0] + _EPS:
+            best = (score, dict(zip(roles, combo)))
+    return best
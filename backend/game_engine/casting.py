@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import random
 
 @dataclass
@@ -35,20 +35,38 @@ class Talent:
 PLAYER_REPUTATION = 0.6  # 0 (terrible) - 1 (excellent)
 
 
-def generate_talent_pool(role: str, count: int = 5) -> List[Talent]:
-    """Return a list of potential actors/crew for the given role."""
+def talent_cost(star_power: int, skill: int) -> int:
+    """Return the fee of a talent with the given star power and skill."""
+    base_cost = 10000
+    return int(base_cost * (1 + star_power / 100) * (1 + skill / 200))
+
+
+def willingness_chance(working_relationship: float, reputation: float = PLAYER_REPUTATION) -> float:
+    """Return the chance that a talent wants to work with the player.
+
+    ``reputation`` uses the 0 (terrible) - 1 (excellent) scale of
+    :data:`PLAYER_REPUTATION`.
+    """
+    return max(0.0, min(1.0, reputation + working_relationship * 0.1))
+
+
+def generate_talent_pool(
+    role: str, count: int = 5, rng: Optional[random.Random] = None
+) -> List[Talent]:
+    """Return a list of potential actors/crew for the given role.
+
+    ``rng`` defaults to the global :mod:`random` module.
+    """
+    rng = rng or random
     pool: List[Talent] = []
     for i in range(count):
         name = f"{role.title()} Talent {i + 1}"
-        star_power = random.randint(0, 100)
-        skill = random.randint(0, 100)
-        base_cost = 10000
-        cost = int(base_cost * (1 + star_power / 100) * (1 + skill / 200))
-        availability = random.random() < 0.8
-        working_relationship = random.uniform(-1.0, 1.0)
-        willingness_chance = PLAYER_REPUTATION + working_relationship * 0.1
-        willingness_chance = max(0.0, min(1.0, willingness_chance))
-        wants_to_work = random.random() < willingness_chance
+        star_power = rng.randint(0, 100)
+        skill = rng.randint(0, 100)
+        cost = talent_cost(star_power, skill)
+        availability = rng.random() < 0.8
+        working_relationship = rng.uniform(-1.0, 1.0)
+        wants_to_work = rng.random() < willingness_chance(working_relationship)
 
         pool.append(
             Talent(
@@ -0,0 +1,355 @@
+"""Per-player time series of career metrics, one point per release.
+
+:class:`CareerHistory` keeps a value of every series in :data:`SERIES` for
+each completed project, plus a ``genre_strength:<genre>`` series for every
+genre the player has a strength in. Values live in :class:`ChunkedArray`
+columns of fixed-size chunks, so appending never copies a whole career.
+
+Downsampling tiers are kept alongside: tier ``k`` holds the count, minimum,
+maximum, sum and last value of every complete bucket of ``FACTOR ** k``
+points (10, 100, 1000, ...). A bucket is folded from the ``FACTOR``
+buckets of the tier below when it completes, so appending stays amortised
+O(1), and new tiers appear as the career grows. A query picks the tier
+whose buckets fit the requested number of points and reads partial buckets
+at the range edges from finer tiers, so its cost depends on the number of
+points returned, not on the length of the career.
+
+Points are derived from the completed project records
+(:func:`profile.add_completed_project` stamps the player's reputation and
+genre strengths after each release into them as ``player_reputation`` and
+``player_genre_strengths``), so a history can always be rebuilt from
+``past_projects``.
+"""
+from __future__ import annotations
+
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Series recorded for every release.
+SERIES = (
+    "reputation",
+    "critics_score",
+    "fan_score",
+    "box_office",
+    "cumulative_box_office",
+    "viewership",
+    "cumulative_viewership",
+    "profit",
+    "cumulative_profit",
+)
+GENRE_PREFIX = "genre_strength:"
+
+# Points per bucket grow by this factor from one tier to the next.
+FACTOR = 10
+# Points per storage chunk (a power of two).
+CHUNK_BITS = 10
+CHUNK_SIZE = 1 << CHUNK_BITS
+
+DEFAULT_POINTS = 100
+
+# An aggregate of consecutive points: (count, minimum, maximum, sum, last)
+Aggregate = Tuple[int, float, float, float, float]
+
+
+class ChunkedArray:
+    """Append-only column of doubles stored in :data:`CHUNK_SIZE` chunks."""
+
+    __slots__ = ("chunks", "size")
+
+    def __init__(self, values: Iterable[float] = ()) -> None:
+        self.chunks: List[array] = []
+        self.size = 0
+        for value in values:
+            self.append(value)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, value: float) -> None:
+        if self.size & (CHUNK_SIZE - 1) == 0:
+            self.chunks.append(array("d"))
+        self.chunks[-1].append(value)
+        self.size += 1
+
+    def __getitem__(self, index: int) -> float:
+        return self.chunks[index >> CHUNK_BITS][index & (CHUNK_SIZE - 1)]
+
+    def tobytes(self) -> bytes:
+        return b"".join(chunk.tobytes() for chunk in self.chunks)
+
+    @classmethod
+    def frombytes(cls, data: bytes) -> "ChunkedArray":
+        """Rebuild a column from the output of :meth:`tobytes`."""
+        column = cls()
+        values = array("d")
+        values.frombytes(data)
+        column.chunks = [values[i:i + CHUNK_SIZE] for i in range(0, len(values), CHUNK_SIZE)]
+        column.size = len(values)
+        return column
+
+    def slice(self, start: int, stop: int) -> List[float]:
+        """Return the values at ``start`` to ``stop - 1``."""
+        values: List[float] = []
+        while start < stop:
+            chunk = self.chunks[start >> CHUNK_BITS]
+            offset = start & (CHUNK_SIZE - 1)
+            take = min(stop - start, CHUNK_SIZE - offset)
+            values.extend(chunk[offset:offset + take])
+            start += take
+        return values
+
+
+def _combine(parts: Iterable[Optional[Aggregate]]) -> Optional[Aggregate]:
+    count, low, high, total, last = 0, float("inf"), float("-inf"), 0.0, 0.0
+    for part in parts:
+        if part is None:
+            continue
+        count += part[0]
+        low = min(low, part[1])
+        high = max(high, part[2])
+        total += part[3]
+        last = part[4]
+    return (count, low, high, total, last) if count else None
+
+
+class _Tier:
+    """Complete buckets of one size: minimum, maximum, sum and last value."""
+
+    __slots__ = ("low", "high", "total", "last")
+
+    def __init__(self) -> None:
+        self.low = ChunkedArray()
+        self.high = ChunkedArray()
+        self.total = ChunkedArray()
+        self.last = ChunkedArray()
+
+    def __len__(self) -> int:
+        return len(self.last)
+
+    def append(self, aggregate: Aggregate) -> None:
+        self.low.append(aggregate[1])
+        self.high.append(aggregate[2])
+        self.total.append(aggregate[3])
+        self.last.append(aggregate[4])
+
+    def get(self, bucket: int, count: int) -> Aggregate:
+        return (count, self.low[bucket], self.high[bucket], self.total[bucket], self.last[bucket])
+
+    def to_buffers(self) -> tuple:
+        return tuple(getattr(self, name).tobytes() for name in self.__slots__)
+
+    @classmethod
+    def from_buffers(cls, buffers) -> "_Tier":
+        tier = cls()
+        for name, data in zip(cls.__slots__, buffers):
+            setattr(tier, name, ChunkedArray.frombytes(data))
+        return tier
+
+
+class _Series:
+    """One metric: raw values plus its downsampling tiers (tier 1 upwards)."""
+
+    __slots__ = ("values", "tiers")
+
+    def __init__(self) -> None:
+        self.values = ChunkedArray()
+        self.tiers: List[_Tier] = []
+
+    def append(self, value: float) -> None:
+        self.values.append(value)
+        count = len(self.values)
+        level = 1
+        step = FACTOR
+        # Fold every bucket this point completed, finest tier first.
+        while count % step == 0:
+            if len(self.tiers) < level:
+                self.tiers.append(_Tier())
+            first = count // (step // FACTOR) - FACTOR
+            self.tiers[level - 1].append(self._aggregate_buckets(level - 1, first, first + FACTOR))
+            level += 1
+            step *= FACTOR
+
+    def to_buffers(self) -> tuple:
+        return (self.values.tobytes(), [tier.to_buffers() for tier in self.tiers])
+
+    @classmethod
+    def from_buffers(cls, buffers) -> "_Series":
+        series = cls()
+        series.values = ChunkedArray.frombytes(buffers[0])
+        series.tiers = [_Tier.from_buffers(tier) for tier in buffers[1]]
+        return series
+
+    def _aggregate_buckets(self, level: int, first: int, stop: int) -> Aggregate:
+        """Aggregate the complete buckets ``first`` to ``stop - 1`` of ``level``."""
+        if level == 0:
+            values = self.values.slice(first, stop)
+            return (len(values), min(values), max(values), sum(values), values[-1])
+        tier = self.tiers[level - 1]
+        size = FACTOR ** level
+        return _combine(tier.get(bucket, size) for bucket in range(first, stop))  # type: ignore[return-value]
+
+    def aggregate(self, start: int, stop: int, level: int) -> Optional[Aggregate]:
+        """Aggregate points ``start`` to ``stop - 1`` using tiers up to ``level``."""
+        if start >= stop:
+            return None
+        level = min(level, len(self.tiers))
+        if level == 0:
+            return self._aggregate_buckets(0, start, stop)
+        step = FACTOR ** level
+        first = -(-start // step)
+        last = stop // step
+        if first >= last:
+            return self.aggregate(start, stop, level - 1)
+        return _combine((
+            self.aggregate(start, first * step, level - 1),
+            self._aggregate_buckets(level, first, last),
+            self.aggregate(last * step, stop, level - 1),
+        ))
+
+    def downsample(self, start: int, stop: int, level: int) -> Dict[str, List[float]]:
+        """Return columns of the aligned buckets of ``FACTOR ** level`` points.
+
+        Complete buckets are sliced straight out of their tier; only the
+        clipped buckets at either edge are aggregated from finer tiers.
+        """
+        step = FACTOR ** level
+        columns: Dict[str, List[float]] = {"mean": [], "min": [], "max": [], "last": []}
+
+        def add(aggregate: Aggregate) -> None:
+            count, low, high, total, last = aggregate
+            columns["mean"].append(total / count)
+            columns["min"].append(low)
+            columns["max"].append(high)
+            columns["last"].append(last)
+
+        first = -(-start // step)
+        last = stop // step
+        if level > len(self.tiers) or first >= last:
+            edge = start
+            while edge < stop:
+                bound = min(stop, (edge // step + 1) * step)
+                add(self.aggregate(edge, bound, level))  # type: ignore[arg-type]
+                edge = bound
+            return columns
+        if start < first * step:
+            add(self.aggregate(start, first * step, level - 1))  # type: ignore[arg-type]
+        tier = self.tiers[level - 1]
+        columns["mean"].extend(total / step for total in tier.total.slice(first, last))
+        columns["min"].extend(tier.low.slice(first, last))
+        columns["max"].extend(tier.high.slice(first, last))
+        columns["last"].extend(tier.last.slice(first, last))
+        if last * step < stop:
+            add(self.aggregate(last * step, stop, level - 1))  # type: ignore[arg-type]
+        return columns
+
+
+def _record_values(record: Dict[str, Any], totals: Dict[str, float]) -> Dict[str, float]:
+    """Return the point of every :data:`SERIES` for one project record."""
+    point: Dict[str, float] = {}
+    for name in ("critics_score", "fan_score", "box_office", "viewership", "profit"):
+        value = float(record.get(name, 0) or 0)
+        point[name] = value
+        if name in ("box_office", "viewership", "profit"):
+            totals[name] += value
+            point["cumulative_" + name] = totals[name]
+    # Records saved before reputation was stamped carry the last known value.
+    reputation = record.get("player_reputation")
+    if reputation is not None:
+        totals["reputation"] = float(reputation)
+    point["reputation"] = totals["reputation"]
+    return point
+
+
+class CareerHistory:
+    """Time series of one player's career, indexed by release (0-based)."""
+
+    def __init__(self, projects: Iterable[Dict[str, Any]] = ()) -> None:
+        self._series: Dict[str, _Series] = {name: _Series() for name in SERIES}
+        # Running sums, and the latest reputation.
+        self._totals = {"box_office": 0.0, "viewership": 0.0, "profit": 0.0, "reputation": 0.0}
+        self._count = 0
+        for project in projects:
+            self.append(project)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def to_buffers(self) -> tuple:
+        """Return the series and their tiers as raw column bytes for compact storage."""
+        return (
+            self._count,
+            dict(self._totals),
+            {name: series.to_buffers() for name, series in self._series.items()},
+        )
+
+    @classmethod
+    def from_buffers(cls, buffers) -> "CareerHistory":
+        """Rebuild a history from the output of :meth:`to_buffers`."""
+        count, totals, series = buffers
+        history = cls()
+        history._count = count
+        history._totals = dict(totals)
+        history._series = {name: _Series.from_buffers(data) for name, data in series.items()}
+        return history
+
+    @property
+    def series(self) -> List[str]:
+        return list(self._series)
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Add the point of a newly completed project record."""
+        for name, value in _record_values(record, self._totals).items():
+            self._series[name].append(value)
+        strengths = record.get("player_genre_strengths") or {}
+        for genre in strengths:
+            name = GENRE_PREFIX + genre
+            if name not in self._series:
+                # A genre seen for the first time had no strength before.
+                series = self._series[name] = _Series()
+                for _ in range(self._count):
+                    series.append(0.0)
+        for name, series in self._series.items():
+            if name.startswith(GENRE_PREFIX):
+                series.append(float(strengths.get(name[len(GENRE_PREFIX):], 0) or 0))
+        self._count += 1
+
+    def query(
+        self,
+        names: Optional[List[str]] = None,
+        start: int = 0,
+        stop: Optional[int] = None,
+        points: int = DEFAULT_POINTS,
+    ) -> Dict[str, Any]:
+        """Return series ``names`` over releases ``start`` to ``stop - 1``.
+
+        At most ``points`` points are returned per series: releases are
+        grouped in aligned buckets of ``step`` releases (1, 10, 100, ...),
+        each point giving the bucket's ``mean``, ``min``, ``max`` and
+        ``last`` value; ``index`` holds each bucket's first release. Buckets
+        at the edges are clipped to the range. Unknown names raise
+        ``KeyError``.
+        """
+        names = list(self._series) if names is None else names
+        selected = [(name, self._series[name]) for name in names]
+        stop = self._count if stop is None else max(0, min(stop, self._count))
+        start = max(0, min(start, stop))
+        points = max(1, points)
+        level = 0
+        while stop > start and (stop - 1) // FACTOR ** level - start // FACTOR ** level >= points:
+            level += 1
+        step = FACTOR ** level
+        result: Dict[str, Any] = {
+            "projects": self._count,
+            "start": start,
+            "stop": stop,
+            "step": step,
+            "index": [max(start, edge) for edge in range(start - start % step, stop, step)],
+            "series": {},
+        }
+        for name, series in selected:
+            if level == 0:
+                values = series.values.slice(start, stop)
+                result["series"][name] = {"mean": values, "min": values, "max": values, "last": values}
+            else:
+                result["series"][name] = series.downsample(start, stop, level)
+        return result
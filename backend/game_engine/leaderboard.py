@@ -0,0 +1,342 @@
+"""Leaderboards ranking players across the whole server.
+
+:class:`Leaderboards` keeps every player's running totals and one ranking
+per metric and scope: all releases, one medium, one genre, or a medium and
+genre together. Rankings are :class:`IndexableSkipList` instances, so a
+release updates each ranking in O(log n) and top-K pages, rank lookups and
+percentile queries never scan the other players' careers.
+
+Players are identified by their ``player_id``, since two players may share
+a name; entries report both.
+"""
+from __future__ import annotations
+
+import random
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Ranked metrics; higher is better for all of them.
+METRICS = ("box_office", "profit", "critics_average", "awards")
+
+# Skip list height; supports about 2**20 entries per ranking efficiently.
+MAX_LEVELS = 20
+
+Scope = Tuple[Optional[str], Optional[str]]
+
+
+class _End:
+    """Sentinel key greater than every other key."""
+
+    __slots__ = ()
+
+    def __lt__(self, other: Any) -> bool:
+        return False
+
+    def __le__(self, other: Any) -> bool:
+        return False
+
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key: Any, height: int) -> None:
+        self.key = key
+        self.next: List[Optional[_Node]] = [None] * height
+        # Number of bottom-level steps to the node ``next[level]``.
+        self.width = [1] * height
+
+
+class IndexableSkipList:
+    """Sorted multiset with O(log n) insert, remove, index and rank.
+
+    Each link also records how many elements it skips, which turns the skip
+    list into an order-statistic structure: positional access and "how many
+    keys are smaller" both follow one top-down search path.
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None) -> None:
+        self._rng = rng or random.Random(0x5EED)
+        self._head = _Node(None, MAX_LEVELS)
+        end = _Node(_End(), MAX_LEVELS)
+        self._head.next = [end] * MAX_LEVELS
+        self._size = 0
+        # Levels in use; the head's widths above it are not maintained.
+        self._levels = 1
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _height(self) -> int:
+        height = 1
+        while height < MAX_LEVELS and self._rng.random() < 0.5:
+            height += 1
+        return height
+
+    def insert(self, key: Any) -> None:
+        height = self._height()
+        if height > self._levels:
+            for level in range(self._levels, height):
+                self._head.width[level] = self._size + 1
+            self._levels = height
+        levels = self._levels
+        chain: List[_Node] = [self._head] * levels
+        steps_at_level = [0] * levels
+        node = self._head
+        for level in reversed(range(levels)):
+            while node.next[level].key <= key:
+                steps_at_level[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+        new = _Node(key, height)
+        steps = 0
+        for level in range(height):
+            prev = chain[level]
+            new.next[level] = prev.next[level]
+            prev.next[level] = new
+            new.width[level] = prev.width[level] - steps
+            prev.width[level] = steps + 1
+            steps += steps_at_level[level]
+        for level in range(height, levels):
+            chain[level].width[level] += 1
+        self._size += 1
+
+    def remove(self, key: Any) -> None:
+        """Remove one occurrence of ``key``; raise ``KeyError`` if absent."""
+        levels = self._levels
+        chain: List[_Node] = [self._head] * levels
+        node = self._head
+        for level in reversed(range(levels)):
+            while node.next[level].key < key:
+                node = node.next[level]
+            chain[level] = node
+        target = chain[0].next[0]
+        if isinstance(target.key, _End) or target.key != key:
+            raise KeyError(key)
+        for level in range(len(target.next)):
+            prev = chain[level]
+            prev.width[level] += target.width[level] - 1
+            prev.next[level] = target.next[level]
+        for level in range(len(target.next), levels):
+            chain[level].width[level] -= 1
+        self._size -= 1
+
+    def rank(self, key: Any) -> int:
+        """Return how many keys are smaller than ``key``."""
+        node = self._head
+        rank = 0
+        for level in reversed(range(self._levels)):
+            while node.next[level].key < key:
+                rank += node.width[level]
+                node = node.next[level]
+        return rank
+
+    def __getitem__(self, index: int) -> Any:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("skip list index out of range")
+        node = self._head
+        remaining = index + 1
+        for level in reversed(range(self._levels)):
+            while node.width[level] <= remaining:
+                remaining -= node.width[level]
+                node = node.next[level]
+        return node.key
+
+    def slice(self, start: int, stop: int) -> Iterator[Any]:
+        """Yield the keys at positions ``start`` to ``stop - 1``."""
+        if start >= min(stop, self._size):
+            return
+        node = self._head
+        remaining = start + 1
+        for level in reversed(range(self._levels)):
+            while node.width[level] <= remaining:
+                remaining -= node.width[level]
+                node = node.next[level]
+        for _ in range(min(stop, self._size) - start):
+            yield node.key
+            node = node.next[0]
+
+
+class _Standing:
+    """A player's running totals within one scope."""
+
+    __slots__ = ("projects", "critics", "box_office", "profit", "awards")
+
+    def __init__(self) -> None:
+        self.projects = 0
+        self.critics = 0.0
+        self.box_office = 0.0
+        self.profit = 0.0
+        self.awards = 0
+
+    def add(self, project: Dict[str, Any], new_project: bool = True) -> None:
+        self.projects += new_project
+        self.critics += float(project.get("critics_score", 0) or 0)
+        self.box_office += float(project.get("box_office", 0) or 0)
+        self.profit += float(project.get("profit", 0) or 0)
+        self.awards += len(project.get("awards") or ())
+
+    def score(self, metric: str) -> float:
+        if metric == "critics_average":
+            return self.critics / self.projects if self.projects else 0.0
+        return float(getattr(self, metric))
+
+
+def _scopes(project: Dict[str, Any]) -> List[Scope]:
+    medium = project.get("medium")
+    genre = project.get("genre")
+    # dict.fromkeys drops repeats when the project lacks a medium or genre
+    return list(dict.fromkeys([(None, None), (medium, None), (None, genre), (medium, genre)]))
+
+
+class Leaderboards:
+    """Incrementally maintained rankings of players by career metrics.
+
+    Rankings are keyed by ``(-score, name, player_id)`` so the best player
+    comes first and ties are listed alphabetically.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self._standings: Dict[Scope, Dict[str, _Standing]] = {}
+        self._boards: Dict[Tuple[str, Scope], IndexableSkipList] = {}
+        self._names: Dict[str, str] = {}
+
+    def _add(self, player_id: str, project: Dict[str, Any], new_project: bool = True) -> None:
+        name = self._names[player_id]
+        for scope in _scopes(project):
+            standings = self._standings.setdefault(scope, {})
+            standing = standings.get(player_id)
+            if standing is None:
+                standing = standings[player_id] = _Standing()
+                before = None
+            else:
+                before = [standing.score(metric) for metric in METRICS]
+            standing.add(project, new_project)
+            for i, metric in enumerate(METRICS):
+                score = standing.score(metric)
+                board = self._boards.get((metric, scope))
+                if board is None:
+                    board = self._boards[(metric, scope)] = IndexableSkipList()
+                elif before is not None:
+                    if before[i] == score:
+                        continue
+                    board.remove((-before[i], name, player_id))
+                board.insert((-score, name, player_id))
+
+    def record(self, player_id: str, name: str, project: Dict[str, Any]) -> None:
+        """Fold one released project of the player into the rankings."""
+        with self.lock:
+            self._names.setdefault(player_id, name)
+            self._add(player_id, project)
+
+    def record_awards(self, player_id: str, project: Dict[str, Any], awards: List[str]) -> None:
+        """Credit ``awards`` won later (e.g. in an awards season) by ``project``.
+
+        Awards of a player with no ranked release are ignored.
+        """
+        if awards:
+            with self.lock:
+                if player_id not in self._names:
+                    return
+                self._add(
+                    player_id,
+                    {"medium": project.get("medium"), "genre": project.get("genre"), "awards": awards},
+                    new_project=False,
+                )
+
+    def add_player(self, player_id: str, name: str, projects: List[Dict[str, Any]]) -> None:
+        """Rank a player's existing career (e.g. a resumed one) once."""
+        with self.lock:
+            if player_id in self._names:
+                return
+            self._names[player_id] = name
+            for project in projects:
+                self._add(player_id, project)
+
+    def total(self, metric: str, medium: Optional[str] = None, genre: Optional[str] = None) -> int:
+        board = self._boards.get((metric, (medium, genre)))
+        return len(board) if board is not None else 0
+
+    def top(
+        self,
+        metric: str,
+        limit: int = 10,
+        offset: int = 0,
+        medium: Optional[str] = None,
+        genre: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return ranked entries ``offset`` to ``offset + limit - 1``.
+
+        ``rank`` is 1-based; tied players share the rank of the first of them.
+        """
+        scope = (medium, genre)
+        with self.lock:
+            board = self._boards.get((metric, scope))
+            if board is None:
+                return []
+            standings = self._standings[scope]
+            entries = []
+            for negated, name, player_id in board.slice(offset, offset + limit):
+                if entries and entries[-1]["score"] == -negated:
+                    rank = entries[-1]["rank"]
+                else:
+                    rank = board.rank((negated,)) + 1
+                entries.append({
+                    "rank": rank,
+                    "player_id": player_id,
+                    "name": name,
+                    "score": -negated,
+                    "projects": standings[player_id].projects,
+                })
+            return entries
+
+    def rank(
+        self,
+        metric: str,
+        player_id: str,
+        medium: Optional[str] = None,
+        genre: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Return the player's ``name``, 1-based ``rank``, ``score`` and ``percentile``.
+
+        ``percentile`` is the share of ranked players scoring at most as much
+        as this player (100 for the leader). ``None`` if the player has no
+        release in the scope.
+        """
+        scope = (medium, genre)
+        with self.lock:
+            standing = self._standings.get(scope, {}).get(player_id)
+            if standing is None:
+                return None
+            board = self._boards[(metric, scope)]
+            score = standing.score(metric)
+            better = board.rank((-score,))
+            total = len(board)
+            return {
+                "name": self._names[player_id],
+                "rank": better + 1,
+                "total": total,
+                "score": score,
+                "percentile": 100.0 * (total - better) / total,
+            }
+
+    def score_at_percentile(
+        self,
+        metric: str,
+        percentile: float,
+        medium: Optional[str] = None,
+        genre: Optional[str] = None,
+    ) -> Optional[float]:
+        """Return the lowest score still within the top ``100 - percentile`` %.
+
+        ``percentile=90`` gives the score a player needs to be in the top 10%.
+        """
+        with self.lock:
+            board = self._boards.get((metric, (medium, genre)))
+            if not board:
+                return None
+            share = max(0.0, min(100.0, 100.0 - percentile)) / 100.0
+            index = min(len(board) - 1, max(0, int(share * len(board)) - 1))
+            return -board[index][0]
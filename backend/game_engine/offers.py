@@ -1,48 +1,166 @@
+"""Project offers.
+
+Everything an offer is assembled from depends only on :mod:`constants`, so
+the medium and genre pairs, their taglines and the possible role lists are
+built once at import. :func:`generate_offer` then only draws the random
+parts, in exactly the order the original implementation did, so seeded
+games keep getting the same offers. :func:`generate_offers` samples many
+offers at once for bulk callers such as the content cache.
+"""
+import itertools
 import random
-from typing import List, Dict
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from .constants import GENRES, ROLES
 
+# Every offer asks for a lead and a supporting actor plus two other roles.
+FIXED_ROLES = ("lead actor", "supporting actor")
+OTHER_ROLES = tuple(r for r in ROLES if r != "director" and r not in FIXED_ROLES)
+EXTRA_ROLES = 2
 
-def generate_offer_list() -> List[Dict]:
-    """Generate a list of mock project offers.
+MEDIA = tuple(GENRES)
+PAIRS: Tuple[Tuple[str, str], ...] = tuple(
+    (medium, genre) for medium in MEDIA for genre in GENRES[medium]
+)
+TAGLINES: Dict[Tuple[str, str], str] = {
+    (medium, genre): f"A {genre} {medium} experience" for medium, genre in PAIRS
+}
+# Cumulative weights giving each pair the chance of drawing its medium and
+# then its genre uniformly.
+_PAIR_CUM_WEIGHTS = list(
+    itertools.accumulate(1.0 / (len(MEDIA) * len(GENRES[medium])) for medium, _ in PAIRS)
+)
 
-    Each offer contains the basic project data expected by the front end. The
-    values are intentionally simple/randomised to keep the function lightweight
-    and dependency free.
+BUDGET_RANGE = (1_000_000, 5_000_000)
+RISK_RANGE = (1, 10)
+_BUDGET_SPAN = BUDGET_RANGE[1] - BUDGET_RANGE[0] + 1
+_RISK_SPAN = RISK_RANGE[1] - RISK_RANGE[0] + 1
+
+
+def _shuffle_table(items: Sequence[str], keep: int) -> List[Tuple[str, ...]]:
+    """Return the first ``keep`` items after every possible ``random.shuffle``.
+
+    :meth:`random.Random.shuffle` draws ``randbelow(i + 1)`` for ``i`` from
+    ``len(items) - 1`` down to 1. Read as a mixed-radix number, those draws
+    index this table, so the outcome of a shuffle can be looked up without
+    building and shuffling a list.
+    """
+    table = []
+    for draws in itertools.product(*(range(i + 1) for i in range(len(items) - 1, 0, -1))):
+        order = list(items)
+        for i, j in zip(range(len(items) - 1, 0, -1), draws):
+            order[i], order[j] = order[j], order[i]
+        table.append(tuple(order[:keep]))
+    return table
+
+
+# Role lists indexed by the shuffle draws, and the distinct lists for bulk
+# sampling (every ordered pair of other roles is equally likely).
+_SHUFFLE_RADICES = tuple(range(len(OTHER_ROLES), 1, -1))
+ROLE_LISTS: Tuple[Tuple[str, ...], ...] = tuple(
+    FIXED_ROLES + extra for extra in _shuffle_table(OTHER_ROLES, EXTRA_ROLES)
+)
+ROLE_CHOICES: Tuple[Tuple[str, ...], ...] = tuple(
+    FIXED_ROLES + extra for extra in itertools.permutations(OTHER_ROLES, EXTRA_ROLES)
+)
+
+
+def generate_offer(
+    offer_id: int,
+    rng: Optional[random.Random] = None,
+    medium: Optional[str] = None,
+    genre: Optional[str] = None,
+) -> Dict:
+    """Generate a single mock project offer.
+
+    ``medium`` and ``genre`` are drawn from ``rng`` unless given, which lets
+    callers pre-generate offers for a particular medium and genre.
     """
 
-    offers: List[Dict] = []
+    rng = rng or random
 
-    mediums = list(GENRES.keys())
-    role_choices = [r for r in ROLES if r != "director"]
+    if medium is None:
+        medium = rng.choice(MEDIA)
+    if genre is None:
+        genre = rng.choice(GENRES[medium])
 
-    for i in range(1, 4):
-        medium = random.choice(mediums)
-        genre = random.choice(GENRES[medium])
+    # Same draws as shuffling the other roles and keeping the first two.
+    index = 0
+    for radix in _SHUFFLE_RADICES:
+        index = index * radix + rng.randrange(radix)
+    roles = ROLE_LISTS[index]
 
-        # Select a handful of roles that need to be cast. Always include lead
-        # and supporting actor so the UI has something to request.
-        roles = ["lead actor", "supporting actor"]
-        others = [r for r in role_choices if r not in roles]
-        random.shuffle(others)
-        roles.extend(others[:2])
+    # ``low + randrange(span)`` draws exactly what ``randint`` would.
+    budget = BUDGET_RANGE[0] + rng.randrange(_BUDGET_SPAN)
+    risk = RISK_RANGE[0] + rng.randrange(_RISK_SPAN)
 
-        offer = {
-            "id": i,
-            "title": f"Project {i}",
-            "budget": random.randint(1_000_000, 5_000_000),
+    return {
+        "id": offer_id,
+        "title": f"Project {offer_id}",
+        "budget": budget,
+        "genre": genre,
+        "medium": medium,
+        "roles": list(roles),
+        "tagline": TAGLINES.get((medium, genre)) or f"A {genre} {medium} experience",
+        # ``risk`` doubles as the risk factor used later in release logic
+        "risk": risk,
+        "risk_factor": risk,
+    }
+
+
+def generate_offers(
+    n: int,
+    rng: Optional[random.Random] = None,
+    start_id: int = 1,
+    medium: Optional[str] = None,
+    genre: Optional[str] = None,
+) -> List[Dict]:
+    """Generate ``n`` offers with ids ``start_id`` onwards in bulk.
+
+    Offers follow the distribution of :func:`generate_offer`, but each
+    column (pair, roles, budget, risk) is sampled for all offers in one
+    pass, so the random stream is consumed differently: use
+    :func:`generate_offer_list` where offers must match a seeded game.
+    ``medium`` and ``genre`` fix those fields like in :func:`generate_offer`.
+    """
+
+    rng = rng or random
+    if n <= 0:
+        return []
+    if medium is None:
+        pairs = rng.choices(PAIRS, cum_weights=_PAIR_CUM_WEIGHTS, k=n)
+    elif genre is None:
+        pairs = [(medium, g) for g in rng.choices(GENRES[medium], k=n)]
+    else:
+        pairs = [(medium, genre)] * n
+    role_lists = rng.choices(ROLE_CHOICES, k=n)
+    random_ = rng.random
+    budget_low = BUDGET_RANGE[0]
+    risk_low = RISK_RANGE[0]
+    offers = []
+    for offer_id, (medium, genre), roles in zip(range(start_id, start_id + n), pairs, role_lists):
+        risk = risk_low + int(random_() * _RISK_SPAN)
+        offers.append({
+            "id": offer_id,
+            "title": f"Project {offer_id}",
+            "budget": budget_low + int(random_() * _BUDGET_SPAN),
             "genre": genre,
             "medium": medium,
-            "roles": roles,
-            "tagline": f"A {genre} {medium} experience",
-            # ``risk`` doubles as the risk factor used later in release logic
-            "risk": random.randint(1, 10),
-        }
+            "roles": list(roles),
+            "tagline": TAGLINES.get((medium, genre)) or f"A {genre} {medium} experience",
+            "risk": risk,
+            "risk_factor": risk,
+        })
+    return offers
 
-        # Mirror ``risk`` under ``risk_factor`` for internal use
-        offer["risk_factor"] = offer["risk"]
 
-        offers.append(offer)
+def generate_offer_list(rng: Optional[random.Random] = None) -> List[Dict]:
+    """Generate a list of mock project offers.
 
-    return offers
+    Each offer contains the basic project data expected by the front end. The
+    values are intentionally simple/randomised to keep the function lightweight
+    and dependency free. ``rng`` defaults to the global :mod:`random` module;
+    pass a :class:`~game_engine.rng.GameRNG` stream for reproducible offers.
+    """
+
+    return [generate_offer(i, rng) for i in range(1, 4)]
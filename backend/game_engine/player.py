@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass, field, asdict
 from typing import Dict, List
 
@@ -9,6 +10,21 @@ except ImportError:  # pragma: no cover - constants may not be defined yet
     constants = None  # type: ignore
 
 
+def new_player_id() -> str:
+    """Return a random id that tells apart players with the same name."""
+    return os.urandom(8).hex()
+
+
+def legacy_player_id(name: str) -> str:
+    """Return the id of a career saved before players had ids.
+
+    Derived from the name, so every process gives the career the same id.
+    """
+    import hashlib
+
+    return hashlib.sha256(name.encode()).hexdigest()[:16]
+
+
 @dataclass
 class Player:
     """Represents the director/player and stores career data."""
@@ -19,6 +35,11 @@ class Player:
     genre_strengths: Dict[str, int] = field(default_factory=dict)
     past_projects: List[Dict] = field(default_factory=list)
     traits: List[str] = field(default_factory=list)
+    # Working relationship with each market talent worked with, keyed by the
+    # talent id as a string: -1 (never again) .. 1 (close collaborator)
+    relationships: Dict[str, float] = field(default_factory=dict)
+    # Server-wide identity for leaderboards and awards; names are not unique.
+    player_id: str = field(default_factory=new_player_id)
 
     def __post_init__(self) -> None:
         self.reputation = max(0, min(100, self.reputation))
@@ -0,0 +1,173 @@
+"""Pre-generated offers and talent pools served from ready queues.
+
+:class:`ContentCache` keeps a bounded queue of ready offers per
+``(medium, genre)`` and of ready talent pools per role. Requests pop from the
+queues in O(1); a background thread tops up any queue that falls below the
+low-water mark. When a queue is empty (or the request cannot be served from
+the cache, e.g. an unusual pool size) the content is generated inline, so
+callers always get an answer.
+
+Cached content is generated from the cache's own random stream, so sessions
+that must be reproducible from their seed should bypass the cache.
+"""
+from __future__ import annotations
+
+import random
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .constants import GENRES, ROLES
+from .offers import generate_offer, generate_offers
+from .talent_pool import TalentPool
+
+# Offers per ``/get_projects`` call, matching ``generate_offer_list``.
+OFFERS_PER_LIST = 3
+# Pool size the cache holds; other sizes are generated inline.
+DEFAULT_POOL_SIZE = 5
+
+
+class ContentCache:
+    """Bucketed queues of pre-generated offers and talent pools.
+
+    Parameters
+    ----------
+    high_water:
+        Items each bucket is filled up to.
+    low_water:
+        Bucket size below which the refill worker is woken.
+    pool_size:
+        Talent pool size that is pre-generated.
+    rng:
+        Random stream for pre-generation; a fresh unseeded stream by default.
+    talent_pools:
+        Whether to pre-generate talent pools. Turn it off when pools come
+        from elsewhere (the talent market); :meth:`talent_pool` then
+        generates inline.
+    """
+
+    def __init__(
+        self,
+        high_water: int = 32,
+        low_water: int = 8,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        rng: Optional[random.Random] = None,
+        talent_pools: bool = True,
+    ) -> None:
+        self.high_water = high_water
+        self.low_water = min(low_water, high_water)
+        self.pool_size = pool_size
+        self._rng = rng or random.Random()
+        self._offers: Dict[Tuple[str, str], Deque[Dict[str, Any]]] = {
+            (medium, genre): deque() for medium, genres in GENRES.items() for genre in genres
+        }
+        self._pools: Dict[str, Deque[TalentPool]] = (
+            {role: deque() for role in ROLES} if talent_pools else {}
+        )
+        self._mediums = list(GENRES)
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # -- background refill ------------------------------------------------
+
+    def start(self) -> None:
+        """Fill every bucket on a background thread and keep them topped up."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="content-cache", daemon=True)
+        self._thread.start()
+        self._wake.set()
+
+    def stop(self) -> None:
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            self._wake.set()
+            thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            self.fill()
+
+    def fill(self) -> int:
+        """Top up every bucket below the low-water mark; return items made."""
+        made = 0
+        for (medium, genre), bucket in self._offers.items():
+            if len(bucket) < self.low_water:
+                if not self._stop.is_set():
+                    needed = self.high_water - len(bucket)
+                    bucket.extend(generate_offers(needed, self._rng, 0, medium, genre))
+                    made += needed
+        for role, bucket in self._pools.items():
+            if len(bucket) < self.low_water:
+                while len(bucket) < self.high_water and not self._stop.is_set():
+                    bucket.append(TalentPool.generate(role, self.pool_size, rng=self._rng))
+                    made += 1
+        return made
+
+    def _record(self, hit: bool, bucket: Deque) -> None:
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if len(bucket) < self.low_water:
+            self._wake.set()
+
+    # -- serving ----------------------------------------------------------
+
+    def offers(self, rng: random.Random, count: int = OFFERS_PER_LIST) -> List[Dict[str, Any]]:
+        """Return ``count`` offers, popping ready ones where possible.
+
+        ``rng`` picks each offer's medium and genre with the same
+        distribution as :func:`~game_engine.offers.generate_offer_list`
+        and generates any offer whose bucket is empty.
+        """
+        offers = []
+        for i in range(1, count + 1):
+            medium = rng.choice(self._mediums)
+            genre = rng.choice(GENRES[medium])
+            bucket = self._offers[(medium, genre)]
+            try:
+                offer = bucket.popleft()
+            except IndexError:
+                offer = generate_offer(i, rng, medium, genre)
+                self._record(False, bucket)
+            else:
+                offer["id"] = i
+                offer["title"] = f"Project {i}"
+                self._record(True, bucket)
+            offers.append(offer)
+        return offers
+
+    def talent_pool(self, role: str, count: int, rng: random.Random) -> TalentPool:
+        """Return a talent pool for ``role``, generating it inline on a miss."""
+        bucket = self._pools.get(role)
+        if bucket is not None and count == self.pool_size:
+            try:
+                pool = bucket.popleft()
+            except IndexError:
+                pass
+            else:
+                self._record(True, bucket)
+                return pool
+            self._record(False, bucket)
+        else:
+            with self._stats_lock:
+                self.misses += 1
+        return TalentPool.generate(role, count, rng=rng)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "ready_offers": sum(len(b) for b in self._offers.values()),
+            "ready_pools": sum(len(b) for b in self._pools.values()),
+        }
@@ -3,14 +3,10 @@
 from __future__ import annotations
 
 import random
-from typing import List, Dict, Any
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
 
-# Placeholder import for Talent type hinting
-try:
-    from casting import Talent
-except ImportError:  # pragma: no cover - casting module may not exist in this repo
-    class Talent:  # type: ignore
-        skill: int = 0
+if TYPE_CHECKING:
+    from .casting import Talent
 
 
 def log_event(event: str, notes: List[str]) -> None:
@@ -18,15 +14,16 @@ def log_event(event: str, notes: List[str]) -> None:
     notes.append(event)
 
 
-def generate_random_production_events() -> List[str]:
+def generate_random_production_events(rng: Optional[random.Random] = None) -> List[str]:
     """Randomly select 1-3 production issues from a curated list."""
+    rng = rng or random
     possible_issues = [
         "Actor temper tantrum",
         "Crew illness",
         "Location flooded",
         "Network demands rewrites",
     ]
-    return random.sample(possible_issues, k=random.randint(1, 3))
+    return rng.sample(possible_issues, k=rng.randint(1, 3))
 
 
 def apply_player_decisions(decisions: Dict[str, Any] | None) -> Dict[str, int]:
@@ -46,8 +43,19 @@ def apply_player_decisions(decisions: Dict[str, Any] | None) -> Dict[str, int]:
     return modifiers
 
 
-def simulate_production(project: Dict[str, Any], cast: List[Talent]) -> Dict[str, Any]:
-    """Simulate the active production phase of a project.
+def iter_production(
+    project: Dict[str, Any],
+    cast: List[Talent],
+    rng: Optional[random.Random] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Simulate production week by week, yielding one event at a time.
+
+    Every event is a dict with a ``type`` (``"start"``, ``"issue"``,
+    ``"cast"``, ``"decisions"``, ``"schedule"``, ``"feedback"`` or
+    ``"complete"``), the ``week`` it happens in and the running ``quality``.
+    The final ``"complete"`` event carries the same ``result`` dict that
+    :func:`simulate_production` returns; random draws are made in the same
+    order, so both give identical results for the same stream.
 
     Parameters
     ----------
@@ -56,21 +64,41 @@ def simulate_production(project: Dict[str, Any], cast: List[Talent]) -> Dict[str
         used to seed the quality calculation.
     cast : list[``Talent``]
         List of cast members involved in the production.
+    rng : random.Random, optional
+        Random stream to draw from; defaults to the global :mod:`random`
+        module.
     """
 
+    rng = rng or random
+
     base_quality = project.get("base_quality", 50)
     quality = base_quality
     production_notes: List[str] = []
     issues: List[str] = []
     delay_weeks = 0
+    week = 0
+    yield {"type": "start", "week": week, "quality": quality}
 
-    # Apply random production events
-    events = generate_random_production_events()
+    # Apply random production events, one per shooting week
+    events = generate_random_production_events(rng)
     for event in events:
-        log_event(f"Issue encountered: {event}", production_notes)
+        week += 1
+        note = f"Issue encountered: {event}"
+        log_event(note, production_notes)
         issues.append(event)
-        quality -= random.randint(5, 15)
-        delay_weeks += random.randint(0, 2)
+        quality_change = -rng.randint(5, 15)
+        delay = rng.randint(0, 2)
+        quality += quality_change
+        delay_weeks += delay
+        yield {
+            "type": "issue",
+            "week": week,
+            "issue": event,
+            "note": note,
+            "quality_change": quality_change,
+            "delay_weeks": delay,
+            "quality": quality,
+        }
 
     # Cap delays between 0 and 5 weeks
     delay_weeks = min(max(delay_weeks, 0), 5)
@@ -78,12 +106,22 @@ def simulate_production(project: Dict[str, Any], cast: List[Talent]) -> Dict[str
     # Incorporate cast skill
     cast_skill = sum(getattr(member, "skill", 0) for member in cast)
     quality += cast_skill
+    yield {"type": "cast", "week": week, "quality_change": cast_skill, "quality": quality}
 
     # Apply player decisions if present in project data
     decision_mods = apply_player_decisions(project.get("decisions"))
     quality += decision_mods.get("quality", 0)
     delay_weeks += decision_mods.get("delay", 0)
     delay_weeks = min(max(delay_weeks, 0), 5)
+    if project.get("decisions"):
+        yield {
+            "type": "decisions",
+            "week": week,
+            "decisions": project["decisions"],
+            "quality_change": decision_mods.get("quality", 0),
+            "quality": quality,
+        }
+    yield {"type": "schedule", "week": week, "delays": delay_weeks, "quality": quality}
 
     final_quality_score = quality
 
@@ -94,12 +132,45 @@ def simulate_production(project: Dict[str, Any], cast: List[Talent]) -> Dict[str
         "Studio wants reshoots",
         "Studio is thrilled with the footage",
     ]
-    studio_feedback = random.choice(feedback_options)
-
-    return {
-        "final_quality_score": final_quality_score,
-        "delays": delay_weeks,
-        "issues": issues,
-        "production_notes": production_notes,
-        "studio_feedback": studio_feedback,
+    studio_feedback = rng.choice(feedback_options)
+    week += 1
+    yield {"type": "feedback", "week": week, "studio_feedback": studio_feedback, "quality": quality}
+
+    yield {
+        "type": "complete",
+        "week": week,
+        "quality": quality,
+        "result": {
+            "final_quality_score": final_quality_score,
+            "delays": delay_weeks,
+            "issues": issues,
+            "production_notes": production_notes,
+            "studio_feedback": studio_feedback,
+        },
     }
+
+
+def simulate_production(
+    project: Dict[str, Any],
+    cast: List[Talent],
+    rng: Optional[random.Random] = None,
+) -> Dict[str, Any]:
+    """Simulate the active production phase of a project.
+
+    Runs :func:`iter_production` to completion and returns its result.
+
+    Parameters
+    ----------
+    project : dict
+        Dictionary describing the project. Expected key ``base_quality`` may be
+        used to seed the quality calculation.
+    cast : list[``Talent``]
+        List of cast members involved in the production.
+    rng : random.Random, optional
+        Random stream to draw from; defaults to the global :mod:`random`
+        module.
+    """
+
+    for event in iter_production(project, cast, rng):
+        pass
+    return event["result"]
@@ -2,75 +2,137 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, List, Dict, Any, Optional, Set
 
+from .history import CareerHistory
+from .serialization import invalidate_projects
+
 if TYPE_CHECKING:
     # Placeholder import for type checking. The actual Player class
     # should define a ``past_projects`` attribute used here.
     from .player import Player
+    from .storage import CareerStore
 
 
-def add_completed_project(player: 'Player', project_data: Dict[str, Any]) -> None:
-    """Append a completed project record to ``player.past_projects``.
-
-    The record is stored with a placeholder ``poster_url`` field if one is not
-    provided. ``player`` is expected to have a ``past_projects`` attribute that
-    behaves like a list.
-    """
-    if not hasattr(player, "past_projects"):
-        player.past_projects = []  # type: ignore[attr-defined]
+# Durable store completed projects are written through to, if configured.
+_career_store: Optional['CareerStore'] = None
 
-    project = dict(project_data)
-    project.setdefault("poster_url", None)
 
-    player.past_projects.append(project)  # type: ignore[attr-defined]
+def set_career_store(store: Optional['CareerStore']) -> None:
+    """Write every completed project through to ``store`` (``None`` disables)."""
+    global _career_store
+    _career_store = store
 
 
-def get_profile_summary(player: 'Player') -> Dict[str, Any]:
-    """Return a dictionary summarizing the player's completed projects.
+class ProfileStats:
+    """Running aggregates over a player's completed projects.
 
-    The summary includes overall statistics and simplified information about
-    each project for display on a public profile page.
+    Kept up to date by :func:`add_completed_project` so that
+    :func:`get_profile_summary` never has to walk ``past_projects``.
     """
-    projects: List[Dict[str, Any]] = getattr(player, "past_projects", [])  # type: ignore[attr-defined]
 
-    total_projects = len(projects)
-    total_critics = 0.0
-    total_fans = 0.0
-    awards: Set[Any] = set()
+    __slots__ = (
+        "count",
+        "total_critics",
+        "total_fans",
+        "awards",
+        "has_box_office",
+        "has_viewership",
+        "total_box_office",
+        "total_viewership",
+        "best_box_office",
+        "best_box_office_project",
+        "best_box_office_index",
+        "best_viewership",
+        "best_viewership_project",
+        "best_viewership_index",
+        "summaries",
+    )
 
-    use_box_office = any("box_office" in p for p in projects)
-    use_viewership = not use_box_office and any("viewership" in p for p in projects)
+    # Plain values written by ``to_buffers``, in order.
+    _STORED = (
+        "count",
+        "total_critics",
+        "total_fans",
+        "has_box_office",
+        "has_viewership",
+        "total_box_office",
+        "total_viewership",
+        "best_box_office",
+        "best_box_office_index",
+        "best_viewership",
+        "best_viewership_index",
+    )
 
-    total_box_office = 0.0
-    total_viewership = 0.0
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_critics = 0.0
+        self.total_fans = 0.0
+        self.awards: Set[Any] = set()
+        self.has_box_office = False
+        self.has_viewership = False
+        self.total_box_office = 0.0
+        self.total_viewership = 0.0
+        # Strict ``>`` against -1 keeps the first of any tied projects,
+        # matching a front-to-back scan.
+        self.best_box_office = -1.0
+        self.best_box_office_project: Optional[Dict[str, Any]] = None
+        self.best_box_office_index = -1
+        self.best_viewership = -1.0
+        self.best_viewership_project: Optional[Dict[str, Any]] = None
+        self.best_viewership_index = -1
+        self.summaries: List[Dict[str, Any]] = []
 
-    highest_grossing: Optional[Dict[str, Any]] = None
-    highest_amount = -1.0
+    def to_buffers(self) -> tuple:
+        """Return the aggregates as plain values for compact storage."""
+        return (
+            tuple(getattr(self, name) for name in self._STORED),
+            sorted(self.awards, key=repr),
+            self.summaries,
+        )
 
-    summaries: List[Dict[str, Any]] = []
+    @classmethod
+    def from_buffers(cls, buffers, projects: List[Dict[str, Any]]) -> "ProfileStats":
+        """Rebuild aggregates from :meth:`to_buffers` over the same ``projects``."""
+        values, awards, summaries = buffers
+        stats = cls()
+        for name, value in zip(cls._STORED, values):
+            setattr(stats, name, value)
+        stats.awards = set(awards)
+        stats.summaries = list(summaries)
+        if stats.best_box_office_index >= 0:
+            stats.best_box_office_project = projects[stats.best_box_office_index]
+        if stats.best_viewership_index >= 0:
+            stats.best_viewership_project = projects[stats.best_viewership_index]
+        return stats
 
-    for p in projects:
+    def add(self, p: Dict[str, Any]) -> None:
+        """Fold one completed project record into the aggregates."""
         critics_score = float(p.get("critics_score", 0) or 0)
         fan_score = float(p.get("fan_score", 0) or 0)
-        total_critics += critics_score
-        total_fans += fan_score
-
-        if use_box_office:
-            amount = float(p.get("box_office", 0) or 0)
-            total_box_office += amount
-        elif use_viewership:
-            amount = float(p.get("viewership", 0) or 0)
-            total_viewership += amount
-        else:
-            amount = 0.0
-
-        if amount > highest_amount:
-            highest_amount = amount
-            highest_grossing = p
+        self.count += 1
+        self.total_critics += critics_score
+        self.total_fans += fan_score
+
+        # Both totals are tracked because the summary reports box office as
+        # soon as any project has it, and viewership otherwise.
+        box_office = float(p.get("box_office", 0) or 0)
+        viewership = float(p.get("viewership", 0) or 0)
+        self.has_box_office = self.has_box_office or "box_office" in p
+        self.has_viewership = self.has_viewership or "viewership" in p
+        self.total_box_office += box_office
+        self.total_viewership += viewership
+        if box_office > self.best_box_office:
+            self.best_box_office = box_office
+            self.best_box_office_project = p
+            self.best_box_office_index = self.count - 1
+        if viewership > self.best_viewership:
+            self.best_viewership = viewership
+            self.best_viewership_project = p
+            self.best_viewership_index = self.count - 1
 
         for award in p.get("awards", []):
-            awards.add(award)
+            self.awards.add(award)
 
-        summaries.append({
+        self.summaries.append({
             "id": p.get("id"),
             "title": p.get("title"),
             "year": p.get("year"),
@@ -82,22 +144,153 @@ def get_profile_summary(player: 'Player') -> Dict[str, Any]:
             "awards": p.get("awards", []),
         })
 
-    avg_critics = total_critics / total_projects if total_projects else 0.0
-    avg_fans = total_fans / total_projects if total_projects else 0.0
+
+def _profile_stats(player: 'Player') -> ProfileStats:
+    """Return the player's running aggregates, rebuilding them if stale.
+
+    Aggregates are rebuilt once when a player has projects recorded by some
+    other path (for example ``Player.add_project`` or a restored save).
+    """
+    projects: List[Dict[str, Any]] = getattr(player, "past_projects", [])  # type: ignore[attr-defined]
+    stats: Optional[ProfileStats] = getattr(player, "_profile_stats", None)
+    if stats is None or stats.count != len(projects):
+        stats = ProfileStats()
+        for p in projects:
+            stats.add(p)
+        player._profile_stats = stats  # type: ignore[attr-defined]
+    return stats
+
+
+def career_history(player: 'Player') -> CareerHistory:
+    """Return the player's career time series, building them if stale.
+
+    The history is built from ``past_projects`` on first use (or when
+    projects were recorded by another path) and then kept up to date by
+    :func:`add_completed_project`.
+    """
+    projects: List[Dict[str, Any]] = getattr(player, "past_projects", [])  # type: ignore[attr-defined]
+    history: Optional[CareerHistory] = getattr(player, "_career_history", None)
+    if history is None or len(history) != len(projects):
+        history = CareerHistory(projects)
+        player._career_history = history  # type: ignore[attr-defined]
+    return history
+
+
+def add_completed_project(player: 'Player', project_data: Dict[str, Any]) -> None:
+    """Append a completed project record to ``player.past_projects``.
+
+    The record is stored with a placeholder ``poster_url`` field if one is not
+    provided. ``player`` is expected to have a ``past_projects`` attribute that
+    behaves like a list. The player's running profile aggregates are updated
+    in the same step, and the record is saved to the career store set with
+    :func:`set_career_store`.
+    """
+    if not hasattr(player, "past_projects"):
+        player.past_projects = []  # type: ignore[attr-defined]
+
+    stats = _profile_stats(player)
+
+    project = dict(project_data)
+    project.setdefault("poster_url", None)
+    # Player state after the release, for the career history.
+    project.setdefault("player_reputation", getattr(player, "reputation", 0))
+    strengths = getattr(player, "genre_strengths", None)
+    if strengths:
+        project.setdefault("player_genre_strengths", dict(strengths))
+
+    history: Optional[CareerHistory] = getattr(player, "_career_history", None)
+    player.past_projects.append(project)  # type: ignore[attr-defined]
+    stats.add(project)
+    if history is not None and len(history) == len(player.past_projects) - 1:  # type: ignore[attr-defined]
+        history.append(project)
+    if _career_store is not None:
+        _career_store.record_project(player, project)
+
+
+def record_award_results(player: 'Player', results: Dict[int, Dict[str, Any]]) -> int:
+    """Write awards-season results into ``player.past_projects``.
+
+    ``results`` maps project indexes to the entries produced by
+    :meth:`~game_engine.awards_season.AwardsSeason.resolve`. Wins are added
+    to the record's ``awards`` and nominations to ``award_nominations``; the
+    whole result is kept under ``season``. Results whose record no longer
+    matches (different ``id`` or ``title``) or already holds them are
+    skipped, so delivering the same results twice changes nothing.
+
+    Updated records replace the old ones (which stay untouched), profile
+    aggregates and cached encodings are refreshed, and the records are saved
+    to the career store. Returns the number of records updated.
+    """
+    projects: List[Dict[str, Any]] = player.past_projects  # type: ignore[attr-defined]
+    updated = []
+    for index, result in sorted(results.items()):
+        if not 0 <= index < len(projects):
+            continue
+        record = projects[index]
+        if record.get("id") != result.get("id") or record.get("title") != result.get("title"):
+            continue
+        if record.get("season") == result:
+            continue
+        awards = list(record.get("awards", []))
+        awards.extend(a for a in result["wins"] if a not in awards)
+        nominations = list(record.get("award_nominations", []))
+        nominations.extend(a for a in result["nominations"] if a not in nominations)
+        record = dict(record, awards=awards, award_nominations=nominations, season=result)
+        projects[index] = record
+        updated.append(index)
+        if _career_store is not None:
+            _career_store.update_project(player, index, record)
+
+    if updated:
+        player._profile_stats = None  # type: ignore[attr-defined]
+        invalidate_projects(player, updated[0])
+    return len(updated)
+
+
+def get_profile_summary(
+    player: 'Player', page: int = 1, page_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """Return a dictionary summarizing the player's completed projects.
+
+    The summary includes overall statistics and simplified information about
+    each project for display on a public profile page: all of them by
+    default, or one page of ``page_size`` entries. Statistics come from
+    running aggregates, so only the project list grows with the career.
+    """
+    stats = _profile_stats(player)
+    total_projects = stats.count
+
+    if page_size is None:
+        page_size = max(1, total_projects)
+    page_size = max(1, page_size)
+    total_pages = max(1, -(-total_projects // page_size))
+    page = min(max(1, page), total_pages)
+    start = (page - 1) * page_size
+
+    if stats.has_box_office:
+        highest_grossing = stats.best_box_office_project
+    elif stats.has_viewership:
+        highest_grossing = stats.best_viewership_project
+    else:
+        # Every amount is zero, so the first project wins the tie.
+        highest_grossing = stats.best_box_office_project
 
     summary: Dict[str, Any] = {
         "total_projects": total_projects,
-        "average_critics_score": avg_critics,
-        "average_fan_score": avg_fans,
-        "awards_won": sorted(awards),
+        "average_critics_score": stats.total_critics / total_projects if total_projects else 0.0,
+        "average_fan_score": stats.total_fans / total_projects if total_projects else 0.0,
+        "awards_won": sorted(stats.awards),
         "highest_grossing_project": highest_grossing,
-        "projects": summaries,
+        "projects": stats.summaries[start:start + page_size],
+        "page": page,
+        "page_size": page_size,
+        "total_pages": total_pages,
     }
 
-    if use_box_office:
-        summary["total_box_office"] = total_box_office
-    elif use_viewership:
-        summary["total_viewership"] = total_viewership
+    if stats.has_box_office:
+        summary["total_box_office"] = stats.total_box_office
+    elif stats.has_viewership:
+        summary["total_viewership"] = stats.total_viewership
     else:
         summary["total_box_office"] = 0.0
 
@@ -8,7 +8,7 @@ be reused across any interface or front end for the game.
 from __future__ import annotations
 
 import random
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from .constants import AWARDS
 
@@ -23,7 +23,12 @@ def _clamp(value: int, min_value: int = 0, max_value: int = 100) -> int:
     return max(min_value, min(max_value, value))
 
 
-def evaluate_awards(project: Dict[str, Any], critics_score: int, fan_score: int) -> List[str]:
+def evaluate_awards(
+    project: Dict[str, Any],
+    critics_score: int,
+    fan_score: int,
+    rng: Optional[random.Random] = None,
+) -> List[str]:
     """Return a list of awards won by the project.
 
     Parameters
@@ -34,6 +39,9 @@ def evaluate_awards(project: Dict[str, Any], critics_score: int, fan_score: int)
         Final critic score for the project.
     fan_score:
         Final audience score for the project.
+    rng:
+        Random stream to draw from; defaults to the global :mod:`random`
+        module.
 
     Returns
     -------
@@ -41,6 +49,7 @@ def evaluate_awards(project: Dict[str, Any], critics_score: int, fan_score: int)
         A list of award names that the project wins.
     """
 
+    rng = rng or random
     awards: List[str] = []
 
     # Basic threshold based on critics score.
@@ -54,7 +63,7 @@ def evaluate_awards(project: Dict[str, Any], critics_score: int, fan_score: int)
             awards.append("Best Director")
 
     # Small chance for acting awards if the fan response was also high
-    if fan_score > 80 and random.random() < 0.3:
+    if fan_score > 80 and rng.random() < 0.3:
         awards.extend(["Best Actor", "Best Actress"])
 
     # Filter awards so they only contain valid entries from constants.py and
@@ -67,7 +76,12 @@ def evaluate_awards(project: Dict[str, Any], critics_score: int, fan_score: int)
     return unique_awards
 
 
-def evaluate_release(project: Dict[str, Any], quality_score: int, cast: List[Talent]) -> Dict[str, Any]:
+def evaluate_release(
+    project: Dict[str, Any],
+    quality_score: int,
+    cast: List[Talent],
+    rng: Optional[random.Random] = None,
+) -> Dict[str, Any]:
     """Evaluate the final release of a project.
 
     This function simulates how critics and audiences react to the finished
@@ -85,6 +99,9 @@ def evaluate_release(project: Dict[str, Any], quality_score: int, cast: List[Tal
     cast:
         List of cast members. Each member may optionally define a
         ``star_power`` attribute which influences box office.
+    rng:
+        Random stream to draw from; defaults to the global :mod:`random`
+        module.
 
     Returns
     -------
@@ -94,14 +111,16 @@ def evaluate_release(project: Dict[str, Any], quality_score: int, cast: List[Tal
         ``awards``, ``profit`` and ``award_nominations``.
     """
 
+    rng = rng or random
+
     # Critics score is heavily influenced by the quality score with a small
     # random variance.
-    critics_variance = random.randint(-5, 5)
+    critics_variance = rng.randint(-5, 5)
     critics_score = _clamp(quality_score + critics_variance)
 
     # Fans can react differently. Start from the critics score and add a larger
     # random swing to represent broader audience taste.
-    fan_variance = random.randint(-15, 15)
+    fan_variance = rng.randint(-15, 15)
     fan_score = _clamp(critics_score + fan_variance)
 
     # Determine overall star power of the cast. Default to 50 if no attribute is
@@ -115,7 +134,7 @@ def evaluate_release(project: Dict[str, Any], quality_score: int, cast: List[Tal
     # Box office or viewership is loosely based on audience score and the star
     # power of the cast, then modified randomly.
     performance_factor = (fan_score / 100) * (average_star_power / 50)
-    randomness = random.uniform(0.8, 1.2)
+    randomness = rng.uniform(0.8, 1.2)
 
     is_tv = project.get("medium") == "tv" or project.get("type") == "tv"
 
@@ -135,14 +154,14 @@ def evaluate_release(project: Dict[str, Any], quality_score: int, cast: List[Tal
         profit = box_office - budget
 
     # Determine award wins and nominations.
-    awards = evaluate_awards(project, critics_score, fan_score)
+    awards = evaluate_awards(project, critics_score, fan_score, rng)
 
     # Nominations occur at a slightly lower threshold than wins.
     award_nominations = []
     if critics_score > 75:
         nomination_pool = [a for a in AWARDS if a not in awards]
-        num_noms = min(len(nomination_pool), random.randint(1, 3))
-        award_nominations.extend(random.sample(nomination_pool, num_noms))
+        num_noms = min(len(nomination_pool), rng.randint(1, 3))
+        award_nominations.extend(rng.sample(nomination_pool, num_noms))
 
     result = {
         "critics_score": critics_score,
@@ -158,3 +177,13 @@ def evaluate_release(project: Dict[str, Any], quality_score: int, cast: List[Tal
         result["box_office"] = box_office
 
     return result
+
+
+def reputation_change(results: Dict[str, Any]) -> int:
+    """Return how much a release moves the player's 0-100 reputation.
+
+    Reviews and audience scores above 50 raise it and scores below lower it,
+    by up to 5 points, and each award won adds 2.
+    """
+    reception = (results.get("critics_score", 50) + results.get("fan_score", 50)) / 2
+    return round((reception - 50) / 10) + 2 * len(results.get("awards") or ())
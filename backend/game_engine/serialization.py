@@ -0,0 +1,88 @@
+"""JSON encoding for API payloads.
+
+:func:`dumps` encodes to UTF-8 bytes with :mod:`orjson` when it is installed
+and falls back to the standard library otherwise (``BACKEND`` names the one
+in use). Game objects are encoded by per-type hooks that read their fields
+directly instead of deep-copying them the way :func:`dataclasses.asdict`
+does.
+
+Completed-project records never change once released, so
+:func:`encode_player` keeps each record's encoded bytes on the player and
+only encodes records added since the last call. Code that edits a stored
+record must call :func:`invalidate_projects` afterwards.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import fields, is_dataclass
+from typing import Any, Dict, List, Optional
+
+from .player import Player
+from .talent_pool import TalentView
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+# Player fields kept out of responses: ``player_id`` is server-side identity,
+# and leaving it out also keeps seeded games' responses identical between runs.
+SERVER_ONLY_FIELDS = ("player_id",)
+_PLAYER_FIELDS = tuple(
+    f.name for f in fields(Player) if f.name != "past_projects" and f.name not in SERVER_ONLY_FIELDS
+)
+
+
+def _default(obj: Any) -> Any:
+    """Encode types the JSON backend does not handle natively."""
+    if isinstance(obj, TalentView):
+        return obj.to_dict()
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return {f.name: getattr(obj, f.name) for f in fields(obj)}
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS
+
+    def dumps(obj: Any) -> bytes:
+        """Encode ``obj`` as compact JSON bytes."""
+        return orjson.dumps(obj, default=_default, option=_OPTIONS)
+
+else:
+    _encoder = json.JSONEncoder(default=_default, separators=(",", ":"))
+
+    def dumps(obj: Any) -> bytes:
+        """Encode ``obj`` as compact JSON bytes."""
+        return _encoder.encode(obj).encode()
+
+
+def encoded_projects(player: Player) -> List[bytes]:
+    """Return the encoded ``past_projects`` records, encoding only new ones."""
+    projects = player.past_projects
+    cache: Optional[List[bytes]] = getattr(player, "_encoded_projects", None)
+    if cache is None or len(cache) > len(projects):
+        cache = []
+        player._encoded_projects = cache  # type: ignore[attr-defined]
+    if len(cache) < len(projects):
+        cache.extend(dumps(p) for p in projects[len(cache):])
+    return cache
+
+
+def invalidate_projects(player: Player, start: int = 0) -> None:
+    """Forget cached encodings of ``past_projects[start:]`` after editing them."""
+    cache: Optional[List[bytes]] = getattr(player, "_encoded_projects", None)
+    if cache is not None:
+        del cache[start:]
+
+
+def encode_player(player: Player, **extra: Any) -> bytes:
+    """Encode ``player`` plus ``extra`` top-level keys, as ``asdict`` would."""
+    head: Dict[str, Any] = {name: getattr(player, name) for name in _PLAYER_FIELDS}
+    head.update(extra)
+    projects = b",".join(encoded_projects(player))
+    return dumps(head)[:-1] + b',"past_projects":[' + projects + b"]}"
@@ -0,0 +1,259 @@
+"""Headless career simulator for balance tuning.
+
+Runs the full game loop (offers, casting, production, release and profile
+update) without Flask. Careers are independent, so
+:func:`simulate_careers` splits them across a
+:class:`~concurrent.futures.ProcessPoolExecutor` and merges the results.
+Every career draws from its own :class:`~game_engine.rng.GameRNG` derived
+from the root seed and the career number, so the output is identical no
+matter how many workers run it.
+
+Run from ``backend/``::
+
+    python -m game_engine.simulation --players 1000 --projects 50 --seed 1 \\
+        --output careers.npz
+"""
+from __future__ import annotations
+
+import os
+import random
+import sys
+import time
+from array import array
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+from .cast_solver import solve_cast
+from .casting import generate_talent_pool
+from .offers import generate_offer_list
+from .player import Player
+from .production import simulate_production
+from .profile import add_completed_project
+from .release import evaluate_release, reputation_change
+from .rng import GameRNG
+
+# A policy picks the offer and the cast: ``policy(offers, pools_for, rng)``
+# returns ``(offer, cast)`` where ``pools_for(offer)`` generates the talent
+# pools for the offer's roles.
+Policy = Callable[[List[Dict[str, Any]], Callable, random.Random], tuple]
+
+# Columns written per simulated release, with their array typecodes.
+COLUMNS = {
+    "career": "l",
+    "project": "l",
+    "medium": "b",
+    "quality": "l",
+    "critics_score": "b",
+    "fan_score": "b",
+    "gross": "q",
+    "profit": "q",
+    "awards": "b",
+    "nominations": "b",
+}
+MEDIUMS = ("film", "tv", "commercial")
+
+
+def random_policy(offers, pools_for, rng):
+    """Pick a random offer and a random talent for every role."""
+    offer = rng.choice(offers)
+    pools = pools_for(offer)
+    return offer, [rng.choice(pool) for pool in pools.values()]
+
+
+def greedy_policy(offers, pools_for, rng):
+    """Take the first offer and the most skilled talent for every role."""
+    offer = offers[0]
+    pools = pools_for(offer)
+    return offer, [max(pool, key=lambda t: t.skill) for pool in pools.values()]
+
+
+def solver_policy(offers, pools_for, rng):
+    """Take the first offer and the quality-optimal cast within its budget."""
+    offer = offers[0]
+    pools = pools_for(offer)
+    solved = solve_cast(pools, offer["budget"], "quality", time_budget=0.05)
+    cast = list(solved["selections"].values()) if solved["selections"] else []
+    return offer, cast
+
+
+POLICIES: Dict[str, Policy] = {
+    "random": random_policy,
+    "greedy": greedy_policy,
+    "solver": solver_policy,
+}
+
+
+def simulate_career(
+    career: int, n_projects: int, policy: Policy, seed: int
+) -> Dict[str, List[int]]:
+    """Play ``n_projects`` releases for one player.
+
+    Returns one list per entry of :data:`COLUMNS`, one value per release.
+    """
+    rng = GameRNG(seed).child(str(career))
+    player = Player(f"Director {career}")
+    rows: Dict[str, List[int]] = {name: [] for name in COLUMNS}
+
+    def pools_for(offer):
+        return {role: generate_talent_pool(role, rng=rng.talent) for role in offer["roles"]}
+
+    for project in range(n_projects):
+        offers = generate_offer_list(rng.offers)
+        offer, cast = policy(offers, pools_for, rng.stream("policy"))
+        production = simulate_production(offer, cast, rng.production)
+        quality = production["final_quality_score"]
+        released = evaluate_release(offer, quality, cast, rng.release)
+        completed = dict(offer)
+        completed.update(released)
+        player.adjust_reputation(reputation_change(released))
+        add_completed_project(player, completed)
+
+        gross = released.get("box_office", released.get("viewership", 0))
+        rows["career"].append(career)
+        rows["project"].append(project)
+        rows["medium"].append(MEDIUMS.index(offer["medium"]))
+        rows["quality"].append(quality)
+        rows["critics_score"].append(released["critics_score"])
+        rows["fan_score"].append(released["fan_score"])
+        rows["gross"].append(gross)
+        rows["profit"].append(released["profit"])
+        rows["awards"].append(len(released["awards"]))
+        rows["nominations"].append(len(released["award_nominations"]))
+
+    return rows
+
+
+def _collect(
+    careers: Sequence[int], n_projects: int, policy: Policy, seed: int
+) -> Dict[str, array]:
+    columns = {name: array(code) for name, code in COLUMNS.items()}
+    for career in careers:
+        for name, values in simulate_career(career, n_projects, policy, seed).items():
+            columns[name].extend(values)
+    return columns
+
+
+def _run_chunk(careers: Sequence[int], n_projects: int, policy_name: str, seed: int):
+    """Worker entry point: simulate ``careers`` and return packed columns."""
+    columns = _collect(careers, n_projects, POLICIES[policy_name], seed)
+    return {name: col.tobytes() for name, col in columns.items()}
+
+
+def _aggregate(columns: Dict[str, array]) -> Dict[str, Any]:
+    count = len(columns["career"])
+    if not count:
+        return {"releases": 0}
+
+    def mean(name):
+        return sum(columns[name]) / count
+
+    awarded = sum(1 for a in columns["awards"] if a)
+    return {
+        "releases": count,
+        "mean_quality": mean("quality"),
+        "mean_critics_score": mean("critics_score"),
+        "mean_fan_score": mean("fan_score"),
+        "mean_gross": mean("gross"),
+        "mean_profit": mean("profit"),
+        "profitable_rate": sum(1 for p in columns["profit"] if p > 0) / count,
+        "award_rate": awarded / count,
+        "mean_nominations": mean("nominations"),
+    }
+
+
+def write_columns(path: str, columns: Dict[str, array]) -> None:
+    """Write the merged columns to ``path`` as a compressed NumPy ``.npz``."""
+    import numpy as np
+
+    arrays = {name: np.frombuffer(col, dtype=col.typecode) for name, col in columns.items()}
+    np.savez_compressed(path, **arrays)
+
+
+def simulate_careers(
+    n_players: int,
+    n_projects: int,
+    policy: Union[str, Policy] = "greedy",
+    seed: int = 0,
+    workers: Optional[int] = None,
+    output: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Simulate ``n_players`` independent careers of ``n_projects`` releases.
+
+    Parameters
+    ----------
+    policy:
+        Name of an entry in :data:`POLICIES`, or a callable. Callables run
+        in-process because arbitrary functions cannot always be pickled.
+    seed:
+        Root seed; career ``i`` always uses the same derived streams.
+    workers:
+        Number of worker processes (defaults to the CPU count). ``1`` runs
+        everything in the calling process.
+    output:
+        Optional path to write the per-release columns to.
+
+    Returns
+    -------
+    dict
+        Aggregate statistics, the merged ``columns`` and timing.
+    """
+    started = time.perf_counter()
+    careers = list(range(n_players))
+    workers = workers or os.cpu_count() or 1
+
+    if callable(policy) or workers == 1:
+        if not callable(policy):
+            policy = POLICIES[policy]
+        workers = 1
+        columns = _collect(careers, n_projects, policy, seed)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Contiguous, roughly equal slices keep the merged rows in career
+        # order and give every worker one large task.
+        size = max(1, -(-n_players // workers))
+        slices = [careers[i:i + size] for i in range(0, n_players, size)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = pool.map(
+                _run_chunk,
+                slices,
+                [n_projects] * len(slices),
+                [policy] * len(slices),
+                [seed] * len(slices),
+            )
+            columns = {name: array(code) for name, code in COLUMNS.items()}
+            for chunk in chunks:
+                for name, data in chunk.items():
+                    columns[name].frombytes(data)
+
+    if output:
+        write_columns(output, columns)
+    stats = _aggregate(columns)
+    stats["players"] = n_players
+    stats["projects_per_player"] = n_projects
+    stats["workers"] = workers
+    stats["elapsed"] = time.perf_counter() - started
+    return {"stats": stats, "columns": columns}
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Simulate director careers headlessly.")
+    parser.add_argument("--players", type=int, default=100)
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="greedy")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    result = simulate_careers(
+        args.players, args.projects, args.policy, args.seed, args.workers, args.output
+    )
+    for key, value in result["stats"].items():
+        print(f"{key:>20}: {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
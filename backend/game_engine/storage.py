@@ -0,0 +1,385 @@
+"""Durable storage for player careers.
+
+:class:`CareerStore` keeps every player in a directory holding two files:
+
+``careers.snap``
+    A compacted snapshot: one JSON blob per player (profile fields plus all
+    completed projects) followed by an index of
+    ``player_id -> (name, offset, length)``.
+    The file is memory-mapped and only the index is read on open, so start-up
+    cost does not depend on how many careers are saved. A player's blob is
+    decoded the first time they are loaded.
+
+``careers.log``
+    An append-only log of changes made since the snapshot. Each record is
+    framed as ``[length][crc32][payload]`` so a torn write at the tail is
+    detected on open, replayed up to the last intact record and truncated.
+
+When the log grows past ``compact_bytes`` the snapshot is rewritten with the
+log folded in and the log starts over. Both files carry a generation number;
+a log older than the snapshot was already folded in and is discarded, which
+makes a crash at any point during compaction safe.
+
+Careers are keyed by ``player_id``, like the leaderboards and the awards
+season, so two players who share a name keep separate careers. Loading a
+name resumes the career most recently written under it. Files written
+before careers had ids are keyed by name; they are read with the id
+derived from the name (or the one saved in the profile) and rewritten by
+the next compaction.
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+from dataclasses import fields
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .player import Player, legacy_player_id
+
+SNAPSHOT_FILE = "careers.snap"
+LOG_FILE = "careers.log"
+
+_SNAP_HEADER = struct.Struct("<4sHxxQQQ")  # magic, version, generation, count, index offset
+_SNAP_ENTRY = struct.Struct("<HHQI")  # id length, name length, blob offset, blob length
+_SNAP_ENTRY_V1 = struct.Struct("<HQI")  # name length, blob offset, blob length
+_LOG_HEADER = struct.Struct("<4sHxxQ")  # magic, version, generation
+_FRAME = struct.Struct("<II")  # payload length, crc32
+_SNAP_MAGIC = b"DSCS"
+_LOG_MAGIC = b"DSCL"
+_VERSION = 2
+_READ_VERSIONS = (1, 2)
+
+# Log record kinds (first payload byte).
+_PLAYER = b"P"
+_PROJECT = b"C"
+_UPDATE = b"U"
+
+# Player fields saved in the profile part of a record; projects travel separately.
+_PROFILE_FIELDS = tuple(f.name for f in fields(Player) if f.name != "past_projects")
+
+
+def _profile(player: Player) -> Dict[str, Any]:
+    return {name: getattr(player, name) for name in _PROFILE_FIELDS}
+
+
+def _dumps(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":"), default=str).encode()
+
+
+class _Pending:
+    """Changes to one player recorded in the log since the snapshot."""
+
+    __slots__ = ("name", "profile", "projects", "updates")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.profile: Optional[Dict[str, Any]] = None
+        self.projects: List[Dict[str, Any]] = []
+        # Replaced records by index into the whole career
+        self.updates: Dict[int, Dict[str, Any]] = {}
+
+
+class CareerStore:
+    """Append-only log plus memory-mapped snapshot of every player's career.
+
+    Parameters
+    ----------
+    directory:
+        Where the snapshot and log live; created if missing.
+    compact_bytes:
+        Log size that triggers compaction into a new snapshot.
+    sync:
+        ``fsync`` after every append. Without it a machine crash can lose
+        the last few records, but never corrupts earlier ones.
+    """
+
+    def __init__(self, directory: str, compact_bytes: int = 4 << 20, sync: bool = False) -> None:
+        self.directory = directory
+        self.compact_bytes = compact_bytes
+        self.sync = sync
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._snap_path = os.path.join(directory, SNAPSHOT_FILE)
+        self._log_path = os.path.join(directory, LOG_FILE)
+
+        self._generation = 0
+        self._snap_file = None
+        self._snap_map: Optional[mmap.mmap] = None
+        # player_id -> (offset, length) of the snapshot blob
+        self._index: Dict[str, Tuple[int, int]] = {}
+        self._pending: Dict[str, _Pending] = {}
+        # player_id -> name, and name -> the player_id it resumes
+        self._player_names: Dict[str, str] = {}
+        self._names: Dict[str, str] = {}
+        self.recovered_bytes = 0
+
+        self._open_snapshot()
+        self._log = self._open_log()
+
+    # -- opening and recovery -----------------------------------------
+
+    def _open_snapshot(self) -> None:
+        if not os.path.exists(self._snap_path):
+            return
+        self._snap_file = open(self._snap_path, "rb")
+        if os.fstat(self._snap_file.fileno()).st_size < _SNAP_HEADER.size:
+            raise ValueError(f"{self._snap_path} is truncated")
+        snap = mmap.mmap(self._snap_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, generation, count, pos = _SNAP_HEADER.unpack_from(snap, 0)
+        if magic != _SNAP_MAGIC or version not in _READ_VERSIONS:
+            raise ValueError(f"{self._snap_path} is not a career snapshot")
+        index = {}
+        player_names = {}
+        names = {}
+        for _ in range(count):
+            if version == 1:
+                name_len, offset, length = _SNAP_ENTRY_V1.unpack_from(snap, pos)
+                pos += _SNAP_ENTRY_V1.size
+                name = snap[pos:pos + name_len].decode()
+                # Keyed by name: the id is in the profile, if it was saved.
+                profile = json.loads(snap[offset:offset + length])["profile"]
+                player_id = profile.get("player_id") or legacy_player_id(name)
+            else:
+                id_len, name_len, offset, length = _SNAP_ENTRY.unpack_from(snap, pos)
+                pos += _SNAP_ENTRY.size
+                player_id = snap[pos:pos + id_len].decode()
+                pos += id_len
+                name = snap[pos:pos + name_len].decode()
+            pos += name_len
+            index[player_id] = (offset, length)
+            player_names[player_id] = name
+            names[name] = player_id  # entries resumed by their name come last
+        self._snap_map = snap
+        self._index = index
+        self._player_names = player_names
+        self._names = names
+        self._generation = generation
+
+    def _open_log(self):
+        """Replay the log tail into ``_pending`` and reopen it for appending."""
+        valid = 0
+        try:
+            with open(self._log_path, "rb") as fh:
+                data = fh.read()
+        except FileNotFoundError:
+            data = b""
+        if len(data) >= _LOG_HEADER.size:
+            magic, version, generation = _LOG_HEADER.unpack_from(data, 0)
+            if magic == _LOG_MAGIC and version in _READ_VERSIONS and generation == self._generation:
+                valid = _LOG_HEADER.size
+                for end, payload in self._frames(data, valid):
+                    self._apply(payload)
+                    valid = end
+
+        if not valid:
+            # Missing, unreadable or already folded into the snapshot.
+            self._write_atomic(self._log_path, [_LOG_HEADER.pack(_LOG_MAGIC, _VERSION, self._generation)])
+            self.recovered_bytes = 0
+        elif valid < len(data):
+            # Torn or corrupt tail from a crash: drop it.
+            self.recovered_bytes = len(data) - valid
+            with open(self._log_path, "r+b") as fh:
+                fh.truncate(valid)
+        return open(self._log_path, "ab")
+
+    @staticmethod
+    def _frames(data: bytes, pos: int) -> Iterator[Tuple[int, bytes]]:
+        """Yield ``(end, payload)`` for every intact frame from ``pos``."""
+        while pos + _FRAME.size <= len(data):
+            length, crc = _FRAME.unpack_from(data, pos)
+            start = pos + _FRAME.size
+            payload = data[start:start + length]
+            if len(payload) != length or zlib.crc32(payload) != crc:
+                return
+            pos = start + length
+            yield pos, payload
+
+    def _record_id(self, record: Dict[str, Any]) -> str:
+        player_id = record.get("id")
+        if player_id is None:
+            # Written before careers were keyed by id.
+            name = record["name"]
+            profile = record.get("profile") or {}
+            player_id = profile.get("player_id") or self._names.get(name) or legacy_player_id(name)
+        return player_id
+
+    def _apply(self, payload: bytes) -> None:
+        kind, record = payload[:1], json.loads(payload[1:])
+        name, player_id = record["name"], self._record_id(record)
+        pending = self._pending.get(player_id)
+        if pending is None:
+            pending = self._pending[player_id] = _Pending(name)
+        self._player_names[player_id] = name
+        self._names[name] = player_id
+        if kind == _PLAYER:
+            pending.profile = record["profile"]
+        elif kind == _PROJECT:
+            pending.projects.append(record["project"])
+        elif kind == _UPDATE:
+            pending.updates[record["index"]] = record["project"]
+
+    # -- writing --------------------------------------------------------
+
+    def _append(self, kind: bytes, record: Dict[str, Any]) -> None:
+        payload = kind + _dumps(record)
+        with self._lock:
+            self._log.write(_FRAME.pack(len(payload), zlib.crc32(payload)) + payload)
+            self._log.flush()
+            if self.sync:
+                os.fsync(self._log.fileno())
+            self._apply(payload)
+            if self._log.tell() >= self.compact_bytes:
+                self._compact()
+
+    def save_player(self, player: Player) -> None:
+        """Record the player's profile fields (reputation, traits, ...)."""
+        self._append(_PLAYER, {"id": player.player_id, "name": player.name, "profile": _profile(player)})
+
+    def record_project(self, player: Player, project: Dict[str, Any]) -> None:
+        """Append one completed project to the player's saved career."""
+        if player.player_id not in self._index and player.player_id not in self._pending:
+            self.save_player(player)
+        self._append(_PROJECT, {"id": player.player_id, "name": player.name, "project": project})
+
+    def update_project(self, player: Player, index: int, project: Dict[str, Any]) -> None:
+        """Replace the saved ``past_projects[index]`` record of the player."""
+        self._append(
+            _UPDATE, {"id": player.player_id, "name": player.name, "index": index, "project": project}
+        )
+
+    # -- reading --------------------------------------------------------
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._names
+
+    def __len__(self) -> int:
+        return len(self._player_names)
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return sorted(self._names)
+
+    def player_ids(self) -> List[str]:
+        with self._lock:
+            return sorted(self._player_names)
+
+    def _snapshot_blob(self, player_id: str) -> Optional[bytes]:
+        entry = self._index.get(player_id)
+        if entry is None or self._snap_map is None:
+            return None
+        offset, length = entry
+        return self._snap_map[offset:offset + length]
+
+    def _merged(self, player_id: str) -> Optional[Dict[str, Any]]:
+        blob = self._snapshot_blob(player_id)
+        pending = self._pending.get(player_id)
+        if blob is None and pending is None:
+            return None
+        if blob is not None:
+            career = json.loads(blob)
+        else:
+            career = {"profile": {"name": pending.name, "player_id": player_id}, "projects": []}
+        if pending is not None:
+            if pending.profile is not None:
+                career["profile"] = pending.profile
+            career["projects"].extend(pending.projects)
+            projects = career["projects"]
+            for index, project in pending.updates.items():
+                if 0 <= index < len(projects):
+                    projects[index] = project
+        return career
+
+    def load_player(self, name: str) -> Optional[Player]:
+        """Return the career most recently saved as ``name``, or ``None``."""
+        with self._lock:
+            player_id = self._names.get(name)
+            career = self._merged(player_id) if player_id is not None else None
+        return self._player(player_id, career)
+
+    def load_player_by_id(self, player_id: str) -> Optional[Player]:
+        """Return the saved career of ``player_id``, or ``None``."""
+        with self._lock:
+            career = self._merged(player_id)
+        return self._player(player_id, career)
+
+    @staticmethod
+    def _player(player_id: Optional[str], career: Optional[Dict[str, Any]]) -> Optional[Player]:
+        if career is None:
+            return None
+        known = {k: v for k, v in career["profile"].items() if k in _PROFILE_FIELDS}
+        known["player_id"] = player_id
+        player = Player(**known)
+        player.past_projects = career["projects"]
+        return player
+
+    # -- compaction -----------------------------------------------------
+
+    def compact(self) -> None:
+        """Fold the log into a fresh snapshot and start an empty log."""
+        with self._lock:
+            self._compact()
+
+    def _compact(self) -> None:
+        generation = self._generation + 1
+        names = self._player_names
+        # The career each name resumes goes last, so reopening maps it back.
+        player_ids = sorted(names, key=lambda pid: (self._names[names[pid]] == pid, pid))
+        chunks: List[bytes] = [b""]  # header placeholder
+        entries = []
+        offset = _SNAP_HEADER.size
+        for player_id in player_ids:
+            if player_id in self._pending:
+                blob = _dumps(self._merged(player_id))
+            else:
+                blob = self._snapshot_blob(player_id)  # untouched: copy bytes as-is
+            chunks.append(blob)
+            entries.append((player_id, offset, len(blob)))
+            offset += len(blob)
+        index = []
+        for player_id, blob_offset, length in entries:
+            encoded_id, encoded_name = player_id.encode(), names[player_id].encode()
+            index.append(
+                _SNAP_ENTRY.pack(len(encoded_id), len(encoded_name), blob_offset, length)
+                + encoded_id + encoded_name
+            )
+        chunks[0] = _SNAP_HEADER.pack(_SNAP_MAGIC, _VERSION, generation, len(player_ids), offset)
+        chunks.extend(index)
+
+        # The snapshot replaces the old one before the log is reset; if we
+        # crash in between, the stale log's older generation is ignored.
+        self._close_snapshot()
+        self._write_atomic(self._snap_path, chunks)
+        self._log.close()
+        self._write_atomic(self._log_path, [_LOG_HEADER.pack(_LOG_MAGIC, _VERSION, generation)])
+        self._pending = {}
+        self._open_snapshot()
+        self._log = open(self._log_path, "ab")
+
+    def _write_atomic(self, path: str, chunks: List[bytes]) -> None:
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as fh:
+            for chunk in chunks:
+                fh.write(chunk)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+
+    def _close_snapshot(self) -> None:
+        if self._snap_map is not None:
+            self._snap_map.close()
+            self._snap_map = None
+        if self._snap_file is not None:
+            self._snap_file.close()
+            self._snap_file = None
+
+    def log_size(self) -> int:
+        return self._log.tell()
+
+    def close(self) -> None:
+        with self._lock:
+            self._log.close()
+            self._close_snapshot()
@@ -0,0 +1,186 @@
+"""Search index over generated talent pools.
+
+:class:`TalentIndex` is built once from the output of
+:func:`~game_engine.casting.generate_talent_pool` (or a
+:class:`~game_engine.talent_pool.TalentPool`) and answers lookups and
+filtered, paginated searches without scanning the whole pool:
+
+* ``id`` lookups go through a hash map;
+* ``skill``, ``star_power`` and ``cost`` ranges are resolved by binary
+  search over per-field sorted orders, so only talents inside the narrowest
+  requested range are examined;
+* availability and willingness are kept as bitmaps, which give the match
+  count of purely boolean queries with a single popcount.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from heapq import merge
+from itertools import islice
+from math import inf
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+SORTABLE_FIELDS = ("skill", "star_power", "cost")
+
+
+def _bitmap(flags: Sequence[int]) -> int:
+    """Pack 0/1 flags into an integer bitmap (bit ``i`` = position ``i``)."""
+    packed = bytearray((len(flags) + 7) // 8)
+    for i, flag in enumerate(flags):
+        if flag:
+            packed[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(packed, "little")
+
+
+class TalentIndex:
+    """Immutable search index over a sequence of talent objects."""
+
+    def __init__(self, talents: Iterable[Any]) -> None:
+        self.talents: List[Any] = list(talents)
+        self._by_id: Dict[int, int] = {t.id: i for i, t in enumerate(self.talents)}
+        self._values: Dict[str, List[int]] = {
+            field: [getattr(t, field) for t in self.talents] for field in SORTABLE_FIELDS
+        }
+        # Per field: positions ordered by value (ascending and descending,
+        # ties in pool order both ways), and the values in ascending order
+        # for bisecting.
+        self._order: Dict[str, List[int]] = {}
+        self._order_desc: Dict[str, List[int]] = {}
+        self._sorted: Dict[str, List[int]] = {}
+        for field, values in self._values.items():
+            order = sorted(range(len(values)), key=values.__getitem__)
+            self._order[field] = order
+            self._order_desc[field] = sorted(range(len(values)), key=values.__getitem__, reverse=True)
+            self._sorted[field] = [values[i] for i in order]
+        self._available = [1 if t.availability else 0 for t in self.talents]
+        self._willing = [1 if t.wants_to_work_with_player else 0 for t in self.talents]
+        self._available_bits = _bitmap(self._available)
+        self._willing_bits = _bitmap(self._willing)
+
+    def __len__(self) -> int:
+        return len(self.talents)
+
+    def get(self, talent_id: int) -> Optional[Any]:
+        """Return the talent with ``talent_id`` or ``None``."""
+        i = self._by_id.get(talent_id)
+        return None if i is None else self.talents[i]
+
+    def _range(self, field: str, low: Optional[float], high: Optional[float]) -> Tuple[int, int]:
+        values = self._sorted[field]
+        lo = 0 if low is None else bisect_left(values, low)
+        hi = len(values) if high is None else bisect_right(values, high)
+        return lo, max(lo, hi)
+
+    def _flag_mask(self, available: Optional[bool], willing: Optional[bool]) -> int:
+        everyone = (1 << len(self.talents)) - 1
+        mask = everyone
+        if available is not None:
+            mask &= self._available_bits if available else everyone ^ self._available_bits
+        if willing is not None:
+            mask &= self._willing_bits if willing else everyone ^ self._willing_bits
+        return mask
+
+    def search(
+        self,
+        ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+        available: Optional[bool] = None,
+        willing: Optional[bool] = None,
+        sort: str = "skill",
+        descending: bool = True,
+        offset: int = 0,
+        limit: int = 20,
+    ) -> Tuple[int, List[Any]]:
+        """Return ``(total_matches, page)`` for a filtered search.
+
+        Parameters
+        ----------
+        ranges:
+            Mapping of ``skill``/``star_power``/``cost`` to inclusive
+            ``(low, high)`` bounds; either bound may be ``None``.
+        available, willing:
+            Required flag values, or ``None`` to ignore the flag.
+        sort, descending:
+            Field and direction used to order the results. Talents with
+            equal values keep their pool order in either direction.
+        offset, limit:
+            Page window into the ordered matches.
+        """
+        if sort not in SORTABLE_FIELDS:
+            raise ValueError(f"cannot sort by {sort!r}")
+        requested = {
+            field: (low, high)
+            for field, (low, high) in (ranges or {}).items()
+            if low is not None or high is not None
+        }
+        unknown = set(requested) - set(SORTABLE_FIELDS)
+        if unknown:
+            raise ValueError(f"cannot filter by {sorted(unknown)}")
+        bounds = {field: self._range(field, *limits) for field, limits in requested.items()}
+
+        def flags_ok(i: int) -> bool:
+            return (available is None or self._available[i] == available) and (
+                willing is None or self._willing[i] == willing
+            )
+
+        if not bounds:
+            # Walk the requested sort order, touching only the rows needed
+            # to fill the page; the total comes from the bitmaps.
+            order = self._order_desc[sort] if descending else self._order[sort]
+            walk = iter(order)
+            if available is None and willing is None:
+                total = len(order)
+                page = [self.talents[i] for i in islice(walk, offset, offset + limit)]
+                return total, page
+            total = self._flag_mask(available, willing).bit_count()
+            page = []
+            skipped = 0
+            for i in walk:
+                if not flags_ok(i):
+                    continue
+                if skipped < offset:
+                    skipped += 1
+                    continue
+                page.append(self.talents[i])
+                if len(page) >= limit:
+                    break
+            return total, page
+
+        # Drive the scan from the narrowest range and check the rest per row.
+        driver = min(bounds, key=lambda f: bounds[f][1] - bounds[f][0])
+        lo, hi = bounds[driver]
+        others = [
+            (self._values[f], -inf if low is None else low, inf if high is None else high)
+            for f, (low, high) in requested.items()
+            if f != driver
+        ]
+        matches = [
+            i
+            for i in self._order[driver][lo:hi]
+            if flags_ok(i) and all(low <= values[i] <= high for values, low, high in others)
+        ]
+
+        values = self._values[sort]
+        matches.sort()  # pool order, which the stable sort keeps for ties
+        matches.sort(key=values.__getitem__, reverse=descending)
+        return len(matches), [self.talents[i] for i in matches[offset:offset + limit]]
+
+
+def search_many(
+    indexes: Sequence[TalentIndex],
+    sort: str = "skill",
+    descending: bool = True,
+    offset: int = 0,
+    limit: int = 20,
+    **filters: Any,
+) -> Tuple[int, List[Any]]:
+    """Search several indexes (e.g. one per role) as if they were one."""
+    total = 0
+    pages = []
+    for index in indexes:
+        count, page = index.search(
+            sort=sort, descending=descending, offset=0, limit=offset + limit, **filters
+        )
+        total += count
+        pages.append(page)
+    merged = merge(*pages, key=lambda t: getattr(t, sort), reverse=descending)
+    return total, list(merged)[offset:offset + limit]
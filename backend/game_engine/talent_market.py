@@ -0,0 +1,316 @@
+"""Persistent world market of talent shared by every game.
+
+:class:`TalentMarket` holds one :class:`~game_engine.talent_pool.TalentPool`
+of named talents (100k by default) that outlives any single project. A
+player's talent pool is a snapshot of a few market rows, drawn through an
+index of rows by role and star tier, so a draw costs O(pool size) whatever
+the size of the market. Better-known players see more of the upper tiers.
+
+What a talent thinks of a player is personal: working relationships are
+stored sparsely on :attr:`Player.relationships` (talent id -> -1..1) and,
+together with :attr:`Player.reputation`, decide whether each drawn talent
+wants to work with the player.
+
+The market evolves as projects are released (:meth:`TalentMarket.record_release`):
+the cast gains skill, their star power follows the reviews and awards, their
+fee follows both, and they are busy for the next :data:`BUSY_RELEASES`
+releases. A small random sample
+of other talents drifts after each release too (skill, star power and
+availability), so the world changes without any release touching every row.
+
+Market ids start at :data:`ID_BASE` so they never collide with the 1-based
+ids of pools generated by :meth:`TalentPool.generate`.
+"""
+from __future__ import annotations
+
+import heapq
+import random
+import threading
+from array import array
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+from .casting import talent_cost, willingness_chance
+from .constants import ROLES
+from .talent_pool import TalentPool
+
+if TYPE_CHECKING:
+    from .player import Player
+
+DEFAULT_MARKET_SIZE = 100_000
+ID_BASE = 1_000_000
+
+# Star power at which each tier above the first starts.
+TIER_BOUNDS = (40, 70, 90)
+TIERS = len(TIER_BOUNDS) + 1
+
+# Releases a cast member stays unavailable for after a release.
+BUSY_RELEASES = 20
+# Other talents whose careers drift a little after each release.
+DRIFT_SAMPLE = 16
+
+FIRST_NAMES = (
+    "Ada", "Alex", "Amara", "Ben", "Bianca", "Carlos", "Chen", "Dana",
+    "Diego", "Elena", "Emeka", "Farah", "Felix", "Grace", "Hana", "Hugo",
+    "Imani", "Ivan", "Jade", "Jonas", "Kai", "Keiko", "Leo", "Lena",
+    "Marco", "Maya", "Nadia", "Noah", "Olga", "Omar", "Priya", "Quinn",
+    "Rafael", "Rosa", "Sam", "Sofia", "Tariq", "Uma", "Vera", "Yusuf",
+)
+LAST_NAMES = (
+    "Abbott", "Alvarez", "Baker", "Bianchi", "Castillo", "Chen", "Dubois",
+    "Eriksen", "Fischer", "Garcia", "Haddad", "Hughes", "Ibrahim", "Ito",
+    "Jensen", "Kaur", "Kim", "Kowalski", "Larsen", "Lopez", "Mensah",
+    "Moreau", "Nakamura", "Novak", "Okafor", "Olsen", "Patel", "Quinn",
+    "Rossi", "Santos", "Schmidt", "Silva", "Tanaka", "Turner", "Varga",
+    "Walsh", "Weber", "Xu", "Yilmaz", "Zimmer",
+)
+
+
+def star_tier(star_power: int) -> int:
+    """Return the tier (0 = unknown .. ``TIERS - 1`` = star) of ``star_power``."""
+    tier = 0
+    while tier < len(TIER_BOUNDS) and star_power >= TIER_BOUNDS[tier]:
+        tier += 1
+    return tier
+
+
+def reputation_share(reputation: int) -> float:
+    """Map a player's 0-100 reputation onto the 0-1 willingness scale.
+
+    A player with reputation 10 (the starting value) gets about the 0.6 the
+    pool generators assume; reputation 100 convinces everyone.
+    """
+    return 0.5 + reputation / 200
+
+
+def _clamp(value: float, low: float, high: float) -> float:
+    return max(low, min(high, value))
+
+
+class TalentMarket:
+    """World registry of talent, indexed by role and star tier.
+
+    An empty market is cheap to create; :meth:`populate` (or :meth:`start`
+    on a background thread) fills it. Until it is ready, :meth:`draw`
+    returns ``None`` and callers fall back to generated pools.
+
+    Parameters
+    ----------
+    rng:
+        Random stream for populating and evolving the market; a fresh
+        unseeded stream by default.
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None) -> None:
+        self.pool = TalentPool()
+        self.releases = 0
+        self.lock = threading.Lock()
+        self._rng = rng or random.Random()
+        # Per role code and tier, the market rows in it, plus each row's
+        # tier and position there for O(1) moves between tiers.
+        self._tiers: List[List[array]] = []
+        self._tier = array("B")
+        self._slot = array("I")
+        # (release count at which the talent is free again, row), and that
+        # release count per row (0 = not busy)
+        self._busy: List[Tuple[int, int]] = []
+        self._free_at = array("I")
+        self._ready = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # -- construction -------------------------------------------------
+
+    def populate(self, size: int = DEFAULT_MARKET_SIZE, roles: Sequence[str] = ROLES) -> None:
+        """Create ``size`` talents spread evenly over ``roles``."""
+        rng = self._rng
+        pool = TalentPool()
+        tiers: List[List[array]] = [[array("I") for _ in range(TIERS)] for _ in roles]
+        tier_of = array("B")
+        slot = array("I")
+        for row in range(size):
+            role = roles[row % len(roles)]
+            star_power = rng.randint(0, 100)
+            skill = rng.randint(0, 100)
+            pool.append(
+                ID_BASE + row,
+                f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                role,
+                star_power,
+                skill,
+                talent_cost(star_power, skill),
+                rng.random() < 0.8,
+                0.0,
+                True,
+            )
+            tier = star_tier(star_power)
+            bucket = tiers[row % len(roles)][tier]
+            tier_of.append(tier)
+            slot.append(len(bucket))
+            bucket.append(row)
+        with self.lock:
+            self.pool, self._tiers, self._tier, self._slot = pool, tiers, tier_of, slot
+            self._busy = []
+            self._free_at = array("I", bytes(4 * size))
+        self._ready.set()
+
+    def start(self, size: int = DEFAULT_MARKET_SIZE) -> None:
+        """Populate the market on a background thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self.populate, args=(size,), name="talent-market", daemon=True
+            )
+            self._thread.start()
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def __len__(self) -> int:
+        return len(self.pool)
+
+    # -- drawing pools ------------------------------------------------
+
+    def draw(
+        self,
+        role: str,
+        count: int,
+        rng: random.Random,
+        player: Optional["Player"] = None,
+    ) -> Optional[TalentPool]:
+        """Return a snapshot pool of ``count`` distinct talents for ``role``.
+
+        Each tier is picked with a weight of its size times
+        ``(0.5 + reputation / 100) ** tier``: a player with reputation 50
+        draws uniformly from the role, newcomers see fewer stars.
+        ``working_relationship`` and ``wants_to_work_with_player`` are filled
+        in for ``player``. Returns ``None`` if the market is not ready or has
+        no talent for ``role``.
+        """
+        if not self.ready:
+            return None
+        reputation = player.reputation if player is not None else 0
+        relationships: Dict[str, float] = player.relationships if player is not None else {}
+        bias = 0.5 + reputation / 100
+        share = reputation_share(reputation)
+        drawn = TalentPool()
+        with self.lock:
+            code = self.pool.role_code(role)
+            if code is None:
+                return None
+            buckets = self._tiers[code]
+            available = sum(len(b) for b in buckets)
+            count = min(count, available)
+            if 2 * count > available:
+                # Large draws: sample the role directly instead of rejecting.
+                rows = rng.sample([row for bucket in buckets for row in bucket], count)
+            else:
+                weights = [len(bucket) * bias ** tier for tier, bucket in enumerate(buckets)]
+                tier_choices = range(TIERS)
+                seen = set()
+                rows = []
+                while len(rows) < count:
+                    bucket = buckets[rng.choices(tier_choices, weights)[0]]
+                    row = bucket[rng.randrange(len(bucket))]
+                    if row not in seen:
+                        seen.add(row)
+                        rows.append(row)
+            world = self.pool
+            for row in rows:
+                talent_id = world.ids[row]
+                relationship = relationships.get(str(talent_id), 0.0)
+                drawn.append(
+                    talent_id,
+                    world.name(row),
+                    role,
+                    world.star_power[row],
+                    world.skill[row],
+                    world.cost[row],
+                    bool(world.availability[row]),
+                    relationship,
+                    rng.random() < willingness_chance(relationship, share),
+                )
+        return drawn
+
+    # -- evolution ----------------------------------------------------
+
+    def _row(self, talent_id: int) -> Optional[int]:
+        row = talent_id - ID_BASE
+        return row if 0 <= row < len(self.pool) else None
+
+    def _set_star_power(self, row: int, star_power: int) -> None:
+        """Update star power and cost, moving the row if its tier changes."""
+        pool = self.pool
+        pool.star_power[row] = star_power
+        pool.cost[row] = talent_cost(star_power, pool.skill[row])
+        tier = star_tier(star_power)
+        old = self._tier[row]
+        if tier == old:
+            return
+        buckets = self._tiers[pool.role_codes[row]]
+        # Swap-remove from the old tier, append to the new one.
+        bucket = buckets[old]
+        slot = self._slot[row]
+        last = bucket.pop()
+        if last != row:
+            bucket[slot] = last
+            self._slot[last] = slot
+        bucket = buckets[tier]
+        self._slot[row] = len(bucket)
+        bucket.append(row)
+        self._tier[row] = tier
+
+    def record_relationships(self, player: "Player", cast: Sequence[Any], results: Dict[str, Any]) -> None:
+        """Update the player's working relationship with each market cast member.
+
+        Only the player's own state changes, so this belongs with the rest of
+        the release in the player's session; :meth:`record_release` updates
+        the shared market.
+        """
+        critics = results.get("critics_score", 50) or 0
+        for member in cast:
+            if self._row(member.id) is None:
+                continue
+            key = str(member.id)
+            player.relationships[key] = round(
+                _clamp(player.relationships.get(key, 0.0) + (critics - 50) / 250, -1.0, 1.0), 4
+            )
+
+    def record_release(self, cast: Sequence[Any], results: Dict[str, Any]) -> None:
+        """Let a released project shape its cast's careers.
+
+        Cast members that did not come from this market are ignored.
+        """
+        critics = results.get("critics_score", 50) or 0
+        fans = results.get("fan_score", 50) or 0
+        awards = len(results.get("awards") or ())
+        reception = (critics + fans) / 2 - 50
+        with self.lock:
+            self.releases += 1
+            pool = self.pool
+            while self._busy and self._busy[0][0] <= self.releases:
+                row = heapq.heappop(self._busy)[1]
+                pool.availability[row] = 1
+                self._free_at[row] = 0
+            for member in cast:
+                row = self._row(member.id)
+                if row is None:
+                    continue
+                pool.skill[row] = min(100, pool.skill[row] + 1 + (critics >= 70))
+                self._set_star_power(
+                    row, int(_clamp(pool.star_power[row] + reception / 10 + 3 * awards, 0, 100))
+                )
+                if not self._free_at[row]:
+                    pool.availability[row] = 0
+                    self._free_at[row] = self.releases + BUSY_RELEASES
+                    heapq.heappush(self._busy, (self._free_at[row], row))
+            rng = self._rng
+            for _ in range(min(DRIFT_SAMPLE, len(pool))):
+                row = rng.randrange(len(pool))
+                pool.skill[row] = int(_clamp(pool.skill[row] + rng.randint(-1, 1), 0, 100))
+                self._set_star_power(row, int(_clamp(pool.star_power[row] + rng.randint(-2, 2), 0, 100)))
+                if not self._free_at[row]:
+                    pool.availability[row] = rng.random() < 0.8
+
+    def stats(self) -> Dict[str, int]:
+        """Return market size, releases seen and talents currently busy."""
+        with self.lock:
+            return {"talents": len(self.pool), "releases": self.releases, "busy": len(self._busy)}
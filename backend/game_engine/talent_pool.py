@@ -0,0 +1,333 @@
+"""Columnar storage for large talent markets.
+
+:class:`TalentPool` keeps each :class:`~game_engine.casting.Talent` field in
+its own typed :mod:`array` instead of one Python object per talent, so
+hundreds of thousands of talents fit in a few megabytes. Individual talents
+are exposed through :class:`TalentView`, a slotted proxy with the same
+attributes and ``to_dict`` as ``Talent`` that the engine functions accept
+interchangeably. Whole pools serialize to JSON straight from the columns.
+"""
+from __future__ import annotations
+
+import json
+import random
+import sys
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from .casting import Talent, talent_cost, willingness_chance
+
+
+class TalentView:
+    """Lightweight handle on one row of a :class:`TalentPool`."""
+
+    __slots__ = ("_pool", "_index")
+
+    def __init__(self, pool: "TalentPool", index: int) -> None:
+        self._pool = pool
+        self._index = index
+
+    @property
+    def id(self) -> int:
+        return self._pool.ids[self._index]
+
+    @property
+    def name(self) -> str:
+        return self._pool.name(self._index)
+
+    @property
+    def role(self) -> str:
+        return self._pool.roles[self._pool.role_codes[self._index]]
+
+    @property
+    def star_power(self) -> int:
+        return self._pool.star_power[self._index]
+
+    @property
+    def skill(self) -> int:
+        return self._pool.skill[self._index]
+
+    @property
+    def cost(self) -> int:
+        return self._pool.cost[self._index]
+
+    @property
+    def availability(self) -> bool:
+        return bool(self._pool.availability[self._index])
+
+    @property
+    def working_relationship(self) -> float:
+        return self._pool.working_relationship[self._index]
+
+    @property
+    def wants_to_work_with_player(self) -> bool:
+        return bool(self._pool.willingness[self._index])
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the same camelCase mapping as :meth:`Talent.to_dict`."""
+        return self._pool.row_dict(self._index)
+
+    def to_talent(self) -> Talent:
+        """Materialise this row as a standalone :class:`Talent`."""
+        return self._pool.to_talent(self._index)
+
+    def __repr__(self) -> str:
+        return f"TalentView(id={self.id!r}, name={self.name!r}, role={self.role!r})"
+
+
+# Typed-array columns written by ``TalentPool.to_buffers``, in order.
+_BUFFER_COLUMNS = (
+    "ids",
+    "star_power",
+    "skill",
+    "cost",
+    "availability",
+    "working_relationship",
+    "willingness",
+    "role_codes",
+    "_name_offsets",
+)
+
+
+class TalentPool:
+    """Typed-array store of talent records.
+
+    Star power and skill are kept as unsigned bytes (the game uses 0-100),
+    cost as unsigned 32-bit integers, the two flags as bytes and the working
+    relationship as a double. Names share one UTF-8 buffer indexed by offset
+    and roles are interned to small integer codes.
+    """
+
+    def __init__(self) -> None:
+        self.ids = array("q")
+        self.star_power = array("B")
+        self.skill = array("B")
+        self.cost = array("I")
+        self.availability = array("b")
+        self.working_relationship = array("d")
+        self.willingness = array("b")
+        self.role_codes = array("B")
+        self.roles: List[str] = []
+        self._role_index: Dict[str, int] = {}
+        self._names = bytearray()
+        self._name_offsets = array("I", [0])
+
+    # -- construction -------------------------------------------------
+
+    def append(
+        self,
+        id: int,
+        name: str,
+        role: str,
+        star_power: int,
+        skill: int,
+        cost: int,
+        availability: bool,
+        working_relationship: float,
+        wants_to_work_with_player: bool,
+    ) -> int:
+        """Add one talent and return its row index."""
+        code = self._role_index.get(role)
+        if code is None:
+            code = self._role_index[role] = len(self.roles)
+            self.roles.append(role)
+        self.ids.append(id)
+        self.star_power.append(star_power)
+        self.skill.append(skill)
+        self.cost.append(cost)
+        self.availability.append(1 if availability else 0)
+        self.working_relationship.append(working_relationship)
+        self.willingness.append(1 if wants_to_work_with_player else 0)
+        self.role_codes.append(code)
+        self._names += name.encode("utf-8")
+        self._name_offsets.append(len(self._names))
+        return len(self.ids) - 1
+
+    @classmethod
+    def from_talents(cls, talents: Iterable[Talent]) -> "TalentPool":
+        """Build a pool from existing :class:`Talent` (or talent-like) objects."""
+        pool = cls()
+        for t in talents:
+            pool.append(
+                t.id,
+                t.name,
+                t.role,
+                t.star_power,
+                t.skill,
+                t.cost,
+                t.availability,
+                t.working_relationship,
+                t.wants_to_work_with_player,
+            )
+        return pool
+
+    @classmethod
+    def generate(
+        cls,
+        role: str,
+        count: int = 5,
+        rng: Optional[random.Random] = None,
+        start_id: int = 1,
+        pool: Optional["TalentPool"] = None,
+    ) -> "TalentPool":
+        """Generate talents straight into columns.
+
+        Draws the same random numbers in the same order as
+        :func:`~game_engine.casting.generate_talent_pool`, and shares its
+        cost and willingness formulas, so a given stream yields identical
+        talents either way. Pass ``pool`` to append to an
+        existing store, for example when building a multi-role market.
+        """
+        rng = rng or random
+        pool = pool if pool is not None else cls()
+        title = role.title()
+        for i in range(count):
+            star_power = rng.randint(0, 100)
+            skill = rng.randint(0, 100)
+            cost = talent_cost(star_power, skill)
+            availability = rng.random() < 0.8
+            working_relationship = rng.uniform(-1.0, 1.0)
+            wants_to_work = rng.random() < willingness_chance(working_relationship)
+            pool.append(
+                start_id + i,
+                f"{title} Talent {i + 1}",
+                role,
+                star_power,
+                skill,
+                cost,
+                availability,
+                working_relationship,
+                wants_to_work,
+            )
+        return pool
+
+    # -- access -------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index: int) -> TalentView:
+        if index < 0:
+            index += len(self.ids)
+        if not 0 <= index < len(self.ids):
+            raise IndexError("talent index out of range")
+        return TalentView(self, index)
+
+    def __iter__(self) -> Iterator[TalentView]:
+        for i in range(len(self.ids)):
+            yield TalentView(self, i)
+
+    def role_code(self, role: str) -> Optional[int]:
+        """Return the interned code of ``role``, or ``None`` if it has no rows."""
+        return self._role_index.get(role)
+
+    def name(self, index: int) -> str:
+        start = self._name_offsets[index]
+        end = self._name_offsets[index + 1]
+        return self._names[start:end].decode("utf-8")
+
+    def to_talent(self, index: int) -> Talent:
+        return Talent(
+            id=self.ids[index],
+            name=self.name(index),
+            role=self.roles[self.role_codes[index]],
+            star_power=self.star_power[index],
+            skill=self.skill[index],
+            cost=self.cost[index],
+            availability=bool(self.availability[index]),
+            working_relationship=self.working_relationship[index],
+            wants_to_work_with_player=bool(self.willingness[index]),
+        )
+
+    def row_dict(self, index: int) -> Dict[str, Any]:
+        """Return row ``index`` in the camelCase layout of ``Talent.to_dict``."""
+        return {
+            "id": self.ids[index],
+            "name": self.name(index),
+            "role": self.roles[self.role_codes[index]],
+            "starPower": self.star_power[index],
+            "skill": self.skill[index],
+            "cost": self.cost[index],
+            "available": bool(self.availability[index]),
+            "workingRelationship": self.working_relationship[index],
+            "wantsToWorkWithPlayer": bool(self.willingness[index]),
+        }
+
+    # -- serialization ------------------------------------------------
+
+    def to_json(self, indices: Optional[Sequence[int]] = None) -> str:
+        """Serialize rows (all by default) to a JSON array string.
+
+        Rows are formatted directly from the columns without building an
+        intermediate dict per talent. The output decodes to the same list as
+        ``[t.to_dict() for t in talents]``.
+        """
+        if indices is None:
+            indices = range(len(self.ids))
+        role_json = [json.dumps(r) for r in self.roles]
+        ids = self.ids
+        star_power = self.star_power
+        skill = self.skill
+        cost = self.cost
+        available = self.availability
+        relationship = self.working_relationship
+        willing = self.willingness
+        role_codes = self.role_codes
+        names = self._names
+        offsets = self._name_offsets
+        flags = ("false", "true")
+        rows = []
+        for i in indices:
+            name = json.dumps(names[offsets[i]:offsets[i + 1]].decode("utf-8"))
+            rows.append(
+                f'{{"id":{ids[i]},"name":{name},"role":{role_json[role_codes[i]]},'
+                f'"starPower":{star_power[i]},"skill":{skill[i]},"cost":{cost[i]},'
+                f'"available":{flags[available[i]]},'
+                f'"workingRelationship":{relationship[i]!r},'
+                f'"wantsToWorkWithPlayer":{flags[willing[i]]}}}'
+            )
+        return "[" + ",".join(rows) + "]"
+
+    def to_buffers(self) -> tuple:
+        """Return the roles and raw column bytes for compact storage."""
+        return (
+            list(self.roles),
+            bytes(self._names),
+            *(getattr(self, name).tobytes() for name in _BUFFER_COLUMNS),
+        )
+
+    @classmethod
+    def from_buffers(cls, buffers: Sequence[Any]) -> "TalentPool":
+        """Rebuild a pool from the output of :meth:`to_buffers`."""
+        roles, names, *columns = buffers
+        pool = cls()
+        pool.roles = list(roles)
+        pool._role_index = {role: i for i, role in enumerate(pool.roles)}
+        pool._names = bytearray(names)
+        pool._name_offsets = array("I")
+        for name, data in zip(_BUFFER_COLUMNS, columns):
+            getattr(pool, name).frombytes(data)
+        return pool
+
+    def memory_usage(self) -> Dict[str, float]:
+        """Return the bytes held by the pool's buffers and the per-talent cost."""
+        columns = (
+            self.ids,
+            self.star_power,
+            self.skill,
+            self.cost,
+            self.availability,
+            self.working_relationship,
+            self.willingness,
+            self.role_codes,
+            self._names,
+            self._name_offsets,
+        )
+        total = sum(sys.getsizeof(c) for c in columns)
+        total += sys.getsizeof(self.roles) + sum(sys.getsizeof(r) for r in self.roles)
+        count = len(self.ids)
+        return {
+            "talents": count,
+            "bytes": total,
+            "bytes_per_talent": total / count if count else 0.0,
+        }
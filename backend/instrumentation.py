@@ -0,0 +1,302 @@
+"""Lightweight metrics and profiling for the game backend.
+
+:data:`METRICS` collects counters, histograms and callback gauges and
+renders them in the Prometheus text exposition format. :func:`init_app`
+wires it into a Flask app: per-route request counts, latency and payload
+size histograms, plus a ``/metrics`` endpoint. Engine functions are timed by
+wrapping them with :meth:`Registry.timed`.
+
+Collection is controlled by the ``DIRECTOR_METRICS`` environment variable
+(on unless set to ``0``). When disabled every hook returns after a single
+attribute check.
+
+Setting ``DIRECTOR_PROFILER=1`` additionally exposes
+``/debug/profiler``: ``POST {"enabled": true}`` starts a sampling profiler
+thread, ``GET`` returns the collected stacks in collapsed ("folded") format
+for flame graph tools.
+"""
+from __future__ import annotations
+
+import functools
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+def _labels(labels: Optional[Dict[str, str]]) -> LabelKey:
+    return tuple(sorted(labels.items())) if labels else ()
+
+
+def _format_labels(key: LabelKey, extra: Iterable[Tuple[str, str]] = ()) -> str:
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (
+        name + '="' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+        for name, value in pairs
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class Registry:
+    """Thread-safe collection of metrics rendered on demand."""
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+        self._buckets: Dict[str, Tuple[float, ...]] = {}
+        self._gauges: Dict[str, Callable[[], Dict[LabelKey, float]]] = {}
+
+    # -- declaration --------------------------------------------------
+
+    def counter(self, name: str, help_text: str) -> None:
+        self._help[name] = ("counter", help_text)
+        self._counters.setdefault(name, {})
+
+    def histogram(self, name: str, help_text: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self._help[name] = ("histogram", help_text)
+        self._histograms.setdefault(name, {})
+        self._buckets[name] = buckets
+
+    def gauge(
+        self, name: str, help_text: str, collect: Callable[[], float], kind: str = "gauge"
+    ) -> None:
+        """Register a metric whose value is read from ``collect()`` at scrape time.
+
+        ``collect`` may also return a mapping of label keys (tuples of
+        ``(name, value)`` pairs) to values for labelled series. Pass
+        ``kind="counter"`` for values that only ever grow.
+        """
+        self._help[name] = (kind, help_text)
+
+        def read() -> Dict[LabelKey, float]:
+            value = collect()
+            return value if isinstance(value, dict) else {(): value}
+
+        self._gauges[name] = read
+
+    # -- recording ----------------------------------------------------
+
+    def inc(self, name: str, labels: Optional[Dict[str, str]] = None, amount: float = 1) -> None:
+        if not self.enabled:
+            return
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters[name]
+            series[key] = series.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, str]] = None) -> None:
+        if not self.enabled:
+            return
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms[name]
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = _Histogram(self._buckets[name])
+            hist.observe(value)
+
+    def timed(self, function_name: str, metric: str = "director_engine_call_seconds"):
+        """Decorator timing each call of the wrapped function into ``metric``."""
+        labels = {"function": function_name}
+
+        def decorate(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.observe(metric, time.perf_counter() - start, labels)
+
+            return wrapper
+
+        return decorate
+
+    # -- exposition ---------------------------------------------------
+
+    def render(self) -> str:
+        """Return every metric in Prometheus text exposition format."""
+        lines: List[str] = []
+        gauges = {name: read() for name, read in self._gauges.items()}
+        with self._lock:
+            for name, (kind, help_text) in sorted(self._help.items()):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                if name in gauges or kind == "counter":
+                    series = gauges[name] if name in gauges else self._counters[name]
+                    for key, value in sorted(series.items()):
+                        lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+                else:
+                    for key, hist in sorted(self._histograms[name].items()):
+                        cumulative = 0
+                        bounds = list(hist.buckets) + [float("inf")]
+                        for bound, count in zip(bounds, hist.counts):
+                            cumulative += count
+                            le = _format_labels(key, [("le", _format_value(float(bound)))])
+                            lines.append(f"{name}_bucket{le} {cumulative}")
+                        lines.append(f"{name}_sum{_format_labels(key)} {_format_value(hist.total)}")
+                        lines.append(f"{name}_count{_format_labels(key)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Registry(enabled=os.environ.get("DIRECTOR_METRICS", "1") != "0")
+METRICS.counter("director_requests_total", "HTTP requests by route, method and status.")
+METRICS.histogram("director_request_seconds", "HTTP request latency by route.")
+METRICS.histogram("director_response_bytes", "Response payload size by route.", BYTES_BUCKETS)
+METRICS.histogram("director_engine_call_seconds", "Game engine call latency by function.")
+
+
+class SamplingProfiler:
+    """Periodically samples every thread's stack into folded-stack counts.
+
+    Sampling runs on a daemon thread and costs nothing while stopped.
+    """
+
+    def __init__(self, interval: float = 0.005, max_depth: int = 64) -> None:
+        self.interval = interval
+        self.max_depth = max_depth
+        self.samples: Counter = Counter()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        with self._lock:
+            if self.running:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+
+    def reset(self) -> None:
+        self.samples = Counter()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < self.max_depth:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                self.samples[";".join(reversed(stack))] += 1
+
+    def folded(self, limit: Optional[int] = None) -> str:
+        """Return samples as ``stack count`` lines, most frequent first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common(limit))
+
+
+PROFILER = SamplingProfiler()
+
+
+def init_app(app, sessions=None) -> None:
+    """Install request instrumentation and the ``/metrics`` endpoint on ``app``."""
+    from flask import g, jsonify, request
+
+    if sessions is not None:
+        METRICS.gauge("director_sessions", "Live game sessions.", lambda: len(sessions))
+        METRICS.gauge(
+            "director_session_events_total",
+            "Session backend lookups, writes and removals by outcome.",
+            lambda: {
+                (("event", name),): value
+                for name, value in sessions.stats().items()
+                if name != "sessions"
+            },
+            kind="counter",
+        )
+
+    @app.before_request
+    def _start_timer():
+        if METRICS.enabled:
+            g.metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        start = g.pop("metrics_start", None)
+        if start is None:
+            return response
+        route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        labels = {"route": route}
+        METRICS.observe("director_request_seconds", time.perf_counter() - start, labels)
+        METRICS.inc(
+            "director_requests_total",
+            {"route": route, "method": request.method, "status": str(response.status_code)},
+        )
+        if not response.is_streamed and response.content_length is not None:
+            METRICS.observe("director_response_bytes", response.content_length, labels)
+        return response
+
+    @app.route("/metrics", methods=["GET"])
+    def metrics():
+        return app.response_class(METRICS.render(), mimetype="text/plain; version=0.0.4")
+
+    if os.environ.get("DIRECTOR_PROFILER") != "1":
+        return
+
+    @app.route("/debug/profiler", methods=["GET", "POST"])
+    def profiler():
+        """Toggle the sampling profiler or download its folded stacks."""
+        if request.method == "POST":
+            data = request.get_json(silent=True) or {}
+            if data.get("reset"):
+                PROFILER.reset()
+            if data.get("enabled"):
+                PROFILER.start()
+            elif "enabled" in data:
+                PROFILER.stop()
+            return jsonify({"running": PROFILER.running, "stacks": len(PROFILER.samples)})
+        limit = request.args.get("limit", type=int)
+        return app.response_class(PROFILER.folded(limit), mimetype="text/plain")
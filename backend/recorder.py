@@ -0,0 +1,206 @@
+"""Opt-in recording of game sessions for replay and capacity tests.
+
+Setting ``DIRECTOR_RECORD`` to a file name makes the app append every game
+request to that file as gzip-compressed JSON lines. ``{pid}`` in the name is
+replaced by the worker's process id, so each worker writes its own log. The
+first line of every log holds :data:`FORMAT`; each further line is one
+request:
+
+``t``
+    Seconds since the recorder started when the request arrived.
+``session``
+    Pseudonym of the session token (a short hash), stable across workers.
+``method``, ``path``, ``query``, ``body``
+    The request; ``body`` is its JSON payload or ``null``.
+``rng``
+    ``{"seed": ..., "seeded": ...}`` of the session's :class:`GameRNG`
+    after the request. Every stream is derived from the seed, so the seed
+    plus the session's requests in order reproduce the generator state at
+    any point without storing Mersenne Twister states.
+``status``, ``ms``, ``bytes``, ``digest``, ``response``
+    The response's status, handling time, size and BLAKE2b digest, and the
+    JSON body itself when it is at most :data:`RESPONSE_LIMIT` bytes.
+
+``python -m benchmarks.replay`` sends recorded sessions back to the app.
+Endpoints without a session (``/metrics``) are not recorded. The ASGI
+production stream is recorded through :func:`request_entry` like a Flask
+request, with the time taken to simulate the production as ``ms`` and no
+body digest.
+"""
+from __future__ import annotations
+
+import atexit
+import gzip
+import hashlib
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional
+
+from game_engine.serialization import dumps
+
+FORMAT = "director-record/1"
+# Largest response body stored in the log; larger ones keep only a digest.
+RESPONSE_LIMIT = 64 * 1024
+# Records between flushes of the compressed stream.
+FLUSH_EVERY = 100
+
+
+def session_id(token: str) -> str:
+    """Return the pseudonym recorded for session ``token``."""
+    return hashlib.blake2b(token.encode(), digest_size=6).hexdigest()
+
+
+def digest(data: bytes) -> str:
+    """Return the digest recorded for a response body."""
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+class SessionRecorder:
+    """Append-only, thread-safe writer of a gzip JSON-lines request log.
+
+    Parameters
+    ----------
+    path:
+        Log file; ``{pid}`` is replaced by the process id. An existing log
+        is appended to as a further gzip member.
+    response_limit:
+        Largest response body stored; 0 stores digests only.
+    """
+
+    def __init__(self, path: str, response_limit: int = RESPONSE_LIMIT) -> None:
+        self.path = path.replace("{pid}", str(os.getpid()))
+        self.response_limit = response_limit
+        self.records = 0
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._file = gzip.open(self.path, "ab")
+        self._write(dumps({"format": FORMAT, "started": time.time(), "pid": os.getpid()}))
+        atexit.register(self.close)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._started
+
+    def _write(self, line: bytes) -> None:
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line + b"\n")
+            self.records += 1
+            if self.records % FLUSH_EVERY == 0:
+                self._file.flush()
+
+    def record(self, entry: Dict[str, Any], response: Optional[bytes] = None) -> None:
+        """Append ``entry``, embedding the JSON ``response`` body if small enough."""
+        line = dumps(entry)
+        if response is not None and len(response) <= self.response_limit:
+            # Raw newlines in JSON can only be whitespace.
+            line = line[:-1] + b',"response":' + response.replace(b"\n", b"") + b"}"
+        self._write(line)
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def read_log(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield the request records of a log written by :class:`SessionRecorder`.
+
+    Each record gains ``at``, its arrival time in seconds since the epoch,
+    so logs of several workers (or appended runs) can be merged.
+    """
+    import json
+
+    started = 0.0
+    with gzip.open(path, "rb") as log:
+        for line in log:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if "format" in entry:
+                if entry["format"] != FORMAT:
+                    raise ValueError(f"{path}: unsupported log format {entry['format']!r}")
+                started = entry["started"]
+                continue
+            entry["at"] = started + entry["t"]
+            yield entry
+
+
+def request_entry(
+    at: float,
+    token: str,
+    method: str,
+    path: str,
+    query: str,
+    body: Any,
+    state: Dict[str, Any],
+    status: int,
+    started: float,
+) -> Dict[str, Any]:
+    """Return the log record of one request, without its response fields.
+
+    ``at`` is the recorder's :meth:`~SessionRecorder.elapsed` time when the
+    request arrived, ``state`` the session state after it and ``started``
+    its ``time.perf_counter()`` start.
+    """
+    rng = state.get("rng")
+    return {
+        "t": round(at, 4),
+        "session": session_id(token),
+        "method": method,
+        "path": path,
+        "query": query,
+        "body": body,
+        "rng": {"seed": rng.seed, "seeded": bool(state.get("seeded"))} if rng is not None else None,
+        "status": status,
+        "ms": round((time.perf_counter() - started) * 1000, 3),
+    }
+
+
+def init_app(app, recorder: SessionRecorder, session_header: str) -> None:
+    """Record every request that has a game session on ``app``.
+
+    Install before the hook that commits sessions, so the recorded status
+    and token are the final ones (Flask runs ``after_request`` hooks in
+    reverse order of registration).
+    """
+    from flask import g, request
+
+    @app.before_request
+    def _start_record():
+        g.record_start = time.perf_counter()
+        g.record_at = recorder.elapsed()
+
+    @app.after_request
+    def _record_request(response):
+        session = g.get("session")
+        start = g.pop("record_start", None)
+        if session is None or start is None:
+            return response
+        entry = request_entry(
+            g.pop("record_at"),
+            response.headers.get(session_header) or session.token,
+            request.method,
+            request.path,
+            request.query_string.decode("latin-1"),
+            request.get_json(silent=True) if request.method != "GET" else None,
+            session.data,
+            response.status_code,
+            start,
+        )
+        body = None
+        if not response.is_streamed and not response.direct_passthrough:
+            data = response.get_data()
+            entry["bytes"] = len(data)
+            entry["digest"] = digest(data)
+            if response.mimetype == "application/json":
+                body = data
+        recorder.record(entry, body)
+        return response
@@ -0,0 +1,248 @@
+"""Pluggable storage for game sessions.
+
+The Flask app reaches sessions only through a :class:`SessionBackend`:
+
+* :meth:`~SessionBackend.acquire` returns the caller's :class:`Session` (a
+  fresh one when the token is unknown or expired) with its lock held;
+* :meth:`~SessionBackend.commit` stores the request's changes and returns
+  ``False`` if another process changed the session in the meantime;
+* :meth:`~SessionBackend.release` drops the lock.
+
+:class:`InProcessBackend` keeps live sessions in a :class:`SessionStore`. It
+is the fastest option but ties every game to one worker process.
+:class:`SQLiteBackend` stores each session as a compact binary blob (see
+:mod:`session_codec`) in a SQLite database shared by all workers on the node,
+so any worker can serve any request. Concurrent writers to one session are
+detected with a version number instead of a cross-process lock.
+
+Only the sessions and the awards season (``SQLiteAwardsCalendar``) are
+shared through the database. The leaderboards and the talent market live
+in each worker: with several workers every worker ranks the releases it
+served (plus the saved careers it seeded from) and casts from its own
+market, so boards and market talent differ between workers.
+"""
+from __future__ import annotations
+
+import secrets
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from session_codec import decode_state, encode_state
+from session_store import Session, SessionStore
+
+
+class SessionBackend:
+    """Interface shared by the session backends."""
+
+    def acquire(self, token: Optional[str], create: bool = True) -> Optional[Session]:
+        """Return the locked session for ``token``.
+
+        Unknown or expired tokens get a new session, or ``None`` when
+        ``create`` is false.
+        """
+        raise NotImplementedError
+
+    def commit(self, session: Session) -> bool:
+        """Persist ``session``; ``False`` means a concurrent request won."""
+        return True
+
+    def release(self, session: Session) -> None:
+        session.lock.release()
+
+    def __contains__(self, token: object) -> bool:
+        """Whether ``token`` names a live session, without loading or touching it."""
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, int]:
+        raise NotImplementedError
+
+
+class InProcessBackend(SessionBackend):
+    """Sessions held in this process's memory."""
+
+    def __init__(self, store: SessionStore) -> None:
+        self.store = store
+
+    def acquire(self, token: Optional[str], create: bool = True) -> Optional[Session]:
+        session = self.store.get_or_create(token) if create else self.store.get(token)
+        if session is not None:
+            session.lock.acquire()
+        return session
+
+    def __contains__(self, token: object) -> bool:
+        return token in self.store
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def stats(self) -> Dict[str, int]:
+        return self.store.stats()
+
+
+class SQLiteBackend(SessionBackend):
+    """Sessions stored in a SQLite database shared between worker processes.
+
+    Parameters
+    ----------
+    path:
+        Database file; every worker must use the same one.
+    ttl:
+        Seconds of inactivity after which a session is treated as gone.
+    lock_stripes:
+        Number of in-process locks serialising requests for the same token
+        within one worker.
+    clock:
+        Wall-clock time source (shared across processes).
+    """
+
+    # Commits between sweeps of expired rows
+    PURGE_EVERY = 1000
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 3600.0,
+        lock_stripes: int = 64,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = path
+        self.ttl = ttl
+        self._clock = clock
+        self._local = threading.local()
+        self._locks = [threading.RLock() for _ in range(lock_stripes)]
+        self._stats_lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "writes": 0, "unchanged": 0, "conflicts": 0}
+        self._commits = 0
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            " token TEXT PRIMARY KEY,"
+            " version INTEGER NOT NULL,"
+            " last_access REAL NOT NULL,"
+            " data BLOB NOT NULL)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _lock(self, token: str) -> threading.RLock:
+        return self._locks[hash(token) % len(self._locks)]
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self._counters[name] += 1
+
+    def acquire(self, token: Optional[str], create: bool = True) -> Optional[Session]:
+        now = self._clock()
+        if token:
+            lock = self._lock(token)
+            lock.acquire()
+            session = None
+            try:
+                row = self._connection().execute(
+                    "SELECT version, data FROM sessions WHERE token = ? AND last_access > ?",
+                    (token, now - self.ttl),
+                ).fetchone()
+                if row is not None:
+                    session = Session(token, now)
+                    session.version, session.stored = row[0], bytes(row[1])
+                    try:
+                        session.data = decode_state(session.stored)
+                    except ValueError:
+                        # Stored by an older release in another format; the
+                        # game starts over under a new token.
+                        session = None
+                if session is not None:
+                    session.lock = lock
+                    self._count("hits")
+                    return session
+            except BaseException:
+                lock.release()
+                raise
+            lock.release()
+        self._count("misses")
+        if not create:
+            return None
+        session = Session(secrets.token_urlsafe(16), now)
+        session.lock = self._lock(session.token)
+        session.lock.acquire()
+        return session
+
+    def commit(self, session: Session) -> bool:
+        conn = self._connection()
+        now = self._clock()
+        if session.version == 0 and not session.data:
+            # Nothing worth keeping yet (e.g. a bare health check).
+            return True
+        data = encode_state(session.data)
+        if session.version == 0:
+            try:
+                conn.execute(
+                    "INSERT INTO sessions (token, version, last_access, data) VALUES (?, 1, ?, ?)",
+                    (session.token, now, data),
+                )
+            except sqlite3.IntegrityError:
+                self._count("conflicts")
+                return False
+            session.version = 1
+            self._count("writes")
+        elif data == session.stored:
+            conn.execute(
+                "UPDATE sessions SET last_access = ? WHERE token = ? AND version = ?",
+                (now, session.token, session.version),
+            )
+            self._count("unchanged")
+        else:
+            cursor = conn.execute(
+                "UPDATE sessions SET data = ?, version = version + 1, last_access = ?"
+                " WHERE token = ? AND version = ?",
+                (data, now, session.token, session.version),
+            )
+            if cursor.rowcount != 1:
+                self._count("conflicts")
+                return False
+            session.version += 1
+            self._count("writes")
+        session.stored = data
+
+        with self._stats_lock:
+            self._commits += 1
+            purge = self._commits % self.PURGE_EVERY == 0
+        if purge:
+            self.purge_expired()
+        return True
+
+    def purge_expired(self) -> int:
+        """Delete sessions idle for longer than ``ttl``; return how many."""
+        cursor = self._connection().execute(
+            "DELETE FROM sessions WHERE last_access <= ?", (self._clock() - self.ttl,)
+        )
+        return cursor.rowcount
+
+    def __contains__(self, token: object) -> bool:
+        if not isinstance(token, str):
+            return False
+        return self._connection().execute(
+            "SELECT 1 FROM sessions WHERE token = ? AND last_access > ?",
+            (token, self._clock() - self.ttl),
+        ).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM sessions WHERE last_access > ?", (self._clock() - self.ttl,)
+        ).fetchone()[0]
+
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            counters = dict(self._counters)
+        return {"sessions": len(self), **counters}
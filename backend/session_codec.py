@@ -0,0 +1,183 @@
+"""Compact binary encoding of per-session game state.
+
+Session state is a dict of plain JSON-like values plus a few engine objects
+(:class:`Player`, :class:`TalentPool` and views into it, :class:`GameRNG`).
+:func:`encode_state` rewrites those objects as tagged tuples of primitive
+values and bytes and packs the result with :mod:`marshal`; talent pools are
+stored as their raw column buffers and random streams as packed 32-bit
+words. A pool referenced several times (from ``talent_pools`` and from the
+selected cast) is written once.
+
+``talent_indexes`` are derived data: they are not stored and are rebuilt
+from ``talent_pools`` on decode. A player's caches (profile aggregates,
+career history tiers and encoded project bytes) are stored next to it when
+they are up to date, so a decoded player does not rebuild them from the
+whole career.
+"""
+from __future__ import annotations
+
+import marshal
+from array import array
+from dataclasses import fields
+from typing import Any, Dict, List
+
+from game_engine import GameRNG, Player
+from game_engine.casting import Talent
+from game_engine.history import CareerHistory
+from game_engine.profile import ProfileStats
+from game_engine.talent_index import TalentIndex
+from game_engine.talent_pool import TalentPool, TalentView
+
+FORMAT = b"DS2"
+# marshal format version 4 is available on every supported Python
+_MARSHAL_VERSION = 4
+
+# Keys holding derived data that is rebuilt instead of stored
+DERIVED_KEYS = ("talent_indexes",)
+
+_PLAYER_FIELDS = tuple(f.name for f in fields(Player))
+_TALENT_FIELDS = tuple(f.name for f in fields(Talent))
+
+# Tags of encoded objects; every tuple in the encoded tree is tagged.
+_TUPLE = "t"
+_SET = "s"
+_PLAYER = "P"
+_POOL = "T"
+_POOL_REF = "r"
+_VIEW = "V"
+_TALENT = "A"
+_RNG = "R"
+
+
+def _player_caches(player: Player) -> Dict[str, Any]:
+    """Return the player's caches that match its current ``past_projects``."""
+    count = len(player.past_projects)
+    caches: Dict[str, Any] = {}
+    stats = getattr(player, "_profile_stats", None)
+    if stats is not None and stats.count == count:
+        caches["profile_stats"] = stats.to_buffers()
+    history = getattr(player, "_career_history", None)
+    if history is not None and len(history) == count:
+        caches["career_history"] = history.to_buffers()
+    encoded = getattr(player, "_encoded_projects", None)
+    if encoded and len(encoded) <= count:
+        caches["encoded_projects"] = list(encoded)
+    return caches
+
+
+def _restore_player_caches(player: Player, caches: Dict[str, Any]) -> None:
+    if "profile_stats" in caches:
+        player._profile_stats = ProfileStats.from_buffers(  # type: ignore[attr-defined]
+            caches["profile_stats"], player.past_projects
+        )
+    if "career_history" in caches:
+        player._career_history = CareerHistory.from_buffers(caches["career_history"])  # type: ignore[attr-defined]
+    if "encoded_projects" in caches:
+        player._encoded_projects = caches["encoded_projects"]  # type: ignore[attr-defined]
+
+
+class _Encoder:
+    def __init__(self) -> None:
+        self.pools: Dict[int, int] = {}
+
+    def pool(self, pool: TalentPool) -> tuple:
+        ref = self.pools.get(id(pool))
+        if ref is not None:
+            return (_POOL_REF, ref)
+        self.pools[id(pool)] = len(self.pools)
+        return (_POOL, *pool.to_buffers())
+
+    def __call__(self, obj: Any) -> Any:
+        if obj is None or isinstance(obj, (bool, int, float, str, bytes)):
+            return obj
+        if isinstance(obj, dict):
+            return {key: self(value) for key, value in obj.items()}
+        if isinstance(obj, list):
+            return [self(value) for value in obj]
+        if isinstance(obj, tuple):
+            return (_TUPLE, *(self(value) for value in obj))
+        if isinstance(obj, (set, frozenset)):
+            return (_SET, *(self(value) for value in obj))
+        if isinstance(obj, TalentView):
+            return (_VIEW, self.pool(obj._pool), obj._index)
+        if isinstance(obj, TalentPool):
+            return self.pool(obj)
+        if isinstance(obj, Player):
+            values = {name: self(getattr(obj, name)) for name in _PLAYER_FIELDS}
+            return (_PLAYER, values, self(_player_caches(obj)))
+        if isinstance(obj, Talent):
+            return (_TALENT, *(getattr(obj, name) for name in _TALENT_FIELDS))
+        if isinstance(obj, GameRNG):
+            seed, streams = obj.getstate()
+            packed = {
+                name: (version, array("I", words).tobytes(), gauss)
+                for name, (version, words, gauss) in streams.items()
+            }
+            return (_RNG, seed, packed)
+        raise TypeError(f"cannot store {type(obj).__name__} in a session")
+
+
+class _Decoder:
+    def __init__(self) -> None:
+        self.pools: List[TalentPool] = []
+
+    def pool(self, value: tuple) -> TalentPool:
+        if value[0] == _POOL_REF:
+            return self.pools[value[1]]
+        pool = TalentPool.from_buffers(value[1:])
+        self.pools.append(pool)
+        return pool
+
+    def __call__(self, obj: Any) -> Any:
+        if isinstance(obj, dict):
+            return {key: self(value) for key, value in obj.items()}
+        if isinstance(obj, list):
+            return [self(value) for value in obj]
+        if not isinstance(obj, tuple):
+            return obj
+        tag, rest = obj[0], obj[1:]
+        if tag == _TUPLE:
+            return tuple(self(value) for value in rest)
+        if tag == _SET:
+            return {self(value) for value in rest}
+        if tag == _VIEW:
+            return self.pool(rest[0])[rest[1]]
+        if tag in (_POOL, _POOL_REF):
+            return self.pool(obj)
+        if tag == _PLAYER:
+            values, caches = rest
+            player = Player(name=values["name"])
+            for name, value in values.items():
+                if name in _PLAYER_FIELDS:
+                    setattr(player, name, self(value))
+            _restore_player_caches(player, self(caches))
+            return player
+        if tag == _TALENT:
+            return Talent(*rest)
+        if tag == _RNG:
+            seed, packed = rest
+            streams = {
+                name: (version, tuple(array("I", words)), gauss)
+                for name, (version, words, gauss) in packed.items()
+            }
+            rng = GameRNG(seed)
+            rng.setstate((seed, streams))
+            return rng
+        raise ValueError(f"unknown session value tag {tag!r}")
+
+
+def encode_state(state: Dict[str, Any]) -> bytes:
+    """Encode a session state dict to bytes."""
+    stored = {key: value for key, value in state.items() if key not in DERIVED_KEYS}
+    return FORMAT + marshal.dumps(_Encoder()(stored), _MARSHAL_VERSION)
+
+
+def decode_state(data: bytes) -> Dict[str, Any]:
+    """Decode bytes from :func:`encode_state`, rebuilding derived data."""
+    if not data.startswith(FORMAT):
+        raise ValueError("not an encoded session state")
+    state = _Decoder()(marshal.loads(data[len(FORMAT):]))
+    pools = state.get("talent_pools")
+    if pools:
+        state["talent_indexes"] = {role: TalentIndex(pool) for role, pool in pools.items()}
+    return state
@@ -0,0 +1,171 @@
+"""Thread-safe, in-memory store for per-player game sessions.
+
+Each browser (or API client) is identified by an opaque session token. The
+store spreads sessions across a fixed number of shards, each guarded by its
+own lock, so concurrent Flask worker threads only contend when their tokens
+happen to hash to the same shard. Idle sessions expire after ``ttl`` seconds
+and the total number of live sessions is capped; the least recently used
+session in a shard is evicted first when its share of the cap is exceeded.
+"""
+from __future__ import annotations
+
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+
+class Session:
+    """State for a single game plus the lock serialising access to it."""
+
+    __slots__ = ("token", "data", "lock", "last_access", "version", "stored")
+
+    def __init__(self, token: str, now: float) -> None:
+        self.token = token
+        self.data: Dict[str, Any] = {}
+        self.lock = threading.RLock()
+        self.last_access = now
+        # Used by shared backends: the stored version this copy was loaded
+        # from (0 = never stored) and its encoded bytes.
+        self.version = 0
+        self.stored = b""
+
+
+class _Shard:
+    __slots__ = ("lock", "sessions", "hits", "misses", "evictions", "expirations")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+
+class SessionStore:
+    """Lock-striped mapping of session token to :class:`Session`.
+
+    Parameters
+    ----------
+    shards:
+        Number of independently locked shards.
+    ttl:
+        Seconds of inactivity after which a session is dropped.
+    max_sessions:
+        Upper bound on live sessions across all shards.
+    clock:
+        Monotonic time source, replaceable for deterministic tests.
+    """
+
+    def __init__(
+        self,
+        shards: int = 16,
+        ttl: float = 3600.0,
+        max_sessions: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._clock = clock
+        self._shards = [_Shard() for _ in range(shards)]
+        # Divide the cap evenly; every shard may hold at least one session.
+        self._per_shard_cap = max(1, max_sessions // shards)
+
+    def _shard(self, token: str) -> _Shard:
+        return self._shards[hash(token) % len(self._shards)]
+
+    def _expire(self, shard: _Shard, now: float) -> None:
+        """Drop expired sessions from the cold end of ``shard``.
+
+        Sessions are kept in least-recently-used order, so scanning stops at
+        the first one that is still fresh. Caller must hold ``shard.lock``.
+        """
+        sessions = shard.sessions
+        while sessions:
+            token, session = next(iter(sessions.items()))
+            if now - session.last_access < self.ttl:
+                break
+            del sessions[token]
+            shard.expirations += 1
+
+    def get(self, token: Optional[str]) -> Optional[Session]:
+        """Return the live session for ``token`` or ``None``."""
+        if not token:
+            return None
+        shard = self._shard(token)
+        now = self._clock()
+        with shard.lock:
+            session = shard.sessions.get(token)
+            if session is None or now - session.last_access >= self.ttl:
+                if session is not None:
+                    del shard.sessions[token]
+                    shard.expirations += 1
+                shard.misses += 1
+                return None
+            session.last_access = now
+            shard.sessions.move_to_end(token)
+            shard.hits += 1
+            return session
+
+    def __contains__(self, token: object) -> bool:
+        """Whether ``token`` names a live session; does not count as a use."""
+        if not isinstance(token, str):
+            return False
+        shard = self._shard(token)
+        with shard.lock:
+            session = shard.sessions.get(token)
+            return session is not None and self._clock() - session.last_access < self.ttl
+
+    def create(self) -> Session:
+        """Create and register a session under a fresh random token."""
+        token = secrets.token_urlsafe(16)
+        shard = self._shard(token)
+        now = self._clock()
+        session = Session(token, now)
+        with shard.lock:
+            self._expire(shard, now)
+            shard.sessions[token] = session
+            while len(shard.sessions) > self._per_shard_cap:
+                shard.sessions.popitem(last=False)
+                shard.evictions += 1
+        return session
+
+    def get_or_create(self, token: Optional[str]) -> Session:
+        """Return the session for ``token``, creating a new one if unknown."""
+        return self.get(token) or self.create()
+
+    def discard(self, token: str) -> None:
+        """Remove ``token`` from the store if present."""
+        shard = self._shard(token)
+        with shard.lock:
+            shard.sessions.pop(token, None)
+
+    def evict_expired(self) -> int:
+        """Sweep every shard for idle sessions and return how many were dropped."""
+        now = self._clock()
+        dropped = 0
+        for shard in self._shards:
+            with shard.lock:
+                before = len(shard.sessions)
+                self._expire(shard, now)
+                dropped += before - len(shard.sessions)
+        return dropped
+
+    def __len__(self) -> int:
+        return sum(len(shard.sessions) for shard in self._shards)
+
+    def stats(self) -> Dict[str, int]:
+        """Return aggregate size and hit/miss/eviction counters."""
+        totals = {"sessions": 0, "hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+        for shard in self._shards:
+            with shard.lock:
+                totals["sessions"] += len(shard.sessions)
+                totals["hits"] += shard.hits
+                totals["misses"] += shard.misses
+                totals["evictions"] += shard.evictions
+                totals["expirations"] += shard.expirations
+        return totals
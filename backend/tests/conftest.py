@@ -0,0 +1,7 @@
+"""Make the backend modules importable when pytest runs from the repository root."""
+import os
+import sys
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND not in sys.path:
+    sys.path.insert(0, BACKEND)
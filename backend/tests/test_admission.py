@@ -0,0 +1,58 @@
+"""Admission control charges batches per operation and ignores unknown tokens."""
+import pytest
+
+from admission import AdmissionControl, TokenBucket
+from session_store import SessionStore
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_bucket_charges_cost_capped_at_burst():
+    clock = Clock()
+    bucket = TokenBucket(rate=10, burst=50, clock=clock)
+    assert bucket.take(30) == 0
+    assert bucket.take(30) == pytest.approx(1.0)
+    clock.now = 10
+    # More than the burst costs the whole burst instead of never fitting.
+    assert bucket.take(500) == 0
+    assert bucket.take(1) > 0
+
+
+def test_batch_pays_per_operation():
+    control = AdmissionControl(clock=Clock())
+    assert control.admit("/batch", "session", cost=50) is None
+    control.done("/batch", 0.0)
+    reason, _ = control.admit("/batch", "session", cost=1)
+    assert reason == "session_rate"
+
+
+def test_store_membership_does_not_touch_sessions():
+    clock = Clock()
+    store = SessionStore(ttl=10, clock=clock)
+    session = store.create()
+    clock.now = 5
+    assert session.token in store and "made-up" not in store
+    assert session.last_access == 0 and store.stats()["hits"] == 0
+    clock.now = 11
+    assert session.token not in store
+
+
+def test_sqlite_membership_needs_a_stored_session(tmp_path):
+    from session_backends import SQLiteBackend
+
+    clock = Clock()
+    backend = SQLiteBackend(str(tmp_path / "sessions.db"), ttl=10, clock=clock)
+    session = backend.acquire(None)
+    assert session.token not in backend
+    session.data["player"] = None
+    backend.commit(session)
+    backend.release(session)
+    assert session.token in backend
+    clock.now = 11
+    assert session.token not in backend
@@ -0,0 +1,98 @@
+"""End-to-end checks of the Flask app on the shared SQLite session backend."""
+import os
+import tempfile
+
+_DATA = tempfile.mkdtemp(prefix="director-test-")
+os.environ.update(
+    DIRECTOR_SESSION_BACKEND="sqlite",
+    DIRECTOR_SESSION_DB=os.path.join(_DATA, "sessions.db"),
+    DIRECTOR_DATA_DIR=os.path.join(_DATA, "careers"),
+    DIRECTOR_ADMISSION="0",
+    DIRECTOR_PREGEN_SIZE="0",
+    DIRECTOR_MARKET_SIZE="0",
+)
+
+import pytest  # noqa: E402
+
+import app as app_module  # noqa: E402
+from app import SESSION_HEADER, app  # noqa: E402
+
+
+@pytest.fixture
+def client():
+    return app.test_client(use_cookies=False)
+
+
+def _produced(client, name, seed=7):
+    """Start a seeded game and produce its first project; return the headers."""
+    token = client.post("/start_game", json={"name": name, "seed": seed}).headers[SESSION_HEADER]
+    headers = {SESSION_HEADER: token}
+    client.get("/get_projects", headers=headers)
+    client.post("/select_project", json={"offer_index": 0}, headers=headers)
+    assert client.post("/solve_cast", json={"select": True}, headers=headers).status_code == 200
+    assert client.post("/start_production", headers=headers).status_code == 200
+    return headers
+
+
+def _published(name="Conflicted"):
+    return (
+        app_module.LEADERBOARDS.total("box_office"),
+        len(app_module.AWARDS_CALENDAR.season),
+        len(app_module.CAREERS.load_player(name).past_projects),
+    )
+
+
+def test_conflicting_release_has_no_global_effects(client, monkeypatch):
+    headers = _produced(client, "Conflicted")
+    before = _published()
+
+    # Another worker stores the session between this request's load and commit.
+    monkeypatch.setattr(app_module.SESSIONS, "commit", lambda session: False)
+    assert client.post("/release_project", headers=headers).status_code == 409
+    assert _published() == before
+
+    monkeypatch.undo()
+    assert client.post("/release_project", headers=headers).status_code == 200
+    boards, season, projects = _published()
+    assert (season, projects) == (before[1] + 1, before[2] + 1)
+    assert boards >= 1
+
+
+def test_failed_batch_rolls_back(client):
+    headers = _produced(client, "Batched")
+    before = _published("Batched")
+    profile = client.get("/get_profile", headers=headers).get_json()
+
+    response = client.post("/batch", json={"operations": [
+        {"op": "release_project"},
+        {"op": "select_project", "offer_index": 99},
+    ]}, headers=headers)
+    body = response.get_json()
+    assert response.status_code == 400
+    assert body["completed"] == 0
+    assert [part["status"] for part in body["results"]] == [200, 400]
+    assert client.get("/get_profile", headers=headers).get_json() == profile
+    assert _published("Batched") == before
+
+    # The rolled-back release can still be made.
+    assert client.post("/release_project", headers=headers).status_code == 200
+    assert _published("Batched")[1:] == (before[1] + 1, before[2] + 1)
+
+
+def test_release_saves_reputation_without_market(client):
+    headers = _produced(client, "Reputable")
+    results = client.post("/release_project", headers=headers).get_json()
+    player = client.post("/start_game", json={"name": "Reputable"}, headers=headers).get_json()
+    expected = max(0, min(100, 10 + app_module.reputation_change(results)))
+    assert player["reputation"] == expected
+    assert app_module.CAREERS.load_player("Reputable").reputation == expected
+
+
+def test_saved_careers_are_ranked_at_startup(monkeypatch):
+    player = app_module.Player("Veteran")
+    app_module.CAREERS.record_project(player, {"medium": "film", "box_office": 5})
+    monkeypatch.setattr(app_module, "_services_started", False)
+    monkeypatch.setattr(app_module, "LEADERBOARDS_SEEDED", app_module.threading.Event())
+    app_module.start_services()
+    assert app_module.LEADERBOARDS_SEEDED.wait(5)
+    assert app_module.LEADERBOARDS.rank("box_office", player.player_id)["name"] == "Veteran"
@@ -0,0 +1,60 @@
+"""The native ASGI production stream goes through admission and the recorder."""
+import asyncio
+
+from test_app import _produced, client  # noqa: F401  (sets up the app's environment)
+
+import asgi
+from admission import AdmissionControl, register_metrics
+from app import SESSION_HEADER
+from recorder import SessionRecorder, read_log
+
+
+def _get(token=None, query=b""):
+    headers = [(SESSION_HEADER.lower().encode(), token.encode())] if token else []
+    scope = {
+        "type": "http", "method": "GET", "path": asgi.STREAM_PATH,
+        "query_string": query, "headers": headers, "client": ("10.0.0.1", 1234),
+    }
+    sent = []
+    never = asyncio.Event()
+
+    async def receive():
+        if not sent:
+            return {"type": "http.request"}
+        await never.wait()
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(asgi.app(scope, receive, send))
+    body = b"".join(m.get("body", b"") for m in sent[1:])
+    return sent[0]["status"], dict(sent[0]["headers"]), body
+
+
+def test_stream_is_admitted_and_recorded(client, monkeypatch, tmp_path):  # noqa: F811
+    token = _produced(client, "Streamer")[SESSION_HEADER]
+    control = AdmissionControl({asgi.STREAM_PATH: {"session_rate": 0.001, "session_burst": 1}})
+    register_metrics(control)
+    recorder = SessionRecorder(str(tmp_path / "play.log.gz"))
+    monkeypatch.setattr(asgi, "ADMISSION", control)
+    monkeypatch.setattr(asgi, "RECORDER", recorder)
+    monkeypatch.setattr(asgi, "STREAM_INTERVAL", 0)
+
+    status, headers, body = _get(token)
+    assert status == 200 and body.count(b"event: ") > 1
+    assert control.queue.in_flight == 0
+
+    status, headers, _ = _get(token)
+    assert status == 429 and b"retry-after" in headers
+
+    recorder.close()
+    [entry] = list(read_log(recorder.path))
+    assert (entry["path"], entry["status"]) == (asgi.STREAM_PATH, 200)
+    assert entry["rng"]["seeded"] is True
+
+
+def test_query_token_is_ignored(client, monkeypatch):  # noqa: F811
+    token = _produced(client, "Queried")[SESSION_HEADER]
+    monkeypatch.setattr(asgi, "STREAM_INTERVAL", 0)
+    status, _, _ = _get(query=b"token=" + token.encode())
+    assert status == 400
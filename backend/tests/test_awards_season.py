@@ -0,0 +1,47 @@
+"""Workers sharing a SQLite awards calendar run one season between them."""
+from game_engine.awards_season import AwardsCalendar, SQLiteAwardsCalendar
+
+
+def _project(i):
+    return {"id": i, "title": f"Project {i}", "medium": "film", "genre": "drama",
+            "critics_score": 40 + i, "fan_score": 60, "box_office": 1_000_000, "budget": 500_000}
+
+
+def test_workers_share_one_season(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    workers = [SQLiteAwardsCalendar(path, releases_per_season=6, seed=3) for _ in range(2)]
+    closed = [workers[i % 2].record_release(f"id{i % 3}", "Same Name", i // 3, _project(i)) for i in range(6)]
+
+    assert closed[:5] == [None] * 5
+    assert len(workers[0].season) == 0 and workers[1].standings()["year"] == 2
+    results = closed[5]
+    # Both workers see the mailbox; delivering through one empties it for both.
+    for player_id, by_index in results.items():
+        assert workers[0].results(player_id) == workers[1].results(player_id) == by_index
+        workers[1].acknowledge(player_id, by_index)
+        assert not workers[0].has_results(player_id)
+    assert workers[0].standings()["last_season"]["releases"] == 6
+
+
+def test_matches_in_process_calendar(tmp_path):
+    shared = SQLiteAwardsCalendar(str(tmp_path / "sessions.db"), releases_per_season=4, seed=9)
+    local = AwardsCalendar(releases_per_season=4, seed=9)
+    for i in range(4):
+        expected = local.record_release(f"id{i}", f"Player {i}", 0, _project(i))
+        assert shared.record_release(f"id{i}", f"Player {i}", 0, _project(i)) == expected
+
+
+def test_standings_follow_entries_of_other_workers(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    writer = SQLiteAwardsCalendar(path, releases_per_season=5, seed=4)
+    reader = SQLiteAwardsCalendar(path, releases_per_season=5, seed=4)
+    local = AwardsCalendar(releases_per_season=5, seed=4)
+    for i in range(12):
+        writer.record_release(f"id{i}", f"Player {i}", 0, _project(i))
+        local.record_release(f"id{i}", f"Player {i}", 0, _project(i))
+        # Scored incrementally, yet the same as scoring the season in one go.
+        standings = reader.standings()
+        assert standings == local.standings()
+        assert standings["standings"] == writer.season.standings()
+    assert reader.standings()["year"] == 3
+    assert reader.standings()["releases"] == 2
@@ -0,0 +1,26 @@
+"""Cold-start imports must stay within the budgets of ``bench_import``."""
+import os
+
+import pytest
+
+from benchmarks.bench_import import BUDGETS, import_profile
+
+# Multiplies every budget, for slower machines (as ``--scale`` does). Wall
+# times are too noisy on shared CI runners, so the timing check only runs
+# when this is set; the forbidden-module check always runs.
+SCALE = os.environ.get("DIRECTOR_IMPORT_BUDGET_SCALE")
+
+
+@pytest.mark.parametrize("module", sorted(BUDGETS))
+def test_import_loads_no_forbidden_modules(module):
+    _, forbidden = BUDGETS[module]
+    _, _, loaded = import_profile(module)
+    assert not [name for name in forbidden if name in loaded]
+
+
+@pytest.mark.skipif(SCALE is None, reason="set DIRECTOR_IMPORT_BUDGET_SCALE to time imports")
+@pytest.mark.parametrize("module", sorted(BUDGETS))
+def test_import_within_budget(module):
+    budget, _ = BUDGETS[module]
+    best = min(import_profile(module)[0] for _ in range(3))
+    assert best <= budget * float(SCALE), f"{module} imports in {best:.1f} ms"
@@ -0,0 +1,32 @@
+"""Leaderboards tell players apart by id, not by name."""
+from game_engine.leaderboard import Leaderboards
+from game_engine.player import Player, legacy_player_id
+from game_engine.storage import CareerStore, _PLAYER
+
+
+def test_players_sharing_a_name_are_ranked_separately():
+    boards = Leaderboards()
+    first, second = Player("Sam"), Player("Sam")
+    assert first.player_id != second.player_id
+    boards.record(first.player_id, "Sam", {"medium": "film", "box_office": 100})
+    boards.record(second.player_id, "Sam", {"medium": "film", "box_office": 300})
+
+    entries = boards.top("box_office")
+    assert [(e["player_id"], e["score"]) for e in entries] == [
+        (second.player_id, 300.0),
+        (first.player_id, 100.0),
+    ]
+    assert boards.rank("box_office", first.player_id)["rank"] == 2
+    boards.add_player(first.player_id, "Sam", [{"box_office": 1000}])
+    assert boards.rank("box_office", first.player_id)["score"] == 100.0
+
+
+def test_saved_careers_keep_their_id(tmp_path):
+    store = CareerStore(str(tmp_path))
+    player = Player("Kim")
+    store.save_player(player)
+    assert store.load_player("Kim").player_id == player.player_id
+
+    # Saved before players had ids
+    store._append(_PLAYER, {"name": "Old", "profile": {"name": "Old", "reputation": 20}})
+    assert store.load_player("Old").player_id == legacy_player_id("Old")
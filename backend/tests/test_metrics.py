@@ -0,0 +1,74 @@
+"""``/metrics`` serves the request counter and histogram as Prometheus text."""
+import re
+from collections import defaultdict
+
+from test_app import SESSION_HEADER, client  # noqa: F401  (fixture)
+
+SAMPLE = re.compile(
+    r'^(?P<name>[a-zA-Z_:][a-zA-Z0-9_:]*)'
+    r'(?:\{(?P<labels>[a-zA-Z_][a-zA-Z0-9_]*="(?:[^"\\\n]|\\.)*"'
+    r'(?:,[a-zA-Z_][a-zA-Z0-9_]*="(?:[^"\\\n]|\\.)*")*)\})?'
+    r' (?P<value>[-+]?(?:[0-9.]+(?:[eE][-+]?[0-9]+)?|Inf|NaN))$'
+)
+LABEL = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+
+
+def parse(text):
+    """Return ``{family: (type, [(name, labels, value), ...])}``; fail on bad lines."""
+    assert text.endswith("\n")
+    families = {}
+    current = None
+    for line in text.splitlines():
+        if line.startswith("# HELP "):
+            current = line.split()[2]
+            continue
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split()
+            assert name == current, f"TYPE without HELP: {line}"
+            assert kind in ("counter", "gauge", "histogram")
+            families[name] = (kind, [])
+            continue
+        match = SAMPLE.match(line)
+        assert match, f"not a sample line: {line!r}"
+        name = match["name"]
+        family = current if name in (current, f"{current}_bucket", f"{current}_sum", f"{current}_count") else None
+        assert family in families, f"sample outside its family: {line}"
+        labels = dict(LABEL.findall(match["labels"] or ""))
+        families[family][1].append((name, labels, float(match["value"])))
+    return families
+
+
+def test_metrics_expose_requests_in_prometheus_format(client):
+    token = client.post("/start_game", json={"name": "Metered", "seed": 1}).headers[SESSION_HEADER]
+    client.get("/get_projects", headers={SESSION_HEADER: token})
+    client.get("/get_projects", headers={SESSION_HEADER: token})
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    families = parse(response.get_data(as_text=True))
+
+    kind, samples = families["director_requests_total"]
+    assert kind == "counter"
+    counts = {
+        (labels["route"], labels["method"], labels["status"]): value
+        for _, labels, value in samples
+    }
+    assert counts[("/get_projects", "GET", "200")] >= 2
+    assert counts[("/start_game", "POST", "200")] >= 1
+
+    kind, samples = families["director_request_seconds"]
+    assert kind == "histogram"
+    series = defaultdict(dict)
+    for name, labels, value in samples:
+        route = labels.pop("route")
+        le = labels.pop("le", None)
+        assert not labels
+        series[route][name if le is None else float(le)] = value
+    for route, values in series.items():
+        buckets = sorted((bound, count) for bound, count in values.items() if isinstance(bound, float))
+        assert buckets[-1][0] == float("inf")
+        assert [count for _, count in buckets] == sorted(count for _, count in buckets), route
+        assert buckets[-1][1] == values["director_request_seconds_count"]
+        assert values["director_request_seconds_sum"] >= 0
+    assert series["/get_projects"]["director_request_seconds_count"] >= 2
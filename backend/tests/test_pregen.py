@@ -0,0 +1,18 @@
+"""The content cache only pre-generates what it is asked to."""
+import random
+
+from game_engine.pregen import ContentCache
+
+
+def test_talent_pools_can_be_left_to_the_market():
+    cache = ContentCache(high_water=4, low_water=2, rng=random.Random(1), talent_pools=False)
+    cache.fill()
+    assert cache.stats()["ready_pools"] == 0
+    assert cache.stats()["ready_offers"] > 0
+    assert len(cache.talent_pool("director", 5, random.Random(2))) == 5
+
+
+def test_talent_pools_are_pre_generated_by_default():
+    cache = ContentCache(high_water=4, low_water=2, rng=random.Random(1))
+    cache.fill()
+    assert cache.stats()["ready_pools"] > 0
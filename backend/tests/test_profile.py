@@ -0,0 +1,22 @@
+"""Profile summaries list the whole career unless a page is requested."""
+from game_engine.player import Player
+from game_engine.profile import add_completed_project, get_profile_summary
+
+
+def _player(projects: int) -> Player:
+    player = Player("Tester")
+    for i in range(projects):
+        add_completed_project(player, {"id": i, "title": f"Project {i}", "critics_score": 50})
+    return player
+
+
+def test_default_lists_every_project():
+    summary = get_profile_summary(_player(45))
+    assert len(summary["projects"]) == 45
+    assert summary["total_pages"] == 1
+
+
+def test_page_size_pages_through_projects():
+    summary = get_profile_summary(_player(45), page=3, page_size=20)
+    assert [p["id"] for p in summary["projects"]] == list(range(40, 45))
+    assert summary["total_pages"] == 3
@@ -0,0 +1,7 @@
+"""The batch release engine must keep the distributions of the scalar one."""
+from benchmarks.bench_release_batch import check_distributions
+
+
+def test_batch_matches_scalar_distributions():
+    # KS on the continuous outputs and z-tests on every award rate, at 0.1%.
+    assert check_distributions(samples=20_000, seed=1234) == []
@@ -0,0 +1,53 @@
+"""A recorded session replays to the same statuses and response digests."""
+import os
+import subprocess
+import sys
+from collections import Counter
+
+from test_app import app  # noqa: F401  (configures and imports the app first)
+
+from benchmarks.replay import InProcessClient, Replay, load_sessions
+from recorder import read_log
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Plays one seeded game in a fresh process with recording switched on.
+RECORD_SCRIPT = """
+from app import SESSION_HEADER, app
+client = app.test_client(use_cookies=False)
+token = client.post("/start_game", json={"name": "Replayed", "seed": 99}).headers[SESSION_HEADER]
+headers = {SESSION_HEADER: token}
+client.get("/get_projects", headers=headers)
+client.post("/select_project", json={"offer_index": 1}, headers=headers)
+client.get("/get_talent_pools", headers=headers)
+client.post("/solve_cast", json={"select": True}, headers=headers)
+client.post("/start_production", headers=headers)
+client.post("/release_project", headers=headers)
+client.get("/get_profile", headers=headers)
+client.post("/select_project", json={"offer_index": 99}, headers=headers)
+"""
+
+
+def test_recorded_session_replays_to_same_digests(tmp_path):
+    log = tmp_path / "play.log.gz"
+    env = dict(
+        os.environ,
+        DIRECTOR_RECORD=str(log),
+        DIRECTOR_SESSION_DB=str(tmp_path / "sessions.db"),
+        DIRECTOR_DATA_DIR=str(tmp_path / "careers"),
+    )
+    subprocess.run([sys.executable, "-c", RECORD_SCRIPT], cwd=BACKEND, env=env, check=True)
+
+    recorded = list(read_log(str(log)))
+    assert [entry["path"] for entry in recorded][:2] == ["/start_game", "/get_projects"]
+    assert all(entry["rng"]["seed"] == 99 and "digest" in entry for entry in recorded)
+    assert recorded[-1]["status"] == 400
+
+    sessions = load_sessions([str(log)])
+    assert len(sessions) == 1
+    replay = Replay(InProcessClient(), concurrency=1, speed=0, deterministic=True)
+    replay.run(sessions)
+    result = replay.report(1.0)
+    assert result["errors"] == 0
+    assert Counter(result["statuses"]) == Counter(str(entry["status"]) for entry in recorded)
+    assert (result["matched"], result["mismatched"]) == (len(recorded), {})
@@ -0,0 +1,58 @@
+"""Stored sessions keep a player's caches instead of rebuilding them."""
+import random
+
+from game_engine import profile
+from game_engine.player import Player
+from game_engine.profile import add_completed_project, career_history, get_profile_summary
+from game_engine.serialization import encode_player
+from session_codec import decode_state, encode_state
+
+
+def _player(projects: int) -> Player:
+    rng = random.Random(5)
+    player = Player("Tester")
+    for i in range(projects):
+        add_completed_project(player, {
+            "id": i,
+            "title": f"Project {i}",
+            "medium": "film",
+            "critics_score": rng.randint(0, 100),
+            "fan_score": rng.randint(0, 100),
+            "box_office": rng.randint(0, 20_000_000),
+            "profit": rng.randint(-1_000_000, 5_000_000),
+            "awards": ["Best Picture"] if i % 7 == 0 else [],
+        })
+    return player
+
+
+def test_round_trip_keeps_player_caches(monkeypatch):
+    player = _player(30)
+    summary = get_profile_summary(player)
+    query = career_history(player).query(["reputation", "cumulative_box_office"], points=8)
+    encoded = encode_player(player)
+
+    restored = decode_state(encode_state({"player": player}))["player"]
+    assert restored._profile_stats.count == 30
+    assert len(restored._career_history) == 30
+    assert len(restored._encoded_projects) == 30
+
+    def rebuild(*args, **kwargs):
+        raise AssertionError("cache rebuilt after decoding")
+
+    monkeypatch.setattr(profile.ProfileStats, "add", rebuild)
+    monkeypatch.setattr(profile.CareerHistory, "append", rebuild)
+    assert get_profile_summary(restored) == summary
+    assert career_history(restored).query(["reputation", "cumulative_box_office"], points=8) == query
+    assert encode_player(restored) == encoded
+    assert restored._profile_stats.best_box_office_project is restored.past_projects[
+        restored._profile_stats.best_box_office_index
+    ]
+
+
+def test_stale_caches_are_not_stored():
+    player = _player(3)
+    get_profile_summary(player)
+    player.past_projects.append({"id": 3, "title": "Unrecorded"})
+    restored = decode_state(encode_state({"player": player}))["player"]
+    assert getattr(restored, "_profile_stats", None) is None
+    assert get_profile_summary(restored)["total_projects"] == 4
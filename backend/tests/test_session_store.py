@@ -0,0 +1,65 @@
+"""Session expiry, eviction and counters, driven by a fake clock."""
+from session_store import SessionStore
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_idle_sessions_expire_after_ttl():
+    clock = FakeClock()
+    store = SessionStore(shards=1, ttl=10, clock=clock)
+    session = store.create()
+
+    clock.now = 9
+    assert store.get(session.token) is session  # refreshes last_access
+    clock.now = 18
+    assert session.token in store
+    clock.now = 19
+    assert session.token not in store
+    assert store.get(session.token) is None
+    assert len(store) == 0
+    assert store.stats() == {"sessions": 0, "hits": 1, "misses": 1, "evictions": 0, "expirations": 1}
+
+
+def test_sweep_drops_only_idle_sessions():
+    clock = FakeClock()
+    store = SessionStore(shards=4, ttl=10, clock=clock)
+    idle = [store.create() for _ in range(3)]
+    clock.now = 5
+    fresh = store.create()
+    clock.now = 12
+    assert store.evict_expired() == 3
+    assert all(store.get(session.token) is None for session in idle)
+    assert store.get(fresh.token) is fresh
+    assert store.stats()["expirations"] == 3
+
+
+def test_least_recently_used_session_is_evicted():
+    clock = FakeClock()
+    store = SessionStore(shards=1, ttl=100, max_sessions=2, clock=clock)
+    first = store.create()
+    clock.now = 1
+    second = store.create()
+    clock.now = 2
+    store.get(first.token)  # now second is the least recently used
+    clock.now = 3
+    third = store.create()
+
+    assert second.token not in store
+    assert first.token in store and third.token in store
+    assert store.stats() == {"sessions": 2, "hits": 1, "misses": 0, "evictions": 1, "expirations": 0}
+
+
+def test_get_or_create_counts_hits_and_misses():
+    store = SessionStore(shards=2, clock=FakeClock())
+    session = store.get_or_create(None)
+    assert store.get_or_create(session.token) is session
+    assert store.get_or_create("unknown") is not session
+    assert "unknown" not in store
+    stats = store.stats()
+    assert (stats["hits"], stats["misses"], stats["sessions"]) == (1, 1, 2)
@@ -0,0 +1,16 @@
+"""Headless careers must not depend on how they are split across workers."""
+from game_engine.simulation import simulate_careers
+
+
+def test_worker_count_does_not_change_results():
+    one = simulate_careers(3, 2, "greedy", seed=5, workers=1)
+    two = simulate_careers(3, 2, "greedy", seed=5, workers=2)
+    assert {k: v.tobytes() for k, v in one["columns"].items()} == {
+        k: v.tobytes() for k, v in two["columns"].items()
+    }
+
+
+def test_no_players():
+    result = simulate_careers(0, 5, "greedy", workers=2)
+    assert result["stats"]["releases"] == 0
+    assert all(len(column) == 0 for column in result["columns"].values())
@@ -0,0 +1,105 @@
+"""Saved careers: identity, migration and crash recovery."""
+import json
+import struct
+
+import pytest
+
+from game_engine.player import Player, legacy_player_id
+from game_engine.storage import LOG_FILE, SNAPSHOT_FILE, CareerStore
+
+
+def test_players_sharing_a_name_keep_separate_careers(tmp_path):
+    store = CareerStore(str(tmp_path))
+    first, second = Player("Sam"), Player("Sam")
+    store.record_project(first, {"title": "A"})
+    store.record_project(second, {"title": "B"})
+    store.record_project(first, {"title": "C"})
+    store.update_project(second, 0, {"title": "B2"})
+
+    for reopened in (False, True):
+        if reopened:
+            store.compact()
+            store.close()
+            store = CareerStore(str(tmp_path))
+        assert len(store) == 2
+        assert [p["title"] for p in store.load_player_by_id(first.player_id).past_projects] == ["A", "C"]
+        assert [p["title"] for p in store.load_player_by_id(second.player_id).past_projects] == ["B2"]
+        # The name resumes the career written under it most recently.
+        assert store.load_player("Sam").player_id == second.player_id
+    store.close()
+
+
+def test_snapshot_keyed_by_name_is_migrated(tmp_path):
+    blob = json.dumps({"profile": {"name": "Old", "reputation": 30}, "projects": [{"title": "A"}]}).encode()
+    header = struct.Struct("<4sHxxQQQ")
+    entry = struct.pack("<HQI", 3, header.size, len(blob)) + b"Old"
+    (tmp_path / SNAPSHOT_FILE).write_bytes(
+        header.pack(b"DSCS", 1, 1, 1, header.size + len(blob)) + blob + entry
+    )
+    (tmp_path / LOG_FILE).write_bytes(struct.pack("<4sHxxQ", b"DSCL", 1, 1))
+
+    store = CareerStore(str(tmp_path))
+    player = store.load_player("Old")
+    assert player.player_id == legacy_player_id("Old")
+    assert player.reputation == 30
+    store.record_project(player, {"title": "B"})
+    store.compact()
+    store.close()
+
+    store = CareerStore(str(tmp_path))
+    player = store.load_player("Old")
+    assert player.player_id == legacy_player_id("Old")
+    assert [p["title"] for p in player.past_projects] == ["A", "B"]
+    store.close()
+
+
+def test_torn_log_tail_is_dropped(tmp_path):
+    store = CareerStore(str(tmp_path))
+    player = Player("Torn")
+    for title in "ABC":
+        store.record_project(player, {"title": title})
+    store.close()
+
+    log = tmp_path / LOG_FILE
+    data = log.read_bytes()
+    last_frame = 8 + len(b'C{"id":"%s","name":"Torn","project":{"title":"C"}}' % player.player_id.encode())
+    log.write_bytes(data[:-5])  # crash while writing the last record
+
+    store = CareerStore(str(tmp_path))
+    assert store.recovered_bytes == last_frame - 5
+    assert [p["title"] for p in store.load_player("Torn").past_projects] == ["A", "B"]
+    assert log.stat().st_size == len(data) - last_frame
+    store.record_project(player, {"title": "D"})
+    store.close()
+
+    store = CareerStore(str(tmp_path))
+    assert store.recovered_bytes == 0
+    assert [p["title"] for p in store.load_player("Torn").past_projects] == ["A", "B", "D"]
+    store.close()
+
+
+def test_log_older_than_snapshot_is_ignored(tmp_path, monkeypatch):
+    store = CareerStore(str(tmp_path))
+    player = Player("Crash")
+    store.record_project(player, {"title": "A"})
+    store.record_project(player, {"title": "B"})
+    stale_log = (tmp_path / LOG_FILE).read_bytes()
+
+    write_atomic = store._write_atomic
+
+    def crash_on_log_reset(path, chunks):
+        if path.endswith(LOG_FILE):
+            raise OSError("crash")
+        write_atomic(path, chunks)
+
+    monkeypatch.setattr(store, "_write_atomic", crash_on_log_reset)
+    with pytest.raises(OSError):
+        store.compact()
+    assert (tmp_path / LOG_FILE).read_bytes() == stale_log
+
+    store = CareerStore(str(tmp_path))
+    # The log's records are already in the snapshot; replaying them again
+    # would list every project twice.
+    assert [p["title"] for p in store.load_player("Crash").past_projects] == ["A", "B"]
+    assert store.log_size() == struct.calcsize("<4sHxxQ")  # a fresh, empty log
+    store.close()
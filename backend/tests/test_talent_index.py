@@ -0,0 +1,89 @@
+"""Indexed talent search must match a brute-force filter and sort."""
+import random
+
+import pytest
+
+from game_engine.casting import generate_talent_pool
+from game_engine.talent_index import SORTABLE_FIELDS, TalentIndex
+
+
+def brute_force(talents, ranges=None, available=None, willing=None,
+                sort="skill", descending=True, offset=0, limit=20):
+    matches = [
+        t for t in talents
+        if all(
+            (low is None or getattr(t, field) >= low) and (high is None or getattr(t, field) <= high)
+            for field, (low, high) in (ranges or {}).items()
+        )
+        and (available is None or t.availability == available)
+        and (willing is None or t.wants_to_work_with_player == willing)
+    ]
+    # Stable sort: ties stay in pool order in both directions.
+    matches.sort(key=lambda t: getattr(t, sort), reverse=descending)
+    return len(matches), matches[offset:offset + limit]
+
+
+@pytest.fixture(scope="module")
+def talents():
+    # 400 talents over 0-100 skill and star power, so there are many ties.
+    return generate_talent_pool("actor", 400, rng=random.Random(3))
+
+
+def test_matches_brute_force(talents):
+    index = TalentIndex(talents)
+    rng = random.Random(5)
+    for _ in range(500):
+        ranges = {}
+        for field in rng.sample(SORTABLE_FIELDS, rng.randint(0, 2)):
+            values = sorted(getattr(t, field) for t in talents)
+            low, high = sorted(rng.choice(values) for _ in range(2))
+            ranges[field] = (rng.choice([low, None]), rng.choice([high, None]))
+        query = {
+            "ranges": ranges,
+            "available": rng.choice([None, True, False]),
+            "willing": rng.choice([None, True, False]),
+            "sort": rng.choice(SORTABLE_FIELDS),
+            "descending": rng.random() < 0.5,
+            "offset": rng.choice([0, 0, 5, 37, 390]),
+            "limit": rng.choice([1, 20, 100]),
+        }
+        assert index.search(**query) == brute_force(talents, **query), query
+
+
+def test_range_bounds_are_inclusive(talents):
+    index = TalentIndex(talents)
+    skill = talents[0].skill
+    total, page = index.search({"skill": (skill, skill)}, limit=len(talents))
+    assert total == sum(t.skill == skill for t in talents)
+    assert talents[0] in page
+    assert index.search({"skill": (101, None)}) == (0, [])
+    assert index.search({"skill": (60, 40)}) == (0, [])
+
+
+def test_ties_keep_pool_order_with_and_without_filters(talents):
+    index = TalentIndex(talents)
+    for descending in (True, False):
+        _, unfiltered = index.search(sort="star_power", descending=descending, limit=len(talents))
+        _, filtered = index.search(
+            {"skill": (0, 100)}, sort="star_power", descending=descending, limit=len(talents)
+        )
+        assert unfiltered == filtered == brute_force(
+            talents, sort="star_power", descending=descending, limit=len(talents)
+        )[1]
+
+
+def test_paging_covers_every_match_once(talents):
+    index = TalentIndex(talents)
+    total, _ = index.search(available=True, limit=1)
+    pages = [index.search(available=True, offset=offset, limit=7)[1] for offset in range(0, total, 7)]
+    seen = [t.id for page in pages for t in page]
+    assert len(seen) == len(set(seen)) == total
+    assert index.search(available=True, offset=total) == (total, [])
+
+
+def test_rejects_unknown_fields(talents):
+    index = TalentIndex(talents)
+    with pytest.raises(ValueError):
+        index.search(sort="name")
+    with pytest.raises(ValueError):
+        index.search({"name": (1, 2)})
@@ -0,0 +1,12 @@
+"""Columnar and object talent generators must stay interchangeable."""
+import random
+
+from game_engine.casting import generate_talent_pool
+from game_engine.talent_pool import TalentPool
+
+
+def test_generate_matches_generate_talent_pool():
+    for seed in range(20):
+        talents = generate_talent_pool("actor", 50, rng=random.Random(seed))
+        pool = TalentPool.generate("actor", 50, rng=random.Random(seed))
+        assert [t.to_dict() for t in pool] == [t.to_dict() for t in talents]